@@ -0,0 +1 @@
+"""Benchmarks (hors suite de tests) : python -m benchmarks.<module>."""
@@ -0,0 +1,113 @@
+"""
+Benchmark du classifieur d'intentions local (raccourci avant le LLM).
+
+Évalue le classifieur, entraîné sur les exemples annotés, sur un jeu de
+messages réalistes qu'il n'a jamais vus, pour plusieurs seuils :
+- taux de raccourci : part des messages traités sans appel LLM ;
+- précision : part des raccourcis dont l'intention est correcte ;
+- raccourcis à tort : messages "other" court-circuités (doit rester à 0) ;
+- latence économisée : latence LLM évitée (--llm-ms) moins le temps du classifieur.
+
+Usage:
+    python -m benchmarks.bench_intent_classifier
+    python -m benchmarks.bench_intent_classifier --llm-ms 2400 --output intents.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from execution.agents.intent_classifier import IntentClassifier, seed_dataset
+
+# Messages hors exemples annotés (étiquette attendue)
+EVAL_MESSAGES = [
+    ("Stats stp", "stats"),
+    ("statistiques svp", "stats"),
+    ("mes stats ?", "stats"),
+    ("montre moi mes statistiques", "stats"),
+    ("combien de docs j'ai générés", "stats"),
+    ("Bonjour", "greeting"),
+    ("salut !!", "greeting"),
+    ("Coucou toi", "greeting"),
+    ("bonsoir", "greeting"),
+    ("yo ça va", "greeting"),
+    ("hello", "greeting"),
+    ("Merci", "thanks"),
+    ("merci !!", "thanks"),
+    ("Merciii", "thanks"),
+    ("super, merci beaucoup", "thanks"),
+    ("top merci bien", "thanks"),
+    ("thx", "thanks"),
+    ("facture ALTECA 500€", "other"),
+    ("devis Apple 3 jours de dev", "other"),
+    ("quittance de février", "other"),
+    ("frais km Paris Lille", "other"),
+    ("merci beaucoup pour le devis, envoie-le au client", "other"),
+    ("ok", "other"),
+    ("vas-y génère", "other"),
+    ("bonjour, une facture pour ALTECA stp", "other"),
+    ("charges de l'année dernière", "other"),
+    ("change la date au 12 mars", "other"),
+    ("quelle heure est-il", "other"),
+    ("refais la même facture", "other"),
+]
+
+
+def evaluate(classifier: IntentClassifier, threshold: float, llm_ms: float) -> dict:
+    classifier.threshold = threshold
+    hits, correct, false_hits, saved_ms, timings = 0, 0, 0, 0.0, []
+    for text, expected in EVAL_MESSAGES:
+        prediction = classifier.predict(text)
+        timings.append(prediction.elapsed_ms)
+        if prediction.fast_path:
+            hits += 1
+            correct += prediction.label == expected
+            false_hits += expected == "other"
+            saved_ms += llm_ms - prediction.elapsed_ms
+    return {
+        "threshold": threshold,
+        "messages": len(EVAL_MESSAGES),
+        "hit_rate": hits / len(EVAL_MESSAGES),
+        "precision": correct / hits if hits else 1.0,
+        "false_shortcuts": false_hits,
+        "classifier_mean_ms": statistics.mean(timings),
+        "latency_saved_per_message_ms": saved_ms / len(EVAL_MESSAGES),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--llm-ms", type=float, default=1500.0, help="Latence d'un tour orchestrateur LLM"
+    )
+    parser.add_argument("--thresholds", default="0.6,0.75,0.85,0.95")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    classifier = IntentClassifier().fit(*seed_dataset())
+    training_ms = (time.perf_counter() - start) * 1000
+
+    results = [evaluate(classifier, float(t), args.llm_ms) for t in args.thresholds.split(",")]
+    print(
+        f"{'seuil':<8}{'raccourcis':>12}{'précision':>11}{'à tort':>8}{'classif. (ms)':>15}{'gain/msg (ms)':>15}"
+    )
+    for r in results:
+        print(
+            f"{r['threshold']:<8}{r['hit_rate']:>12.0%}{r['precision']:>11.0%}{r['false_shortcuts']:>8}"
+            f"{r['classifier_mean_ms']:>15.3f}{r['latency_saved_per_message_ms']:>15.1f}"
+        )
+    print(f"\nEntraînement (exemples annotés): {training_ms:.1f} ms")
+
+    if args.output:
+        report = {"training_ms": training_ms, "llm_ms": args.llm_ms, "results": results}
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
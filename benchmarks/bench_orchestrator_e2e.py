@@ -0,0 +1,279 @@
+"""
+Benchmark de bout en bout d'OrchestratorAgent.analyze_message, hors ligne.
+
+Le LLM est simulé par benchmarks.openai_stub : les vrais clients
+ChatOpenAI/httpx dialoguent avec un serveur local, sans réseau ni clé.
+- sans option : réponses synthétiques (SCENARIOS, via l'outil final_answer) ;
+- --cassette : échanges enregistrés (LLM_CASSETTE_PATH ou --record), rejoués ;
+- --record : joue les scénarios contre OpenRouter et enregistre la cassette.
+
+Le temps de chaque message est décomposé en :
+- latence modèle : délai simulé par le serveur (distribution --latency) ;
+- surcoût client : appels LLM mesurés côté client moins la latence modèle
+  (LangChain, httpx, sérialisation des messages et des outils) ;
+- surcoût orchestrateur : le reste (historique, contexte métier, analyse
+  de la réponse, post-traitement).
+
+Historique et data_administration en base SQLite mémoire (aiosqlite).
+Nécessite la configuration habituelle (.env ou variables d'environnement) ;
+aucune clé OpenRouter n'est utilisée hors --record. Le cache de réponses est
+désactivé pour que chaque tour appelle le LLM.
+
+Usage:
+    python -m benchmarks.bench_orchestrator_e2e
+    python -m benchmarks.bench_orchestrator_e2e --latency lognormal:900,0.4 --rounds 20
+    python -m benchmarks.bench_orchestrator_e2e --record llm.jsonl
+    python -m benchmarks.bench_orchestrator_e2e --cassette llm.jsonl --latency recorded --output e2e.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.openai_stub import OpenAIStubServer, latency_distribution
+from execution.core.cassette import Cassette
+from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
+from execution.core.metrics import metrics
+from execution.models.database import Base
+from execution.models.intent_results import FINAL_ANSWER_TOOL
+from execution.tools.db_manager import DatabaseManager
+
+# Message -> arguments de final_answer renvoyés par le modèle simulé
+SCENARIOS = {
+    "Salut, comment ça va ?": {
+        "intent": "chat",
+        "confidence": 1.0,
+        "extracted_data": {},
+        "reply_text": "Bonjour ! Je peux générer vos factures, devis, notes de frais et quittances.",
+    },
+    "Fais une facture pour ALTECA, 5 jours de dev Python à 500€": {
+        "intent": "invoice",
+        "confidence": 0.95,
+        "extracted_data": {
+            "client_name": "ALTECA",
+            "items": [{"description": "Dev Python", "quantity": 5, "unit_price": 500}],
+        },
+    },
+    "Devis pour Apple : audit sécurité 3 jours à 900€": {
+        "intent": "quote",
+        "confidence": 0.95,
+        "extracted_data": {
+            "client_name": "Apple",
+            "items": [{"description": "Audit sécurité", "quantity": 3, "unit_price": 900}],
+        },
+    },
+    "Frais km Paris Lyon 465 km pour réunion client": {
+        "intent": "mileage",
+        "confidence": 0.9,
+        "extracted_data": {
+            "start_location": "Paris",
+            "end_location": "Lyon",
+            "distance_km": 465,
+            "purpose": "Réunion client",
+        },
+    },
+    "Quittance de loyer de mars pour Dupont": {
+        "intent": "rent_receipt",
+        "confidence": 0.9,
+        "extracted_data": {"tenant_name": "Dupont", "period_month": 3, "period_year": 2026},
+    },
+    "Mes stats": {"intent": "stats", "confidence": 1.0, "extracted_data": {}},
+}
+
+
+def synthetic_reply(request: dict) -> dict:
+    """Réponse du modèle simulé : appel final_answer du scénario du dernier message utilisateur."""
+    text = next(
+        (m["content"] for m in reversed(request.get("messages", [])) if m.get("role") == "user"), ""
+    )
+    args = SCENARIOS.get(text, SCENARIOS["Salut, comment ça va ?"])
+    return {
+        "tool_calls": [
+            {
+                "id": "call_bench",
+                "name": FINAL_ANSWER_TOOL,
+                "arguments": json.dumps(args, ensure_ascii=False),
+            }
+        ]
+    }
+
+
+async def memory_db() -> DatabaseManager:
+    """DatabaseManager sur une base SQLite en mémoire (historique vide)."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.engine = engine
+    db.async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return db
+
+
+def _configure(**env: str) -> None:
+    """Applique des variables d'environnement et reconstruit configuration et clients HTTP."""
+    os.environ.update(env)
+    get_settings.cache_clear()
+    get_http_clients.cache_clear()
+
+
+def _client_llm_ms() -> float:
+    """Temps total des appels LLM mesuré côté client depuis le dernier metrics.reset()."""
+    distributions = metrics.snapshot()["distributions"]
+    return sum(
+        summary["count"] * summary["mean"]
+        for name, summary in distributions.items()
+        if name.startswith("llm.latency_ms.") and summary["count"]
+    )
+
+
+async def _agent():
+    from execution.agents.business_context import BusinessContextProvider
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    agent = OrchestratorAgent()
+    agent.db = await memory_db()
+    agent.business_context = BusinessContextProvider(agent.db)
+    return agent
+
+
+async def record(path: str) -> None:
+    """Joue chaque scénario une fois contre OpenRouter en enregistrant la cassette."""
+    _configure(LLM_CASSETTE_PATH=path, RESPONSE_CACHE_ENABLED="false")
+    agent = await _agent()
+    for text in SCENARIOS:
+        result = await agent.analyze_message(text, user_id=0)
+        print(f"{result['intent']:<16}{text}")
+    await get_http_clients().aclose()
+    await agent.db.engine.dispose()
+    print(f"\nCassette écrite dans {path}")
+
+
+async def run(rounds: int, latency: str, cassette_path: str | None, stream: bool) -> dict:
+    cassette = Cassette(cassette_path) if cassette_path else None
+    messages = (
+        list(dict.fromkeys(i["request"]["messages"][-1]["content"] for i in cassette.interactions))
+        if cassette
+        else list(SCENARIOS)
+    )
+
+    async with OpenAIStubServer(
+        content=synthetic_reply,
+        default_latency=latency_distribution(latency),
+        cassette=cassette,
+    ) as server:
+        _configure(
+            OPENROUTER_BASE_URL=server.base_url,
+            RESPONSE_CACHE_ENABLED="false",
+            LLM_CASSETTE_PATH="",
+        )
+        agent = await _agent()
+
+        async def on_reply_progress(text: str) -> None:
+            pass
+
+        await agent.analyze_message(messages[0], user_id=0)  # Connexion et imports à froid exclus
+        rows = []
+        for _ in range(rounds):
+            for text in messages:
+                metrics.reset()
+                injected_before = len(server.injected_s)
+                start = time.perf_counter()
+                await agent.analyze_message(
+                    text, user_id=0, on_reply_progress=on_reply_progress if stream else None
+                )
+                total_ms = (time.perf_counter() - start) * 1000
+                model_ms = sum(server.injected_s[injected_before:]) * 1000
+                client_ms = _client_llm_ms()
+                rows.append(
+                    {
+                        "total_ms": total_ms,
+                        "model_ms": model_ms,
+                        "client_overhead_ms": max(0.0, client_ms - model_ms),
+                        "orchestrator_overhead_ms": max(0.0, total_ms - client_ms),
+                        "llm_calls": len(server.injected_s) - injected_before,
+                    }
+                )
+        misses = len(server.misses)
+        await get_http_clients().aclose()
+        await agent.db.engine.dispose()
+
+    def stats(key: str) -> dict:
+        values = sorted(row[key] for row in rows)
+        return {
+            "mean_ms": statistics.mean(values),
+            "p50_ms": values[len(values) // 2],
+            "p95_ms": values[int(0.95 * (len(values) - 1))],
+        }
+
+    return {
+        "messages": len(messages),
+        "turns": len(rows),
+        "latency": latency,
+        "source": cassette_path or "synthetique",
+        "stream": stream,
+        "llm_calls_per_turn": statistics.mean(row["llm_calls"] for row in rows),
+        "cassette_misses": misses,
+        "breakdown": {
+            key: stats(key)
+            for key in ("total_ms", "model_ms", "client_overhead_ms", "orchestrator_overhead_ms")
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=10, help="passages sur l'ensemble des messages"
+    )
+    parser.add_argument(
+        "--latency", default="0", help="distribution de latence du modèle simulé (voir openai_stub)"
+    )
+    parser.add_argument("--cassette", help="cassette .jsonl à rejouer")
+    parser.add_argument(
+        "--record", metavar="CASSETTE", help="enregistre une cassette contre OpenRouter"
+    )
+    parser.add_argument("--stream", action="store_true", help="réponses en flux (comme le bot)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.record:
+        asyncio.run(record(args.record))
+        return
+    report = asyncio.run(run(args.rounds, args.latency, args.cassette, args.stream))
+    logging.disable(logging.NOTSET)
+
+    print(
+        f"{report['turns']} tours ({report['messages']} messages, source {report['source']}, latence {report['latency']})"
+    )
+    print(
+        f"Appels LLM par tour: {report['llm_calls_per_turn']:.2f}, absents de la cassette: {report['cassette_misses']}\n"
+    )
+    print(f"{'':<26}{'moy. (ms)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    labels = {
+        "total_ms": "total",
+        "model_ms": "latence modèle",
+        "client_overhead_ms": "surcoût client LLM",
+        "orchestrator_overhead_ms": "surcoût orchestrateur",
+    }
+    for key, label in labels.items():
+        r = report["breakdown"][key]
+        print(f"{label:<26}{r['mean_ms']:>11.2f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark de mise à l'échelle du rendu PDF.
+
+Rend chacun des cinq types de documents avec 1, 10, 100 et 1 000 lignes
+(articles, trajets, charges) et mesure le temps de rendu, le pic mémoire
+(tracemalloc) et la taille du PDF. Les résultats sont écrits en JSON pour
+comparer le chemin de rendu d'une version à l'autre.
+
+La quittance n'a pas de lignes : elle est rendue une fois par taille, comme
+point de référence à coût constant.
+
+Usage:
+    python -m benchmarks.bench_pdf_render --output bench_render.json
+    python -m benchmarks.bench_pdf_render --sizes 1 10 100 --repeat 10
+    python -m benchmarks.bench_pdf_render --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import reportlab
+
+from benchmarks.samples import DOCUMENT_TYPES, renderer
+from execution.tools.pdf_generator import PDFGenerator
+
+DEFAULT_SIZES = (1, 10, 100, 1000)
+
+
+def measure(pdf_gen: PDFGenerator, doc_type: str, items: int, repeat: int) -> dict:
+    render = renderer(pdf_gen, doc_type, items)
+
+    # Chauffe : polices, caches de mesure de texte, imports paresseux de ReportLab
+    render().unlink()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path = render()
+        timings.append((time.perf_counter() - start) * 1000)
+        size_bytes = path.stat().st_size
+        path.unlink()
+
+    # Pic mémoire mesuré à part : tracemalloc ralentit fortement le rendu
+    tracemalloc.start()
+    try:
+        render().unlink()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "document_type": doc_type,
+        "items": items,
+        "size_bytes": size_bytes,
+        "render_ms_mean": statistics.mean(timings),
+        "render_ms_min": min(timings),
+        "render_ms_p95": sorted(timings)[int(0.95 * (len(timings) - 1))],
+        "peak_memory_bytes": peak,
+    }
+
+
+def run(sizes: list[int], repeat: int, doc_types: list[str]) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_gen = PDFGenerator(Path(tmp))
+        for doc_type in doc_types:
+            for items in sizes:
+                results.append(measure(pdf_gen, doc_type, items, repeat))
+                r = results[-1]
+                print(
+                    f"{doc_type:<16}{items:>7}{r['render_ms_mean']:>12.2f}{r['render_ms_p95']:>10.2f}"
+                    f"{r['peak_memory_bytes'] / 1024:>14.0f}{r['size_bytes'] / 1024:>12.1f}",
+                    flush=True,
+                )
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "template_version": pdf_gen.template_version,
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Liste les mesures dégradées de plus de threshold (ratio) par rapport à baseline."""
+    previous = {(r["document_type"], r["items"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = previous.get((r["document_type"], r["items"]))
+        if old is None:
+            continue
+        for metric in ("render_ms_min", "peak_memory_bytes", "size_bytes"):
+            if old.get(metric) and r[metric] > old[metric] * (1 + threshold):
+                precision = 2 if metric.endswith("_ms_min") else 0
+                regressions.append(
+                    f"{r['document_type']} x{r['items']}: {metric} {old[metric]:.{precision}f} → "
+                    f"{r[metric]:.{precision}f} (+{(r[metric] / old[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Nombres de lignes"
+    )
+    parser.add_argument("--types", nargs="+", choices=DOCUMENT_TYPES, default=list(DOCUMENT_TYPES))
+    parser.add_argument("--repeat", type=int, default=5, help="Rendus chronométrés par mesure")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--compare", help="JSON d'une exécution précédente à comparer")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Dégradation tolérée (ratio)")
+    args = parser.parse_args()
+
+    print(
+        f"{'type':<16}{'lignes':>7}{'moy. (ms)':>12}{'p95 (ms)':>10}{'pic mém. (Ko)':>14}{'taille (Ko)':>12}"
+    )
+    report = run(args.sizes, args.repeat, args.types)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nRésultats écrits dans {args.output}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.threshold)
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} régression(s) par rapport à {args.compare}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(
+            f"\n✅ Aucune régression au-delà de {args.threshold:.0%} par rapport à {args.compare}"
+        )
+
+
+if __name__ == "__main__":
+    main()
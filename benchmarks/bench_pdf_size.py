@@ -0,0 +1,88 @@
+"""
+Benchmark taille / temps de rendu du PDFGenerator selon la configuration.
+
+Pour chaque configuration (compression des pages, police standard ou TTF
+embarquée) et chacun des cinq types de documents, mesure la taille du PDF
+et le temps de rendu moyen.
+
+Usage:
+    python -m benchmarks.bench_pdf_size
+    python -m benchmarks.bench_pdf_size --font /chemin/DejaVuSans.ttf --repeat 50 --output sizes.json
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+from pathlib import Path
+
+from benchmarks.samples import DOCUMENT_TYPES, report_renderer
+from execution.tools.pdf_generator import PDFGenerator
+
+
+def run(font_path: str | None, repeat: int, items: int) -> list[dict]:
+    configs = [
+        {"page_compression": True, "font_path": None},
+        {"page_compression": False, "font_path": None},
+    ]
+    if font_path:
+        configs += [
+            {"page_compression": True, "font_path": font_path},
+            {"page_compression": False, "font_path": font_path},
+        ]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for config in configs:
+            pdf_gen = PDFGenerator(Path(tmp), **config)
+            for doc_type in DOCUMENT_TYPES:
+                render = report_renderer(pdf_gen, doc_type, items)
+                timings = []
+                for _ in range(repeat):
+                    report = render()
+                    timings.append(report.render_ms)
+                    size_bytes = report.size_bytes
+                    report.pdf_path.unlink()
+
+                results.append(
+                    {
+                        "document_type": doc_type,
+                        "page_compression": config["page_compression"],
+                        "font": pdf_gen.font_regular,
+                        "items": items,
+                        "size_bytes": size_bytes,
+                        "render_ms_mean": statistics.mean(timings),
+                        "render_ms_p95": sorted(timings)[int(0.95 * (len(timings) - 1))],
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--font", help="Police TTF à comparer aux polices standard")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--items", type=int, default=10, help="Lignes par document")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = run(args.font, args.repeat, args.items)
+
+    print(
+        f"{'type':<16}{'compression':<13}{'police':<18}{'taille (Ko)':>12}{'moy. (ms)':>11}{'p95 (ms)':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['document_type']:<16}{str(r['page_compression']):<13}{r['font']:<18}"
+            f"{r['size_bytes'] / 1024:>12.1f}{r['render_ms_mean']:>11.2f}{r['render_ms_p95']:>10.2f}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Temps jusqu'au premier token (TTFT) de l'orchestrateur, avec et sans cache de prompt.
+
+Chaque mesure envoie en flux la requête réelle de l'orchestrateur (prompt
+système, schémas d'outils, message) au modèle de routage :
+- à froid : préfixe rendu unique (identifiant aléatoire en tête du prompt
+  système, sans cache_control) : aucun fournisseur ne peut le servir depuis
+  son cache ;
+- en cache : préfixe stable marqué cache_control, après un appel d'amorçage.
+Les deux modes alternent à chaque passage. Les tokens servis par le cache
+(prompt_tokens_details.cached_tokens) confirment les succès.
+
+Nécessite la configuration habituelle (.env) et une clé OpenRouter ; avec
+--stub, le serveur local benchmarks.openai_stub remplace OpenRouter (essai à
+blanc : il n'a pas de cache, les deux modes doivent être équivalents).
+
+Usage:
+    python -m benchmarks.bench_prompt_cache
+    python -m benchmarks.bench_prompt_cache --model anthropic/claude-3.5-haiku --rounds 20 --output ttft.json
+    python -m benchmarks.bench_prompt_cache --stub --latency normal:300,50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.openai_stub import OpenAIStubServer, latency_distribution
+from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
+from execution.core.usage import cached_tokens, usage_tokens
+
+MESSAGE = "Fais une facture pour ALTECA, 5 jours de dev Python à 500€"
+
+
+async def first_token(runnable, variables: dict) -> dict:
+    """Appel en flux : délai du premier chunk (contenu ou appel d'outil) et tokens du prompt."""
+    started = time.perf_counter()
+    ttft_ms, usage = None, None
+    async for chunk in runnable.astream(variables):
+        if ttft_ms is None and (chunk.content or chunk.tool_call_chunks):
+            ttft_ms = (time.perf_counter() - started) * 1000
+        if chunk.usage_metadata:
+            usage = chunk
+    prompt_tokens = usage_tokens(usage)[0] if usage else 0
+    return {
+        "ttft_ms": ttft_ms if ttft_ms is not None else (time.perf_counter() - started) * 1000,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens(usage) if usage else 0,
+    }
+
+
+async def run(model: str | None, rounds: int) -> dict:
+    from execution.agents.orchestrator_agent import OrchestratorAgent, build_orchestrator_prompt
+
+    get_settings.cache_clear()
+    get_http_clients.cache_clear()
+    agent = OrchestratorAgent()
+    model = model or agent.router.primary
+    llm = agent._chat_model(model).bind_tools(agent.bound_tools)
+    cached = build_orchestrator_prompt(agent.static_prompt, cache=True) | llm
+    variables = {
+        "input": MESSAGE,
+        "history": [],
+        "agent_scratchpad": [],
+        "current_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "business_context": "",
+    }
+
+    await first_token(cached, variables)  # Amorçage du cache (et de la connexion)
+    rows = {"cold": [], "cached": []}
+    for _ in range(rounds):
+        cold = (
+            build_orchestrator_prompt(
+                f"[bench {uuid.uuid4().hex}]\n" + agent.static_prompt, cache=False
+            )
+            | llm
+        )
+        rows["cold"].append(await first_token(cold, variables))
+        rows["cached"].append(await first_token(cached, variables))
+    await get_http_clients().aclose()
+
+    def stats(samples: list[dict]) -> dict:
+        values = sorted(sample["ttft_ms"] for sample in samples)
+        prompt = sum(sample["prompt_tokens"] for sample in samples)
+        return {
+            "mean_ms": statistics.mean(values),
+            "p50_ms": values[len(values) // 2],
+            "p95_ms": values[int(0.95 * (len(values) - 1))],
+            "prompt_tokens": prompt / len(samples),
+            "cache_hit_ratio": sum(sample["cached_tokens"] for sample in samples) / prompt
+            if prompt
+            else 0.0,
+        }
+
+    return {
+        "model": model,
+        "rounds": rounds,
+        **{mode: stats(samples) for mode, samples in rows.items()},
+    }
+
+
+async def run_on_stub(model: str | None, rounds: int, latency: str) -> dict:
+    async with OpenAIStubServer(default_latency=latency_distribution(latency)) as server:
+        os.environ["OPENROUTER_BASE_URL"] = server.base_url
+        os.environ["LLM_CASSETTE_PATH"] = ""
+        return await run(model, rounds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--model", help="modèle mesuré (par défaut le modèle de routage)")
+    parser.add_argument("--rounds", type=int, default=10, help="mesures par mode")
+    parser.add_argument("--stub", action="store_true", help="serveur local à la place d'OpenRouter")
+    parser.add_argument(
+        "--latency", default="0", help="distribution de latence du serveur local (voir openai_stub)"
+    )
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.stub:
+        report = asyncio.run(run_on_stub(args.model, args.rounds, args.latency))
+    else:
+        report = asyncio.run(run(args.model, args.rounds))
+    logging.disable(logging.NOTSET)
+
+    print(f"{report['model']} - {report['rounds']} mesures par mode\n")
+    print(f"{'':<10}{'moy. (ms)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}{'tokens':>9}{'en cache':>10}")
+    for mode, label in (("cold", "à froid"), ("cached", "en cache")):
+        r = report[mode]
+        print(
+            f"{label:<10}{r['mean_ms']:>11.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['prompt_tokens']:>9.0f}{r['cache_hit_ratio']:>10.0%}"
+        )
+    gain = report["cold"]["p50_ms"] - report["cached"]["p50_ms"]
+    print(f"\nGain TTFT p50 : {gain:.1f} ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
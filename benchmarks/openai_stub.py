@@ -0,0 +1,309 @@
+"""
+Serveur local compatible OpenAI (/chat/completions) pour tests et benchmarks LLM.
+
+Répond sans réseau ni clé, après un délai choisi par modèle (fixe ou tiré
+d'une distribution) : de quoi reproduire un modèle lent et un modèle rapide
+(hedging, routage) avec les vrais clients ChatOpenAI/httpx. La réponse est
+un contenu fixe, calculé depuis la requête, ou rejouée depuis une cassette
+enregistrée avec LLM_CASSETTE_PATH (appels d'outils compris). Les réponses
+en flux (stream=true) sont envoyées en SSE, le délai s'appliquant au premier chunk.
+
+Distributions (--latency modele=SPEC, --default-latency SPEC), en millisecondes :
+    800                  délai fixe
+    normal:800,200       loi normale (moyenne, écart type), bornée à 0
+    lognormal:800,0.5    loi log-normale (médiane, sigma) : longue traîne
+    recorded             latence enregistrée dans la cassette
+
+Usage:
+    python -m benchmarks.openai_stub --port 8089 --latency slow=2000 --latency fast=100
+    python -m benchmarks.openai_stub --cassette llm.jsonl --default-latency lognormal:900,0.4
+    OPENROUTER_BASE_URL=http://127.0.0.1:8089/v1 ...
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+from collections.abc import Callable
+from contextlib import suppress
+from typing import Any
+
+from execution.core.cassette import Cassette
+
+# Délai fixe (secondes) ou tirage par requête ; "recorded" : latence de la cassette
+Latency = float | str | Callable[[], float]
+
+# Réponse d'un modèle : texte, ou {"content": ..., "tool_calls": [{"id", "name", "arguments"}]}
+Reply = str | dict[str, Any]
+
+
+def latency_distribution(spec: str, rng: random.Random | None = None) -> Latency:
+    """
+    Délai (secondes) décrit par une spécification en millisecondes (voir l'aide du module).
+
+    Raises:
+        ValueError: Spécification inconnue
+    """
+    rng = rng or random.Random()
+    kind, _, params = spec.partition(":")
+    if kind == "recorded":
+        return "recorded"
+    if not params:
+        return float(kind) / 1000
+    values = [float(value) for value in params.split(",")]
+    if kind == "normal":
+        mean, std = values
+        return lambda: max(0.0, rng.gauss(mean, std)) / 1000
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda: rng.lognormvariate(math.log(median), sigma) / 1000
+    raise ValueError(f"Distribution de latence inconnue: {spec}")
+
+
+class OpenAIStubServer:
+    """
+    Serveur HTTP/1.1 minimal imitant l'API chat completions d'OpenAI.
+
+    Args:
+        content: Réponse, ou fonction (corps de la requête) -> réponse
+        latencies: Délai par modèle (secondes, fonction de tirage ou "recorded")
+        default_latency: Délai des modèles absents de latencies
+        chunk_size: Taille des chunks de contenu en flux (caractères)
+        cassette: Cassette à rejouer (content n'est alors plus utilisé)
+    """
+
+    def __init__(
+        self,
+        content: Reply | Callable[[dict], Reply] = '{"intent": "chat", "reply_text": "Bonjour"}',
+        latencies: dict[str, Latency] | None = None,
+        default_latency: Latency = 0.0,
+        chunk_size: int = 8,
+        cassette: Cassette | None = None,
+    ):
+        self.content = content
+        self.latencies = latencies or {}
+        self.default_latency = default_latency
+        self.chunk_size = chunk_size
+        self.cassette = cassette
+        self.requests: list[dict] = []
+        self.completed: list[str] = []
+        self.cancelled: list[str] = []
+        self.misses: list[dict] = []  # Requêtes absentes de la cassette
+        self.injected_s: list[float] = []  # Délais simulés appliqués, par requête
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "OpenAIStubServer":
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "OpenAIStubServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def _latency(self, model: str, interaction: dict | None = None) -> float:
+        latency = self.latencies.get(model, self.default_latency)
+        if latency == "recorded":
+            return (interaction or {}).get("latency_ms", 0.0) / 1000
+        return latency() if callable(latency) else latency
+
+    def _reply(self, request: dict) -> tuple[dict | None, dict | None]:
+        """(réponse normalisée, interaction de cassette) ; réponse None si absente de la cassette."""
+        if self.cassette is not None:
+            interaction = self.cassette.lookup(request)
+            return (interaction["response"], interaction) if interaction else (None, None)
+        reply = self.content(request) if callable(self.content) else self.content
+        if isinstance(reply, str):
+            reply = {"content": reply}
+        return {"content": reply.get("content"), "tool_calls": reply.get("tool_calls") or []}, None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if b"/chat/completions" not in request_line:
+                    self._write(writer, 404, b'{"error": {"message": "not found"}}')
+                    await writer.drain()
+                    continue
+
+                request = json.loads(body or b"{}")
+                self.requests.append(request)
+                model = request.get("model", "")
+                reply, interaction = self._reply(request)
+                if reply is None:
+                    self.misses.append(request)
+                    self._write(writer, 500, b'{"error": {"message": "no recorded interaction"}}')
+                    await writer.drain()
+                    continue
+
+                delay_s = self._latency(model, interaction)
+                self.injected_s.append(delay_s)
+                if await self._disconnected(reader, delay_s):
+                    self.cancelled.append(model)
+                    break
+                if request.get("stream"):
+                    await self._stream(writer, model, reply)
+                    break
+                self._write(writer, 200, json.dumps(_completion(model, reply)).encode())
+                await writer.drain()
+                self.completed.append(model)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Requête annulée par le client (hedging, timeout)
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _disconnected(reader: asyncio.StreamReader, delay_s: float) -> bool:
+        """Attend delay_s, ou moins si le client ferme la connexion (requête annulée)."""
+        try:
+            await asyncio.wait_for(reader.read(1), timeout=delay_s)
+            return True
+        except TimeoutError:
+            return False
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, payload: bytes) -> None:
+        writer.write(
+            f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+
+    async def _stream(self, writer: asyncio.StreamWriter, model: str, reply: dict) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nConnection: close\r\n\r\n"
+        )
+        content = reply.get("content") or ""
+        deltas = [
+            {"content": content[i : i + self.chunk_size]}
+            for i in range(0, len(content), self.chunk_size)
+        ]
+        for index, call in enumerate(reply.get("tool_calls") or []):
+            deltas.append(
+                {
+                    "tool_calls": [
+                        {
+                            "index": index,
+                            "id": call.get("id"),
+                            "type": "function",
+                            "function": {"name": call["name"], "arguments": ""},
+                        }
+                    ]
+                }
+            )
+            arguments = call.get("arguments") or ""
+            deltas.extend(
+                {
+                    "tool_calls": [
+                        {
+                            "index": index,
+                            "function": {"arguments": arguments[i : i + self.chunk_size]},
+                        }
+                    ]
+                }
+                for i in range(0, len(arguments), self.chunk_size)
+            )
+        for delta in deltas:
+            writer.write(_sse(_chunk(model, {"role": "assistant", **delta}, None)))
+            await writer.drain()
+            await asyncio.sleep(0)
+        finish_reason = "tool_calls" if reply.get("tool_calls") else "stop"
+        writer.write(_sse(_chunk(model, {}, finish_reason)) + b"data: [DONE]\n\n")
+        await writer.drain()
+        self.completed.append(model)
+
+
+def _completion(model: str, reply: dict) -> dict:
+    content = reply.get("content")
+    message = {"role": "assistant", "content": content}
+    if reply.get("tool_calls"):
+        message["tool_calls"] = [
+            {
+                "id": call.get("id"),
+                "type": "function",
+                "function": {"name": call["name"], "arguments": call.get("arguments") or ""},
+            }
+            for call in reply["tool_calls"]
+        ]
+    tokens = len(content or "") // 4
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if reply.get("tool_calls") else "stop",
+            }
+        ],
+        "usage": reply.get("usage")
+        or {"prompt_tokens": 0, "completion_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+def _chunk(model: str, delta: dict, finish_reason: str | None) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _sse(payload: dict) -> bytes:
+    return f"data: {json.dumps(payload)}\n\n".encode()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    latencies = {}
+    for spec in args.latency:
+        model, _, distribution = spec.partition("=")
+        latencies[model] = latency_distribution(distribution)
+    server = await OpenAIStubServer(
+        latencies=latencies,
+        default_latency=latency_distribution(args.default_latency),
+        cassette=Cassette(args.cassette) if args.cassette else None,
+    ).start(args.host, args.port)
+    print(f"Serveur OpenAI simulé sur {server.base_url}")
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", action="append", default=[], help="modele=SPEC (répétable)")
+    parser.add_argument("--default-latency", default="0", help="SPEC des autres modèles")
+    parser.add_argument("--cassette", help="cassette .jsonl à rejouer")
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Documents d'exemple pour les benchmarks du PDFGenerator."""
+
+from collections.abc import Callable
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from execution.models.database import DocumentType
+from execution.models.documents import (
+    ChargeItem,
+    Invoice,
+    InvoiceItem,
+    MileageRecord,
+    Quote,
+    RentalCharges,
+    RentReceipt,
+)
+from execution.tools.pdf_generator import PDFGenerator, RenderReport
+
+COMPANY_INFO = {
+    "name": "Ma SASU",
+    "address": "1 Rue de l'Example, 75001 Paris, France",
+    "siret": "12345678900012",
+    "tva": "FR12345678901",
+}
+
+DOCUMENT_TYPES = ("invoice", "quote", "mileage", "rent_receipt", "rental_charges")
+
+
+def _items(n: int) -> list[InvoiceItem]:
+    return [
+        InvoiceItem(
+            description=f"Prestation de développement Python et IA - lot {i + 1}",
+            quantity=Decimal("1.5"),
+            unit_price=Decimal("450.00"),
+        )
+        for i in range(n)
+    ]
+
+
+def sample_invoice(n: int = 1) -> Invoice:
+    return Invoice(
+        invoice_number="2025-0001",
+        invoice_date=date(2025, 1, 15),
+        due_date=date(2025, 2, 14),
+        client_name="ALTECA",
+        client_address="10 Rue de la Paix, 75002 Paris",
+        items=_items(n),
+        notes="Merci pour votre confiance.",
+    )
+
+
+def sample_quote(n: int = 1) -> Quote:
+    return Quote(
+        quote_number="DEV-2025-0001",
+        quote_date=date(2025, 1, 15),
+        client_name="ALTECA",
+        client_address="10 Rue de la Paix, 75002 Paris",
+        items=_items(n),
+    )
+
+
+def sample_mileage(n: int = 1) -> list[MileageRecord]:
+    return [
+        MileageRecord(
+            travel_date=date(2025, 1, 1) + timedelta(days=i % 365),
+            start_location="Paris",
+            end_location="Lyon Part-Dieu",
+            distance_km=Decimal("465.0"),
+            purpose="Rendez-vous client",
+            fiscal_power=5,
+        )
+        for i in range(n)
+    ]
+
+
+def sample_rent_receipt(n: int = 1) -> RentReceipt:
+    # Une quittance n'a pas de lignes : n est ignoré
+    return RentReceipt(
+        receipt_number="QUIT-2025-0001",
+        period_month=1,
+        period_year=2025,
+        tenant_name="Jean Dupont",
+        tenant_address="2 Rue Example, 75003 Paris",
+        property_address="2 Rue Example, 75003 Paris",
+        rent_amount=Decimal("800.00"),
+        charges_amount=Decimal("50.00"),
+        payment_date=date(2025, 1, 5),
+    )
+
+
+def sample_rental_charges(n: int = 1) -> RentalCharges:
+    return RentalCharges(
+        period_start=date(2024, 1, 1),
+        period_end=date(2024, 12, 31),
+        tenant_name="Jean Dupont",
+        property_address="2 Rue Example, 75003 Paris",
+        charges=[
+            ChargeItem(
+                label=f"Entretien des parties communes - poste {i + 1}", amount=Decimal("37.50")
+            )
+            for i in range(n)
+        ],
+        provisions_amount=Decimal("400.00"),
+    )
+
+
+def renderer(pdf_gen: PDFGenerator, doc_type: str, n: int = 1) -> Callable[[], Path]:
+    """Retourne une fonction qui rend un document d'exemple à n lignes."""
+    if doc_type == "invoice":
+        invoice = sample_invoice(n)
+        return lambda: pdf_gen.generate_invoice_pdf(invoice, COMPANY_INFO)
+    if doc_type == "quote":
+        quote = sample_quote(n)
+        return lambda: pdf_gen.generate_quote_pdf(quote, COMPANY_INFO)
+    if doc_type == "mileage":
+        records = sample_mileage(n)
+        return lambda: pdf_gen.generate_mileage_pdf(
+            records, COMPANY_INFO, document_number="KM-2025-0001"
+        )
+    if doc_type == "rent_receipt":
+        receipt = sample_rent_receipt(n)
+        return lambda: pdf_gen.generate_rent_receipt_pdf(receipt, COMPANY_INFO)
+    if doc_type == "rental_charges":
+        charges = sample_rental_charges(n)
+        return lambda: pdf_gen.generate_rental_charges_pdf(
+            charges, COMPANY_INFO, document_number="REGUL-2025-0001"
+        )
+    raise ValueError(f"Unknown document type: {doc_type}")
+
+
+def report_renderer(pdf_gen: PDFGenerator, doc_type: str, n: int = 1) -> Callable[[], RenderReport]:
+    """Comme renderer(), via render_document (chemin des agents), qui retourne le rapport de rendu."""
+    if doc_type == "invoice":
+        kind, data = DocumentType.INVOICE, sample_invoice(n).model_dump(mode="json")
+    elif doc_type == "quote":
+        kind, data = DocumentType.QUOTE, sample_quote(n).model_dump(mode="json")
+    elif doc_type == "mileage":
+        records = [record.model_dump(mode="json") for record in sample_mileage(n)]
+        kind, data = DocumentType.MILEAGE, {"document_number": "KM-2025-0001", "records": records}
+    elif doc_type == "rent_receipt":
+        kind, data = DocumentType.RENT_RECEIPT, sample_rent_receipt(n).model_dump(mode="json")
+    elif doc_type == "rental_charges":
+        data = {
+            **sample_rental_charges(n).model_dump(mode="json"),
+            "document_number": "REGUL-2025-0001",
+        }
+        kind = DocumentType.RENTAL_CHARGES
+    else:
+        raise ValueError(f"Unknown document type: {doc_type}")
+    return lambda: pdf_gen.render_document(kind, data, COMPANY_INFO)
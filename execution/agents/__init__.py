@@ -4,5 +4,6 @@ from execution.agents.quote_agent import QuoteAgent
 from execution.agents.mileage_agent import MileageAgent
 from execution.agents.rent_receipt_agent import RentReceiptAgent
 from execution.agents.rental_charges_agent import RentalChargesAgent
+from execution.agents.registry import AgentRegistry
 
-__all__ = ["BaseAdminAgent", "AdminAgentState", "InvoiceAgent", "QuoteAgent", "MileageAgent", "RentReceiptAgent", "RentalChargesAgent"]
+__all__ = ["BaseAdminAgent", "AdminAgentState", "InvoiceAgent", "QuoteAgent", "MileageAgent", "RentReceiptAgent", "RentalChargesAgent", "AgentRegistry"]
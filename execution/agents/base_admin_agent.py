@@ -1,13 +1,20 @@
 """Agent de base pour tous les agents administratifs."""
 
 from abc import ABC, abstractmethod
-from typing import Any, TypedDict
+from typing import Any, Awaitable, Callable, NotRequired, Optional, TypedDict
+from datetime import datetime, timedelta
 from pathlib import Path
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from execution.tools.pdf_generator import PDFGenerator
-from execution.tools.db_manager import DatabaseManager
-from execution.core.config import get_settings
+from execution.tools.db_manager import DatabaseManager, NumberLease
+from execution.tools.document_store import DocumentStore
+from execution.tools.pdf_storage import PDFStorageManager
+from execution.models.database import DocumentType
+from execution.core.config import Settings, get_settings
+from execution.core.llm import build_chat_model
+from execution.core.metrics import metrics
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,25 +30,58 @@ class AdminAgentState(TypedDict):
     pdf_path: Path | None
     db_record_id: int | None
     error: str | None
+    content_hash: NotRequired[str | None]
+    telegram_file_id: NotRequired[str | None]
+    reused_document: NotRequired[bool]
+    draft: NotRequired[bool]
+    summary: NotRequired[str | None]
+    number_lease: NotRequired[NumberLease]
+
+
+# Numéro affiché dans un brouillon : le vrai numéro n'est attribué qu'à la génération
+DRAFT_NUMBER = "BROUILLON"
 
 
 class BaseAdminAgent(ABC):
     """Classe de base pour tous les agents administratifs."""
 
-    def __init__(self):
-        """Initialise l'agent avec les outils nécessaires."""
+    def __init__(
+        self,
+        db: Optional[DatabaseManager] = None,
+        pdf_gen: Optional[PDFGenerator] = None,
+        storage: Optional[PDFStorageManager] = None,
+        llm: Optional[ChatOpenAI] = None,
+    ):
+        """
+        Initialise l'agent avec les outils nécessaires.
+
+        Les outils peuvent être injectés pour être partagés entre agents
+        (voir AgentRegistry) ; à défaut, l'agent crée les siens.
+
+        Args:
+            db: Gestionnaire de base de données partagé (optionnel)
+            pdf_gen: Générateur de PDF partagé (optionnel)
+            storage: Gestionnaire de stockage des PDFs partagé (optionnel)
+            llm: Modèle de langage partagé (optionnel)
+        """
         self.settings = get_settings()
-        self.pdf_gen = PDFGenerator(Path(self.settings.tmp_dir) / "documents")
-        self.db = DatabaseManager()
+        if storage is not None:
+            self.storage = storage
+            self.pdf_gen = storage.pdf_gen
+            self.db = storage.db
+            self.store = storage.store
+        else:
+            self.pdf_gen = pdf_gen or PDFGenerator.from_settings(self.settings)
+            self.db = db or DatabaseManager()
+            self.store = DocumentStore(self.db, self.pdf_gen.template_version)
+            self.storage = build_storage_manager(self.settings, self.pdf_gen, self.db, self.store)
         self.logger = logging.getLogger(self.__class__.__name__)
-        
+
         # Initialisation du LLM via OpenRouter
-        self.llm = ChatOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.settings.openrouter_api_key,
-            model=self.settings.openrouter_model,
-            temperature=0,
-        )
+        self.llm = llm or build_chat_model(self.settings)
+
+        # Graph compilé une seule fois, réutilisé par toutes les requêtes
+        self._graph = None
 
     @abstractmethod
     async def validate_input(self, state: AdminAgentState) -> AdminAgentState:
@@ -81,6 +121,106 @@ class BaseAdminAgent(ABC):
         """
         pass
 
+    async def document_number(
+        self,
+        state: AdminAgentState,
+        allocate: Callable[[], Awaitable[str]],
+        year: Optional[int] = None,
+    ) -> str:
+        """
+        Numéro du document : DRAFT_NUMBER en mode brouillon, sinon le prochain numéro séquentiel.
+
+        Un numéro lu à l'avance (state["number_lease"]) est repris s'il est
+        toujours valable : même type et même année, aucun document enregistré
+        depuis sa lecture.
+
+        Args:
+            state: État courant (state["draft"] indique le mode brouillon)
+            allocate: Fonction qui attribue le prochain numéro (lecture en base)
+            year: Année du numéro (requise pour reprendre un numéro lu à l'avance)
+        """
+        if state.get("draft"):
+            return DRAFT_NUMBER
+        lease = state.get("number_lease")
+        if lease is not None:
+            if (
+                (lease.request_type, lease.year) == (state["request_type"], year)
+                and lease.writes == self.db.document_writes
+            ):
+                metrics.increment("prefetch.lease_used")
+                return lease.number
+            metrics.increment("prefetch.lease_stale")
+        return await allocate()
+
+    def summarize(self, validated_data: dict[str, Any]) -> list[str]:
+        """
+        Lignes de récapitulatif (totaux) d'un document validé, pour le brouillon.
+
+        Args:
+            validated_data: Données issues de validate_input
+
+        Returns:
+            Lignes de texte (HTML simple), vide par défaut
+        """
+        return []
+
+    async def render_with_store(
+        self,
+        state: AdminAgentState,
+        doc_type: DocumentType,
+        render: Callable[[], Path],
+    ) -> Path:
+        """
+        Rend le PDF, ou réutilise un rendu identique déjà stocké.
+
+        L'empreinte de validated_data hors numéro (+ version de gabarit) est
+        placée dans state["content_hash"]. Le PDF stocké n'est réutilisé que
+        pour un nouvel essai : l'utilisateur a enregistré un document non payé
+        sous cette empreinte depuis moins de document_reuse_window_s. Au-delà,
+        une demande identique est un nouveau document (nouveau numéro).
+        En cas de réutilisation, validated_data reprend ce document (son
+        numéro, celui imprimé sur le PDF) à la place du numéro lu pour la
+        demande, state["reused_document"] est positionné pour prévenir
+        l'utilisateur et le file_id Telegram déjà capturé est placé dans
+        state["telegram_file_id"].
+
+        Args:
+            state: État avec validated_data
+            doc_type: Type de document
+            render: Fonction de rendu appelée uniquement si le PDF n'est pas stocké
+
+        Returns:
+            Chemin du PDF (stocké ou fraîchement rendu)
+        """
+        content_hash = self.store.content_hash(doc_type, state["validated_data"])
+        state["content_hash"] = content_hash
+
+        try:
+            since = datetime.utcnow() - timedelta(seconds=self.settings.document_reuse_window_s)
+            existing = await self.db.get_document_by_content_hash(
+                content_hash, state["user_id"], since=since
+            )
+            stored = await self.store.get(content_hash) if existing is not None else None
+        except Exception as e:
+            self.logger.warning(f"Store indisponible, rendu direct: {e}")
+            return render()
+
+        if stored is not None:
+            self.logger.info(
+                f"♻️ PDF identique déjà stocké (#{existing.document_number}), rendu évité: {stored.pdf_path}"
+            )
+            state["validated_data"] = existing.data
+            state["telegram_file_id"] = stored.telegram_file_id
+            state["reused_document"] = True
+            return stored.pdf_path
+
+        pdf_path = render()
+        try:
+            await self.store.put(content_hash, doc_type, pdf_path)
+        except Exception as e:
+            self.logger.warning(f"Indexation du PDF impossible: {e}")
+        return pdf_path
+
     async def save_to_db(self, state: AdminAgentState) -> AdminAgentState:
         """
         Enregistre le document en base de données.
@@ -112,7 +252,8 @@ class BaseAdminAgent(ABC):
         Construit le graph LangGraph pour ce type d'agent.
 
         Le workflow standard est:
-        1. Validation des entrées
+        1. Validation des entrées (sautée si validated_data est déjà fourni
+           hors brouillon, voir prepare())
         2. Génération du PDF
         3. Sauvegarde en base de données
 
@@ -127,13 +268,66 @@ class BaseAdminAgent(ABC):
         workflow.add_node("save", self.save_to_db)
 
         # Définir le flux
-        workflow.set_entry_point("validate")
+        workflow.set_conditional_entry_point(
+            lambda state: (
+                "generate"
+                if state.get("validated_data") and not state.get("error") and not state.get("draft")
+                else "validate"
+            ),
+            {"validate": "validate", "generate": "generate"},
+        )
         workflow.add_edge("validate", "generate")
         workflow.add_edge("generate", "save")
         workflow.add_edge("save", END)
 
         return workflow.compile()
 
+    @property
+    def graph(self):
+        """Graph compilé de l'agent, construit au premier accès puis réutilisé."""
+        if self._graph is None:
+            self._graph = self.build_graph()
+        return self._graph
+
+    async def prepare(self, state: AdminAgentState) -> AdminAgentState:
+        """
+        Valide les données (et attribue le numéro) sans générer le document.
+
+        Permet de commencer la validation pendant que le LLM termine sa
+        réponse : l'état retourné, passé à execute(), démarre directement
+        à la génération du PDF.
+
+        Args:
+            state: État initial (non modifié)
+
+        Returns:
+            Nouvel état avec validated_data ou error
+        """
+        try:
+            return await self.validate_input({**state, "input_data": dict(state["input_data"])})
+        except Exception as e:
+            self.logger.error(f"Erreur de validation anticipée: {e}", exc_info=True)
+            return {**state, "error": f"Erreur critique: {str(e)}"}
+
+    async def preview(self, state: AdminAgentState) -> AdminAgentState:
+        """
+        Mode brouillon : valide les données sans attribuer de numéro ni rien persister.
+
+        Seul validate_input est exécuté (aucun rendu PDF, aucune écriture en
+        base) ; state["summary"] reçoit le récapitulatif des totaux à faire
+        approuver avant execute().
+
+        Args:
+            state: État initial (non modifié)
+
+        Returns:
+            Nouvel état avec validated_data et summary, ou error
+        """
+        draft = await self.prepare({**state, "draft": True})
+        if not draft.get("error") and draft.get("validated_data"):
+            draft["summary"] = "\n".join(self.summarize(draft["validated_data"]))
+        return draft
+
     async def execute(self, state: AdminAgentState) -> AdminAgentState:
         """
         Exécute le workflow complet de l'agent.
@@ -144,18 +338,26 @@ class BaseAdminAgent(ABC):
         Returns:
             État final après exécution
         """
+        if state.get("draft"):
+            # Brouillon approuvé : validation complète, avec attribution du numéro
+            state = {**state, "draft": False, "validated_data": None, "summary": None}
+
         try:
             self.logger.info(f"Démarrage agent {self.__class__.__name__} pour user {state['user_id']}")
 
-            # Construire et exécuter le graph
-            graph = self.build_graph()
-            result = await graph.ainvoke(state)
+            # Exécuter le graph (compilé une seule fois par agent)
+            result = await self.graph.ainvoke(state)
 
             if result.get("error"):
                 self.logger.error(f"Agent terminé avec erreur: {result['error']}")
             else:
                 self.logger.info(f"Agent terminé avec succès. PDF: {result.get('pdf_path')}")
 
+            try:
+                await asyncio.to_thread(self.storage.enforce_budget_if_due)
+            except Exception as e:
+                self.logger.warning(f"Éviction des PDFs impossible: {e}")
+
             return result
 
         except Exception as e:
@@ -164,6 +366,23 @@ class BaseAdminAgent(ABC):
             return state
 
 
+def build_storage_manager(
+    settings: Settings,
+    pdf_gen: PDFGenerator,
+    db: DatabaseManager,
+    store: Optional[DocumentStore] = None,
+) -> PDFStorageManager:
+    """Crée le gestionnaire de stockage des PDFs selon la configuration."""
+    return PDFStorageManager(
+        pdf_gen,
+        db,
+        store,
+        max_bytes=settings.pdf_storage_max_mb * 1024 * 1024,
+        max_age_days=settings.pdf_storage_max_age_days,
+        sweep_interval_s=settings.pdf_storage_sweep_interval_s,
+    )
+
+
 def get_company_info() -> dict[str, str]:
     """
     Récupère les informations de l'entreprise depuis la configuration.
@@ -0,0 +1,294 @@
+"""Contexte métier (data_administration) injecté dans le prompt de l'orchestrateur."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from sqlalchemy import select
+
+from execution.models.database import DataAdministration
+from execution.tools.db_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Préfixe de id_data_administration -> mots-clés (normalisés) qui le rendent pertinent
+ROW_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "facturation_client": ("facture", "devis", "client", "prestation"),
+    "quittance_loyer": ("quittance", "loyer", "locataire"),
+    "charge_locative": ("charge", "regularisation", "provision"),
+    "frai_kilometrique": ("km", "kilometr", "frais", "trajet", "deplacement", "mission"),
+}
+
+# Colonnes exportées vers le prompt (les autres n'aident pas le LLM)
+CONTEXT_COLUMNS = (
+    "id_data_administration",
+    "nom_client",
+    "adresse_client",
+    "produit",
+    "prix_unitaire",
+    "tva",
+    "paiement",
+    "nom_entreprise",
+    "adresse_entreprise",
+    "adresse_professionnel",
+    "nom_professionnel",
+    "montant_loyer",
+    "charges",
+    "nom_client_mission",
+    "adresse_client_mission",
+    "trajet_client_mission",
+    "puissance_fiscal",
+    "devise",
+    "email_entreprise",
+    "email_client",
+    "email_professionnel_1",
+    "email_professionnel_2",
+)
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents, pour les comparaisons tolérantes."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def row_kind(row: dict[str, Any]) -> str:
+    """Type d'une ligne : id_data_administration sans son suffixe numérique."""
+    return str(row.get("id_data_administration", "")).rsplit("_", 1)[0]
+
+
+def compact_row(row: Any) -> dict[str, Any]:
+    """Ligne DataAdministration réduite à ses colonnes utiles et renseignées."""
+    compact = {}
+    for column in CONTEXT_COLUMNS:
+        value = row.get(column) if isinstance(row, dict) else getattr(row, column, None)
+        if value is None or value == "" or value == [] or value == {}:
+            continue
+        if isinstance(value, Decimal):
+            value = format(value.normalize(), "f")
+        compact[column] = value
+    return compact
+
+
+def rows_fingerprint(rows: list[dict[str, Any]]) -> str:
+    """Empreinte courte des lignes de contexte (change dès qu'une ligne change)."""
+    payload = json.dumps(rows, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def select_relevant_rows(rows: list[dict[str, Any]], text: str) -> list[dict[str, Any]]:
+    """
+    Filtre les lignes utiles pour un message.
+
+    Une ligne client est retenue si le client est cité ; à défaut, toutes les
+    lignes client le sont quand le message parle de facture/devis. Les autres
+    lignes sont retenues sur mots-clés de leur type de document.
+    """
+    normalized = normalize(text)
+    clients = [row for row in rows if row_kind(row) == "facturation_client"]
+    cited = [
+        row
+        for row in clients
+        if row.get("nom_client") and normalize(row["nom_client"]) in normalized
+    ]
+
+    relevant = []
+    for row in rows:
+        kind = row_kind(row)
+        keywords = ROW_KEYWORDS.get(kind, ())
+        if kind == "facturation_client":
+            if row in cited or (not cited and any(k in normalized for k in keywords)):
+                relevant.append(row)
+        elif any(k in normalized for k in keywords):
+            relevant.append(row)
+    return relevant
+
+
+def render_business_context(
+    rows: list[dict[str, Any]],
+    text: str,
+    year: int,
+    max_chars: int = 2500,
+) -> str:
+    """
+    Texte compact du contexte métier pertinent pour un message.
+
+    Returns:
+        Bloc à insérer dans le prompt, ou chaîne vide si rien n'est pertinent
+    """
+    relevant = select_relevant_rows(rows, text)
+    if not relevant:
+        return ""
+
+    lines = [f"BUSINESS CONTEXT (data_administration, année {year}):"]
+    client_names = sorted({row["nom_client"] for row in rows if row.get("nom_client")})
+    if client_names:
+        lines.append(f"- Clients connus: {', '.join(client_names)}")
+    for row in relevant:
+        fields = " | ".join(f"{k}={v}" for k, v in row.items() if k != "id_data_administration")
+        lines.append(f"- {row['id_data_administration']}: {fields}")
+
+    context = "\n".join(lines)
+    if len(context) > max_chars:
+        context = context[:max_chars].rsplit("\n", 1)[0] + "\n- (tronqué)"
+    return context
+
+
+def _name_tokens(name: str) -> tuple[str, ...]:
+    return tuple(re.findall(r"\w+", normalize(name)))
+
+
+def _find_client(rows: list[dict[str, Any]], client_name: str | None) -> dict[str, Any] | None:
+    """
+    Ligne facturation_client d'un client : nom identique (normalisé), à défaut
+    le client dont le nom commence par les mots cités, ou l'inverse ("ALTECA" /
+    "ALTECA SAS"), sur le plus de mots. Plusieurs candidats à égalité : None,
+    rien n'est deviné.
+    """
+    wanted = _name_tokens(client_name or "")
+    if not wanted:
+        return None
+    clients = [
+        row for row in rows if row_kind(row) == "facturation_client" and row.get("nom_client")
+    ]
+    for row in clients:
+        if _name_tokens(row["nom_client"]) == wanted:
+            return row
+
+    candidates: dict[int, list[dict[str, Any]]] = {}
+    for row in clients:
+        tokens = _name_tokens(row["nom_client"])
+        shorter, longer = sorted((tokens, wanted), key=len)
+        if shorter and longer[: len(shorter)] == shorter:
+            candidates.setdefault(len(shorter), []).append(row)
+    best = candidates[max(candidates)] if candidates else []
+    return best[0] if len(best) == 1 else None
+
+
+def _vat_rate(value: Any) -> float | None:
+    """'20', '20%', '0.2' -> 0.2"""
+    try:
+        rate = Decimal(str(value).replace("%", "").replace(",", ".").strip())
+    except (InvalidOperation, ValueError):
+        return None
+    return float(rate / 100 if rate > 1 else rate)
+
+
+def enrich_extracted_data(
+    intent: str, data: dict[str, Any], rows: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Complète localement (sans LLM) les champs manquants depuis data_administration.
+
+    Seuls les champs absents sont remplis : une valeur donnée par l'utilisateur
+    n'est jamais écrasée.
+    """
+    data = dict(data or {})
+
+    if intent in ("invoice", "quote"):
+        client = _find_client(rows, data.get("client_name"))
+        if client is None:
+            return data
+        data["client_name"] = data.get("client_name") or client["nom_client"]
+        if not data.get("client_address") and client.get("adresse_client"):
+            data["client_address"] = client["adresse_client"]
+        if intent == "invoice" and not data.get("payment_conditions") and client.get("paiement"):
+            data["payment_conditions"] = client["paiement"]
+
+        vat_rate = _vat_rate(client["tva"]) if client.get("tva") is not None else None
+        items = [dict(item) for item in data.get("items") or []]
+        if not items and client.get("produit") and client.get("prix_unitaire") is not None:
+            items = [{"description": client["produit"], "quantity": 1}]
+        for item in items:
+            if item.get("unit_price") in (None, "") and client.get("prix_unitaire") is not None:
+                item["unit_price"] = float(Decimal(str(client["prix_unitaire"])))
+            if not item.get("description") and client.get("produit"):
+                item["description"] = client["produit"]
+            if item.get("vat_rate") in (None, "") and vat_rate is not None:
+                item["vat_rate"] = vat_rate
+        if items:
+            data["items"] = items
+
+    elif intent == "rent_receipt":
+        row = next((r for r in rows if row_kind(r) == "quittance_loyer"), None)
+        if row and not data.get("rent_amount") and row.get("montant_loyer") is not None:
+            data["rent_amount"] = float(Decimal(str(row["montant_loyer"])))
+
+    elif intent == "mileage":
+        row = next((r for r in rows if row_kind(r) == "frai_kilometrique"), None)
+        if row and row.get("puissance_fiscal"):
+            trips = [dict(trip) for trip in data.get("trips") or []]
+            for trip in trips:
+                trip.setdefault("fiscal_power", row["puissance_fiscal"])
+            if trips:
+                data["trips"] = trips
+
+    return data
+
+
+class BusinessContextProvider:
+    """
+    Charge les lignes data_administration de l'année, avec un cache à durée de vie.
+
+    Ces données changent rarement : les relire à chaque message coûterait
+    une requête SQL par tour de conversation.
+    """
+
+    def __init__(self, db: DatabaseManager, ttl_s: float = 300):
+        """
+        Args:
+            db: Gestionnaire de base de données
+            ttl_s: Durée de validité du cache (secondes)
+        """
+        self.db = db
+        self.ttl_s = ttl_s
+        self._cache: dict[int, tuple[float, list[dict[str, Any]]]] = {}
+        self._loading: dict[int, asyncio.Future] = {}
+
+    async def rows(self, year: int | None = None) -> list[dict[str, Any]]:
+        """
+        Lignes compactées de l'année (par défaut l'année courante).
+
+        Les appels simultanés (préchargement et orchestrateur) partagent la
+        même lecture ; annuler l'un d'eux n'interrompt pas la lecture.
+        """
+        year = year or date.today().year
+        cached = self._cache.get(year)
+        if cached and time.monotonic() - cached[0] < self.ttl_s:
+            return cached[1]
+
+        loading = self._loading.get(year)
+        if loading is None:
+            loading = asyncio.ensure_future(self._load(year, cached))
+            self._loading[year] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(year, None))
+        return await asyncio.shield(loading)
+
+    async def _load(
+        self, year: int, cached: tuple[float, list[dict[str, Any]]] | None
+    ) -> list[dict[str, Any]]:
+        try:
+            async with self.db.async_session_maker() as session:
+                result = await session.execute(
+                    select(DataAdministration)
+                    .where(DataAdministration.annee == year)
+                    .order_by(DataAdministration.id_data_administration)
+                )
+                rows = [compact_row(obj) for obj in result.scalars().all()]
+        except Exception as e:
+            logger.warning(f"Contexte métier indisponible: {e}")
+            return cached[1] if cached else []
+
+        self._cache[year] = (time.monotonic(), rows)
+        return rows
+
+    def invalidate(self) -> None:
+        """Vide le cache (après modification de data_administration)."""
+        self._cache.clear()
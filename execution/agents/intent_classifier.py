@@ -0,0 +1,328 @@
+"""Classifieur d'intentions local (n-grammes de caractères + régression logistique NumPy)."""
+
+import logging
+import re
+import time
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from execution.agents.business_context import normalize
+from execution.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Intentions traitées sans LLM ; "other" = escalade vers l'orchestrateur
+FAST_PATH_LABELS = ("stats", "greeting", "thanks")
+LABELS = FAST_PATH_LABELS + ("other",)
+
+# Réponses immédiates des intentions conversationnelles
+CANNED_REPLIES = {
+    "greeting": (
+        "Bonjour ! Je suis votre assistant administratif. Je peux générer des factures, "
+        "devis, notes de frais, quittances et décomptes de charges. Que puis-je faire pour vous ?"
+    ),
+    "thanks": "Avec plaisir ! N'hésitez pas si vous avez besoin d'un autre document.",
+}
+
+SEED_EXAMPLES: dict[str, tuple[str, ...]] = {
+    "stats": (
+        "stats",
+        "statistiques",
+        "mes stats",
+        "mes statistiques",
+        "montre mes stats",
+        "affiche mes statistiques",
+        "combien de documents",
+        "combien de factures ai-je fait",
+        "nombre de documents générés",
+        "tableau de bord",
+        "mon dashboard",
+        "résumé de mon activité",
+        "voir mes stats",
+        "stat",
+        "donne moi les stats",
+        "combien de devis j'ai fait",
+    ),
+    "greeting": (
+        "bonjour",
+        "salut",
+        "hello",
+        "coucou",
+        "bonsoir",
+        "hey",
+        "yo",
+        "salut ça va",
+        "bonjour comment ça va",
+        "hello ça va ?",
+        "bonjour !",
+        "salut !",
+        "hi",
+        "re bonjour",
+        "ça va ?",
+        "comment vas-tu",
+        "bonjour toi",
+    ),
+    "thanks": (
+        "merci",
+        "merci beaucoup",
+        "merci !",
+        "super merci",
+        "top merci",
+        "parfait merci",
+        "merci bien",
+        "génial merci",
+        "thanks",
+        "thank you",
+        "cool merci",
+        "nickel merci",
+        "merci à toi",
+        "c'est parfait, merci",
+        "mille mercis",
+        "ok merci",
+    ),
+    "other": (
+        "fais une facture pour ALTECA de 500€",
+        "facture pour Apple de 5000€ pour du dev python",
+        "devis pour ClientXYZ de 3000€ audit SEO",
+        "quittance de loyer pour janvier",
+        "frais km paris lyon 465 km",
+        "décompte de charges 2025",
+        "vas-y",
+        "oui",
+        "c'est bon",
+        "envoie la facture par email",
+        "modifie le montant à 600",
+        "quelle est la TVA sur 500€",
+        "combien je dois facturer pour 3 jours à 550€",
+        "fais la quittance du mois dernier",
+        "note de frais pour le trajet d'hier",
+        "peux-tu refaire le devis",
+        "annule",
+        "qui es-tu",
+        "que peux-tu faire",
+        "aide",
+        "envoie-moi le dernier devis",
+        "merci, fais maintenant une facture pour ALTECA",
+        "bonjour, je veux un devis pour Apple",
+        "stats des factures impayées par client en 2024 avec détail",
+    ),
+}
+
+_SPACES = re.compile(r"\s+")
+
+# Précisions qu'une demande de stats peut porter (période, filtre) : /stats n'en tient pas
+# compte, la demande est alors confiée au LLM (motif sur le texte normalisé)
+STATS_QUALIFIERS = re.compile(
+    r"\d|\b(?:janvier|fevrier|mars|avril|mai|juin|juillet|aout|septembre|octobre|novembre|decembre"
+    r"|mois|semaines?|annees?|ans?|trimestres?|jours?|hier|aujourd|derni\w*|depuis"
+    r"|impaye\w*|payee?s?|clients?)\b"
+)
+
+
+@dataclass
+class IntentPrediction:
+    """Résultat du classifieur pour un message."""
+
+    label: str
+    confidence: float
+    fast_path: bool
+    elapsed_ms: float
+
+
+class IntentClassifier:
+    """
+    Classifieur linéaire sur n-grammes de caractères hachés, pondérés TF-IDF.
+
+    Entraîné en NumPy (descente de gradient sur une régression logistique
+    multinomiale) sur des exemples annotés et sur l'historique des messages
+    utilisateur (pseudo-étiquetés). Seules les prédictions au-dessus du seuil,
+    sur des messages courts, court-circuitent le LLM.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        max_chars: int = 60,
+        n_features: int = 4096,
+        ngram_range: tuple[int, int] = (2, 4),
+    ):
+        """
+        Args:
+            threshold: Probabilité minimale pour court-circuiter le LLM
+            max_chars: Longueur maximale d'un message éligible au raccourci
+            n_features: Dimension de l'espace haché des n-grammes
+            ngram_range: Tailles minimale et maximale des n-grammes de caractères
+        """
+        self.threshold = threshold
+        self.max_chars = max_chars
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.idf = np.ones(n_features, dtype=np.float32)
+        self.weights: np.ndarray | None = None
+        self.bias: np.ndarray | None = None
+
+    # --- Représentation --------------------------------------------------
+
+    def _ngram_ids(self, text: str) -> list[int]:
+        padded = f" {_SPACES.sub(' ', normalize(text).strip())} "
+        low, high = self.ngram_range
+        return [
+            zlib.crc32(padded[i : i + n].encode()) % self.n_features
+            for n in range(low, high + 1)
+            for i in range(len(padded) - n + 1)
+        ]
+
+    def _term_counts(self, texts: list[str]) -> np.ndarray:
+        counts = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(counts[row], self._ngram_ids(text), 1.0)
+        return counts
+
+    def _vectorize(self, texts: list[str]) -> np.ndarray:
+        features = np.log1p(self._term_counts(texts)) * self.idf
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return features / np.maximum(norms, 1e-12)
+
+    # --- Entraînement ----------------------------------------------------
+
+    def fit(
+        self,
+        texts: list[str],
+        labels: list[str],
+        epochs: int = 300,
+        learning_rate: float = 2.0,
+        l2: float = 1e-4,
+    ) -> "IntentClassifier":
+        """Entraîne le modèle (TF-IDF + softmax) sur des exemples annotés."""
+        counts = self._term_counts(texts)
+        document_frequency = (counts > 0).sum(axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        features = self._vectorize(texts)
+
+        targets = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        targets[np.arange(len(texts)), [LABELS.index(label) for label in labels]] = 1.0
+
+        self.weights = np.zeros((self.n_features, len(LABELS)), dtype=np.float32)
+        self.bias = np.zeros(len(LABELS), dtype=np.float32)
+        for _ in range(epochs):
+            probabilities = self._softmax(features @ self.weights + self.bias)
+            error = (probabilities - targets) / len(texts)
+            self.weights -= learning_rate * (features.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        return self
+
+    def fit_with_history(
+        self, history_messages: Iterable[str], pseudo_label_threshold: float = 0.95
+    ) -> "IntentClassifier":
+        """
+        Entraîne sur les exemples annotés et sur l'historique chat_history.
+
+        Les messages historiques sont pseudo-étiquetés par un premier modèle
+        entraîné sur les seuls exemples : une prédiction très sûre donne son
+        étiquette, un message long non reconnu devient "other", le reste est
+        ignoré (trop ambigu pour servir d'exemple).
+        """
+        texts, labels = seed_dataset()
+        self.fit(texts, labels)
+
+        extra_texts, extra_labels = [], []
+        seen = {normalize(text) for text in texts}
+        for message in history_messages:
+            key = normalize(message).strip()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            label, confidence = self._predict_one(message)
+            if confidence >= pseudo_label_threshold:
+                extra_texts.append(message)
+                extra_labels.append(label)
+            elif len(key.split()) >= 4:
+                extra_texts.append(message)
+                extra_labels.append("other")
+
+        if extra_texts:
+            self.fit(texts + extra_texts, labels + extra_labels)
+        logger.info(
+            f"🧮 Classifieur d'intentions entraîné ({len(texts)} exemples + {len(extra_texts)} historiques)"
+        )
+        return self
+
+    # --- Prédiction ------------------------------------------------------
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def _predict_one(self, text: str) -> tuple[str, float]:
+        probabilities = self._softmax(self._vectorize([text]) @ self.weights + self.bias)[0]
+        best = int(probabilities.argmax())
+        return LABELS[best], float(probabilities[best])
+
+    def predict(self, text: str) -> IntentPrediction:
+        """
+        Prédit l'intention d'un message.
+
+        fast_path est vrai si l'intention peut être traitée sans LLM : classe
+        rapide, confiance au-dessus du seuil, message court et, pour les stats,
+        sans précision de période ou de filtre (STATS_QUALIFIERS).
+        """
+        started = time.perf_counter()
+        if self.weights is None or not text or len(text.strip()) > self.max_chars:
+            return IntentPrediction("other", 0.0, False, (time.perf_counter() - started) * 1000)
+
+        label, confidence = self._predict_one(text)
+        fast_path = label in FAST_PATH_LABELS and confidence >= self.threshold
+        if label == "stats" and STATS_QUALIFIERS.search(normalize(text)):
+            fast_path = False
+        return IntentPrediction(
+            label, confidence, fast_path, (time.perf_counter() - started) * 1000
+        )
+
+
+def seed_dataset() -> tuple[list[str], list[str]]:
+    """Exemples annotés (textes, étiquettes)."""
+    texts, labels = [], []
+    for label, examples in SEED_EXAMPLES.items():
+        texts.extend(examples)
+        labels.extend([label] * len(examples))
+    return texts, labels
+
+
+def record_fast_path(prediction: IntentPrediction) -> None:
+    """
+    Met à jour les métriques du raccourci (taux de réussite, latence économisée).
+
+    La latence économisée d'un raccourci est estimée par la latence moyenne
+    observée de l'orchestrateur LLM, moins le temps du classifieur.
+    """
+    metrics.observe("intent_classifier.latency_ms", prediction.elapsed_ms)
+    if not prediction.fast_path:
+        metrics.increment("intent_classifier.misses")
+        return
+
+    metrics.increment("intent_classifier.hits")
+    metrics.increment(f"intent_classifier.hits.{prediction.label}")
+    llm_latency = metrics.summary("orchestrator.analyze_ms").get("mean")
+    if llm_latency is not None:
+        metrics.observe(
+            "intent_classifier.latency_saved_ms", max(0.0, llm_latency - prediction.elapsed_ms)
+        )
+
+
+def fast_path_report() -> dict[str, float]:
+    """Taux de réussite du raccourci et latence économisée (cumulée, en ms)."""
+    hits = metrics.counter("intent_classifier.hits")
+    misses = metrics.counter("intent_classifier.misses")
+    saved = metrics.summary("intent_classifier.latency_saved_ms")
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "classifier_p50_ms": metrics.percentile("intent_classifier.latency_ms", 50) or 0.0,
+        "latency_saved_ms": saved.get("mean", 0.0) * saved["count"],
+    }
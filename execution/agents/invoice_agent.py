@@ -33,7 +33,7 @@ class InvoiceAgent(BaseAdminAgent):
             # 1. Génère numéro de facture si absent
             if "invoice_number" not in data or not data["invoice_number"]:
                 year = date.today().year
-                data["invoice_number"] = await self.db.get_next_invoice_number(year)
+                data["invoice_number"] = await self.document_number(state, lambda: self.db.get_next_invoice_number(year), year)
                 self.logger.info(f"Numéro de facture généré: {data['invoice_number']}")
 
             # 2. Date par défaut = aujourd'hui
@@ -107,6 +107,16 @@ class InvoiceAgent(BaseAdminAgent):
             self.logger.error(f"Unexpected error: {e}", exc_info=True)
             return state
 
+    def summarize(self, validated_data: dict) -> list[str]:
+        """Totaux HT / TVA / TTC et échéance de la facture."""
+        invoice = Invoice(**validated_data)
+        return [
+            f"Total HT : {float(invoice.total_ht):.2f}€",
+            f"TVA : {float(invoice.total_vat):.2f}€",
+            f"<b>Total TTC : {float(invoice.total_ttc):.2f}€</b>",
+            f"Échéance : {invoice.due_date.strftime('%d/%m/%Y')}",
+        ]
+
     async def generate_pdf(self, state: AdminAgentState) -> AdminAgentState:
         """
         Génère le PDF de la facture.
@@ -130,7 +140,11 @@ class InvoiceAgent(BaseAdminAgent):
             company_info = get_company_info()
 
             # Générer le PDF
-            pdf_path = self.pdf_gen.generate_invoice_pdf(invoice, company_info)
+            pdf_path = await self.render_with_store(
+                state,
+                DocumentType.INVOICE,
+                lambda: self.pdf_gen.generate_invoice_pdf(invoice, company_info),
+            )
 
             state["pdf_path"] = pdf_path
             self.logger.info(f"✅ PDF généré: {pdf_path}")
@@ -166,6 +180,8 @@ class InvoiceAgent(BaseAdminAgent):
                 data=state["validated_data"],
                 pdf_path=str(state["pdf_path"]) if state["pdf_path"] else None,
                 user_id=state["user_id"],
+                telegram_file_id=state.get("telegram_file_id"),
+                content_hash=state.get("content_hash"),
             )
 
             state["db_record_id"] = doc.id
@@ -0,0 +1,94 @@
+"""Analyse incrémentale d'un objet JSON reçu en flux (réponse LLM)."""
+
+import json
+from typing import Any
+
+
+class IncrementalJSONParser:
+    """
+    Extrait les champs de premier niveau d'un objet JSON au fil des chunks.
+
+    Chaque champ est disponible dans `fields` dès que sa valeur est complète,
+    sans attendre la fin de l'objet : "intent" puis "extracted_data" sont
+    utilisables avant que "reply_text" ne soit généré. Le texte précédant
+    la première accolade (préambule, bloc ```json) est ignoré. Chaque
+    caractère n'est parcouru qu'une fois.
+    """
+
+    def __init__(self):
+        self.fields: dict[str, Any] = {}
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._string_start = 0
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    def feed(self, chunk: str) -> list[str]:
+        """
+        Ajoute un chunk de texte.
+
+        Returns:
+            Noms des champs complétés par ce chunk
+        """
+        completed: list[str] = []
+        self._buffer += chunk
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.done:
+            i = self._pos
+            ch = buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._expect_key:
+                            self._key = json.loads(buffer[self._string_start : i + 1])
+                        else:
+                            self._complete(i + 1, completed)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._complete(i, completed)
+                    self.done = True
+                self._depth -= 1
+                if self._depth == 1:
+                    self._complete(i + 1, completed)
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+                self._value_start = i + 1
+            elif self._depth == 1 and ch == ",":
+                self._complete(i, completed)
+                self._expect_key = True
+        return completed
+
+    def _complete(self, end: int, completed: list[str]) -> None:
+        """Décode la valeur du champ courant si elle n'est pas déjà décodée."""
+        if self._key is None or self._value_start is None:
+            return
+        raw = self._buffer[self._value_start : end].strip()
+        key, self._key, self._value_start = self._key, None, None
+        if not raw:
+            return
+        try:
+            self.fields[key] = json.loads(raw)
+            completed.append(key)
+        except json.JSONDecodeError:
+            pass
@@ -80,14 +80,15 @@ class MileageAgent(BaseAdminAgent):
 
             # 5. Générer le numéro de document pour le rapport
             year = date.today().year
-            doc_number = await self.db.get_next_mileage_number(year)
+            doc_number = await self.document_number(state, lambda: self.db.get_next_mileage_number(year), year)
 
             # 6. Préparer les données validées pour le state
-            # On stocke les records sérialisés et le numéro de document
+            # On stocke les records sérialisés, le numéro et la date d'émission (imprimée sur le PDF)
             state["validated_data"] = {
                 "document_number": doc_number,
                 "records": [rec.model_dump(mode="json") for rec in validated_records],
-                "total_amount": float(sum(rec.total_amount for rec in validated_records))
+                "total_amount": float(sum(rec.total_amount for rec in validated_records)),
+                "issued_on": date.today().isoformat(),
             }
 
             self.logger.info(
@@ -106,6 +107,15 @@ class MileageAgent(BaseAdminAgent):
             self.logger.error(f"Unexpected error: {e}", exc_info=True)
             return state
 
+    def summarize(self, validated_data: dict) -> list[str]:
+        """Distance totale et montant des indemnités kilométriques."""
+        records = [MileageRecord(**record) for record in validated_data["records"]]
+        total_km = sum(record.distance_km for record in records)
+        return [
+            f"{len(records)} trajet(s), {float(total_km):.0f} km",
+            f"<b>Total : {validated_data['total_amount']:.2f}€</b>",
+        ]
+
     async def generate_pdf(self, state: AdminAgentState) -> AdminAgentState:
         """
         Génère le PDF de la note de frais.
@@ -123,20 +133,17 @@ class MileageAgent(BaseAdminAgent):
             self.logger.info("Génération du PDF de frais kilométriques...")
 
             data = state["validated_data"]
-            records = [MileageRecord(**rec) for rec in data["records"]]
-            doc_number = data["document_number"]
 
             # Récupérer les infos de l'entreprise
             company_info = get_company_info()
 
-            # Générer le PDF
-            # Note: generate_mileage_pdf dans pdf_generator ne prend pas encore doc_number en paramètre explicite
-            # mais génère un filename basé sur timestamp.
-            # On pourrait améliorer cela, mais pour l'instant on utilise la méthode existante.
-            pdf_path = self.pdf_gen.generate_mileage_pdf(
-                records=records, 
-                company_info=company_info,
-                period_label=f"Note de Frais #{doc_number}"
+            # Générer le PDF (même chemin que le re-rendu d'un PDF évincé)
+            pdf_path = await self.render_with_store(
+                state,
+                DocumentType.MILEAGE,
+                lambda: self.pdf_gen.render_document(
+                    DocumentType.MILEAGE, data, company_info
+                ).pdf_path,
             )
 
             state["pdf_path"] = pdf_path
@@ -174,6 +181,8 @@ class MileageAgent(BaseAdminAgent):
                 data=data, # On sauvegarde tout le json (records + total)
                 pdf_path=str(state["pdf_path"]) if state["pdf_path"] else None,
                 user_id=state["user_id"],
+                telegram_file_id=state.get("telegram_file_id"),
+                content_hash=state.get("content_hash"),
             )
 
             state["db_record_id"] = doc.id
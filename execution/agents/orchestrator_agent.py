@@ -1,11 +1,32 @@
 """Agent Orchestrateur pour l'analyse du langage naturel."""
 
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, AIMessageChunk, ToolMessage
 from execution.core.config import get_settings
-from execution.prompts.orchestrator_prompts import ORCHESTRATOR_SYSTEM_PROMPT
+from execution.core.llm import ModelRouter, hedged_call
+from execution.core.metrics import metrics
+from execution.core.usage import TurnUsage
+from execution.agents.business_context import (
+    BusinessContextProvider,
+    enrich_extracted_data,
+    render_business_context,
+    rows_fingerprint,
+)
+from execution.agents.json_stream import IncrementalJSONParser
+from execution.agents.response_cache import BYPASS_PREFIX, ResponseCache
+from execution.models.intent_results import (
+    FINAL_ANSWER_TOOL,
+    ParsedAnswer,
+    final_answer_tool,
+    missing_fields,
+    parse_final_answer,
+)
+from execution.prompts.orchestrator_prompts import (
+    FINAL_ANSWER_OUTPUT_FORMAT,
+    JSON_OUTPUT_FORMAT,
+    ORCHESTRATOR_CONTEXT_PROMPT,
+    ORCHESTRATOR_SYSTEM_PROMPT,
+)
 from execution.tools import (
     CalculatorTool,
     DatabaseQueryTool,
@@ -14,9 +35,13 @@ from execution.tools import (
     MarkdownCleanerTool,
     DatabaseManager
 )
-from typing import Any, Dict, TypedDict, List
+from execution.tools.markdown_cleaner_tool import clean_for_telegram
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, TypedDict, List, Optional
+import asyncio
 import logging
-import json
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +51,148 @@ class IntentResult(TypedDict):
     extracted_data: Dict[str, Any]
     reply_text: str | None
     tool_calls: List[Dict[str, Any]] | None
+    llm_iterations: int
+
+# Intentions traitées par un agent de génération de document
+DOCUMENT_INTENTS = ("invoice", "quote", "mileage", "rent_receipt", "rental_charges")
+
+# Timeouts spécifiques par outil (secondes) ; sinon settings.orchestrator_tool_timeout_s
+TOOL_TIMEOUTS_S: Dict[str, float] = {
+    "whisper_transcription": 120.0,
+    "send_email": 60.0,
+}
+
+
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_INTENT_FIELD = re.compile(r'"intent"\s*:\s*"([^"]*)"')
+_REPLY_FIELD = re.compile(r'"reply_text"\s*:\s*"')
+
+
+def partial_reply_text(content: str) -> Optional[str]:
+    """
+    Texte de réponse lisible dans une réponse LLM encore incomplète.
+
+    Réponse en texte libre : le texte tel quel. Réponse JSON : le début de
+    "reply_text" (échappements décodés), seulement si l'intention déjà reçue
+    est "chat" ; None tant que rien n'est affichable.
+    """
+    stripped = content.lstrip()
+    if not stripped:
+        return None
+    if not stripped.startswith(("{", "`")):
+        return content
+
+    intent = _INTENT_FIELD.search(content)
+    reply = _REPLY_FIELD.search(content)
+    if not intent or intent.group(1) != "chat" or not reply:
+        return None
+
+    chars, i = [], reply.end()
+    while i < len(content):
+        ch = content[i]
+        if ch == '"':
+            break
+        if ch != "\\":
+            chars.append(ch)
+            i += 1
+            continue
+        escape = content[i + 1:i + 2]
+        if escape == "u":
+            code = content[i + 2:i + 6]
+            if len(code) < 4:
+                break  # Séquence incomplète : attendre la suite du flux
+            chars.append(chr(int(code, 16)))
+            i += 6
+        elif escape:
+            chars.append(_JSON_ESCAPES.get(escape, escape))
+            i += 2
+        else:
+            break
+    return "".join(chars) or None
+
+
+async def execute_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    tools_map: Dict[str, Any],
+    max_concurrency: int = 4,
+    default_timeout_s: float = 30.0,
+    timeouts: Optional[Dict[str, float]] = None,
+) -> List[ToolMessage]:
+    """
+    Exécute en parallèle les appels d'outils d'une même réponse du LLM.
+
+    Les appels d'une même réponse sont indépendants : ils s'exécutent en
+    concurrence (au plus max_concurrency à la fois), chacun borné par son
+    timeout. Les ToolMessage sont renvoyés dans l'ordre des tool_calls,
+    quel que soit l'ordre de fin d'exécution.
+
+    Args:
+        tool_calls: Appels d'outils de la réponse (name, args, id)
+        tools_map: Outils disponibles par nom
+        max_concurrency: Nombre maximal d'outils exécutés simultanément
+        default_timeout_s: Timeout par défaut d'un appel
+        timeouts: Timeouts spécifiques par nom d'outil (défaut: TOOL_TIMEOUTS_S)
+
+    Returns:
+        Un ToolMessage par appel, dans l'ordre de tool_calls
+    """
+    timeouts = TOOL_TIMEOUTS_S if timeouts is None else timeouts
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(tool_call: Dict[str, Any]) -> ToolMessage:
+        tool_name = tool_call["name"]
+        tool = tools_map.get(tool_name)
+
+        if tool is None:
+            tool_output = f"Tool {tool_name} not found."
+        else:
+            timeout_s = timeouts.get(tool_name, default_timeout_s)
+            async with semaphore:
+                try:
+                    # ainvoke route vers _arun (ou _run dans un thread pour les outils synchrones)
+                    tool_output = await asyncio.wait_for(tool.ainvoke(tool_call["args"]), timeout_s)
+                    logger.info(f"   ✅ Output {tool_name}: {str(tool_output)[:50]}...")
+                except asyncio.TimeoutError:
+                    tool_output = f"Error executing {tool_name}: timed out after {timeout_s:g}s"
+                    logger.error(f"   ⏱️ Timeout {tool_name} ({timeout_s:g}s)")
+                except Exception as e:
+                    tool_output = f"Error executing {tool_name}: {str(e)}"
+                    logger.error(f"   ❌ Error {tool_name}: {e}")
+
+        return ToolMessage(content=str(tool_output), tool_call_id=tool_call["id"])
+
+    # gather conserve l'ordre des appels : le scratchpad reste déterministe
+    return list(await asyncio.gather(*(run_one(tool_call) for tool_call in tool_calls)))
+
+
+def build_orchestrator_prompt(static_prompt: str, cache: bool = True) -> ChatPromptTemplate:
+    """
+    Prompt de l'orchestrateur : préfixe statique d'abord, parties variables ensuite.
+
+    Le prompt système statique (précédé dans la requête des schémas
+    d'outils) est identique d'un appel à l'autre ; avec cache, il est marqué
+    cache_control pour le cache de prompt des fournisseurs qui le demandent
+    (Anthropic, Gemini via OpenRouter), les autres mettant en cache les
+    préfixes identiques d'eux-mêmes. Suivent l'historique, la date et le
+    contexte métier, le message, puis les étapes du tour : chaque itération
+    prolonge la requête précédente.
+
+    Args:
+        static_prompt: Consignes et format de sortie (accolades doublées, comme un template)
+        cache: Marquer le préfixe pour le cache de prompt
+    """
+    text = ChatPromptTemplate.from_messages([("system", static_prompt)]).format_messages()[0].content
+    block: Dict[str, Any] = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=[block]),
+        MessagesPlaceholder(variable_name="history"),
+        ("system", ORCHESTRATOR_CONTEXT_PROMPT),
+        ("user", "{input}"),
+        MessagesPlaceholder(variable_name="agent_scratchpad"),  # Appels d'outils et résultats du tour
+    ])
+
 
 class OrchestratorAgent:
     """
@@ -33,9 +200,23 @@ class OrchestratorAgent:
     utilise des outils et dirige vers le bon agent spécialisé.
     """
 
-    def __init__(self):
+    def __init__(self, router: Optional[ModelRouter] = None, db: Optional[DatabaseManager] = None):
+        """
+        Args:
+            router: Routeur de modèles partagé (optionnel)
+            db: Gestionnaire de base de données partagé (optionnel)
+        """
         self.settings = get_settings()
-        self.db = DatabaseManager()
+        self.router = router or ModelRouter(self.settings)
+        self.db = db or DatabaseManager()
+        self.business_context = BusinessContextProvider(
+            self.db, ttl_s=self.settings.business_context_ttl_s
+        )
+        self.response_cache = ResponseCache(
+            ttl_s=self.settings.response_cache_ttl_s,
+            max_entries_per_user=self.settings.response_cache_max_entries_per_user,
+            min_confidence=self.settings.response_cache_min_confidence,
+        )
         
         # Tools
         self.tools = [
@@ -49,38 +230,265 @@ class OrchestratorAgent:
         # Map for execution
         self.tools_map = {t.name: t for t in self.tools}
         
-        # Initialisation du LLM via OpenRouter avec support Tools
-        self.llm = ChatOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.settings.openrouter_api_key,
-            model=self.settings.openrouter_model,
-            temperature=0,
-            default_headers={
-                "HTTP-Referer": "https://github.com/admin-agent-pro",
-                "X-Title": self.settings.app_name,
-            }
-        ).bind_tools(self.tools)
+        # Sortie structurée : la réponse finale est un appel à final_answer (schéma par intention)
+        structured = self.settings.orchestrator_structured_output
+        self.bound_tools = self.tools + ([final_answer_tool()] if structured else [])
+        output_format = FINAL_ANSWER_OUTPUT_FORMAT if structured else JSON_OUTPUT_FORMAT
+
+        # LLM via OpenRouter avec support Tools (modèle de routage ; autres modèles à la demande)
+        self.llm = self._chat_model(self.router.primary).bind_tools(self.bound_tools)
         
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", ORCHESTRATOR_SYSTEM_PROMPT + "\n\nCURRENT DATE: {current_date}"),
-            MessagesPlaceholder(variable_name="history"),
-            MessagesPlaceholder(variable_name="agent_scratchpad"), # For current turn intermediate steps
-            ("user", "{input}")
-        ])
+        self.static_prompt = ORCHESTRATOR_SYSTEM_PROMPT + output_format
+        self.prompt = build_orchestrator_prompt(self.static_prompt, cache=self.settings.llm_prompt_caching_enabled)
         
         # We handle the chain execution manually in the loop
         self.runnable = self.prompt | self.llm
+        self._runnables: Dict[str, Any] = {}
+        self._usage_tasks: set[asyncio.Task] = set()
+
+    def _chat_model(self, model: str):
+        return self.router.chat_model(
+            model,
+            stream_usage=True,  # Tokens aussi comptés pour les réponses en flux
+            default_headers={
+                "HTTP-Referer": "https://github.com/admin-agent-pro",
+                "X-Title": self.settings.app_name,
+            },
+        )
 
-    async def analyze_message(self, text: str, user_id: int) -> IntentResult:
+    def runnable_for(self, model: str):
+        """Chaîne prompt | LLM (avec outils) du modèle ; self.runnable pour le modèle de routage."""
+        if model == self.router.primary:
+            return self.runnable
+        if model not in self._runnables:
+            self._runnables[model] = self.prompt | self._chat_model(model).bind_tools(self.bound_tools)
+        return self._runnables[model]
+
+    async def _invoke(self, model: str, variables: Dict[str, Any]):
+        """
+        Appel LLM non streamé, latence enregistrée auprès du routeur.
+
+        Avec llm_hedging_enabled, une requête de couverture part vers
+        router.hedge_model(model) si la réponse tarde (voir hedged_call).
+        """
+        async def call(name: str):
+            started = time.perf_counter()
+            response = await self.runnable_for(name).ainvoke(variables)
+            self.router.record(name, (time.perf_counter() - started) * 1000)
+            return response
+
+        if not self.settings.llm_hedging_enabled:
+            return await call(model)
+
+        started = time.perf_counter()
+        hedge = self.router.hedge_model(model)
+        response, won = await hedged_call(
+            lambda: call(model), lambda: call(hedge), self.router.hedge_delay_s(model)
+        )
+        if won:
+            # Latence minimale du modèle principal : la queue reste visible pour le p95
+            self.router.record(model, (time.perf_counter() - started) * 1000)
+            logger.info(f"🏁 Requête de couverture {hedge} plus rapide que {model}")
+        return response
+
+    async def _open_stream(self, model: str, variables: Dict[str, Any]) -> tuple[str, Any, Optional[AIMessageChunk]]:
+        """
+        Ouvre le flux LLM et attend son premier chunk.
+
+        Avec llm_hedging_enabled, le hedging porte sur le délai du premier
+        token : le flux qui répond en premier est conservé, l'autre fermé.
+
+        Returns:
+            (modèle retenu, itérateur des chunks suivants, premier chunk ou None)
+        """
+        async def open_one(name: str):
+            stream = self.runnable_for(name).astream(variables).__aiter__()
+            started = time.perf_counter()
+            try:
+                first = await anext(stream, None)
+            except BaseException:
+                await stream.aclose()
+                raise
+            self.router.record_first_token(name, (time.perf_counter() - started) * 1000)
+            return name, stream, first
+
+        if not self.settings.llm_hedging_enabled:
+            return await open_one(model)
+
+        async def discard(opened) -> None:
+            await opened[1].aclose()
+
+        started = time.perf_counter()
+        hedge = self.router.hedge_model(model)
+        opened, won = await hedged_call(
+            lambda: open_one(model),
+            lambda: open_one(hedge),
+            self.router.hedge_delay_s(model, first_token=True),
+            discard,
+        )
+        if won:
+            self.router.record_first_token(model, (time.perf_counter() - started) * 1000)
+            logger.info(f"🏁 Flux de couverture {hedge} plus rapide que {model}")
+        return opened
+
+    @staticmethod
+    def _parse_final(response, parser: Optional[IncrementalJSONParser]) -> ParsedAnswer:
+        """
+        Réponse finale validée : arguments de final_answer, sinon JSON du contenu.
+
+        Un texte libre sans JSON est une réponse "chat".
+
+        Raises:
+            ValueError: Réponse finale illisible ou hors schéma
+        """
+        for call in response.tool_calls:
+            if call["name"] == FINAL_ANSWER_TOOL:
+                return parse_final_answer(call["args"])
+        for call in response.invalid_tool_calls:
+            if call.get("name") == FINAL_ANSWER_TOOL:
+                raise ValueError(f"final_answer arguments are not valid JSON: {call.get('error') or call.get('args')}")
+        if parser is not None and parser.done and "intent" in parser.fields:
+            # JSON déjà analysé pendant le flux
+            return parse_final_answer(parser.fields)
+        content = response.content if isinstance(response.content, str) else ""
+        if "{" in content:
+            # Extraire le JSON si entouré de texte
+            return parse_final_answer(content[content.find("{"):content.rfind("}") + 1])
+        if not content.strip():
+            raise ValueError("empty answer: call final_answer")
+        return ParsedAnswer(intent="chat", confidence=1.0, extracted_data={}, reply_text=content)
+
+    @staticmethod
+    def _repair_messages(response, error: Exception, in_scratchpad: bool) -> List[Any]:
+        """Messages demandant au LLM de corriger une réponse finale illisible."""
+        messages = [] if in_scratchpad else [response]
+        hint = f"Error: {error}. Call {FINAL_ANSWER_TOOL} again with arguments matching its schema."
+        final_ids = [
+            call.get("id") for call in response.tool_calls + response.invalid_tool_calls
+            if call.get("name") == FINAL_ANSWER_TOOL
+        ]
+        if final_ids:
+            messages.extend(ToolMessage(content=hint, tool_call_id=call_id) for call_id in final_ids)
+        else:
+            messages.append(HumanMessage(content=f"Your final answer could not be read. {hint}"))
+        return messages
+
+    @staticmethod
+    def _answer_text(response) -> Optional[str]:
+        """Texte JSON de la réponse en cours : arguments de final_answer, sinon contenu ; None pour un autre outil."""
+        if response.tool_call_chunks:
+            final = next((c for c in response.tool_call_chunks if c.get("name") == FINAL_ANSWER_TOOL), None)
+            return (final.get("args") or "") if final else None
+        return response.content if isinstance(response.content, str) else None
+
+    async def _astream_response(
+        self,
+        model: str,
+        variables: Dict[str, Any],
+        on_reply_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_fields: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> tuple[AIMessageChunk, IncrementalJSONParser]:
+        """
+        Appel LLM en flux : le JSON de réponse est analysé au fil des chunks.
+
+        on_reply_progress reçoit le texte de réponse dès qu'il est lisible ;
+        on_fields reçoit les champs JSON de premier niveau à chaque nouveau
+        champ complet (avant la fin de la génération).
+
+        Returns:
+            Réponse complète (chunks fusionnés, tool_calls compris) et parseur
+        """
+        started = time.perf_counter()
+        model, stream, first = await self._open_stream(model, variables)
+        response: Optional[AIMessageChunk] = None
+        parser = IncrementalJSONParser()
+        source, fed = "content", 0
+        shown = ""
+
+        async def chunks():
+            if first is not None:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+
+        async for chunk in chunks():
+            if response is None:
+                metrics.observe("orchestrator.first_token_ms", (time.perf_counter() - started) * 1000)
+                response = chunk
+            else:
+                response = response + chunk
+            text = self._answer_text(response)
+            if text is None:
+                continue
+            kind = FINAL_ANSWER_TOOL if response.tool_call_chunks else "content"
+            if kind != source:
+                # Réponse finale passée du contenu aux arguments de final_answer
+                source, fed, parser = kind, 0, IncrementalJSONParser()
+            if parser.feed(text[fed:]) and on_fields:
+                on_fields(parser.fields)
+            fed = len(text)
+            if on_reply_progress:
+                reply = partial_reply_text(text)
+                if reply and reply != shown:
+                    shown = reply
+                    await on_reply_progress(reply)
+        self.router.record(model, (time.perf_counter() - started) * 1000)
+        return (response if response is not None else AIMessageChunk(content="")), parser
+
+    async def analyze_message(
+        self,
+        text: str,
+        user_id: int,
+        on_reply_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_intent_ready: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> IntentResult:
         """
         Analyse un message texte et retourne l'intention, les données et les appels d'outils.
         Exécute les outils si nécessaire (Loop).
+
+        Le contexte métier (data_administration) est injecté dans le prompt
+        avant le premier appel ; totaux et nettoyage Telegram sont faits
+        localement après la réponse, si bien que la plupart des demandes se
+        résolvent en un seul appel LLM.
+
+        Une demande déjà traitée (même message, même contexte) est servie
+        par le cache de réponses sans appel LLM ; préfixer le message par
+        "!" force une nouvelle analyse.
+
+        Args:
+            text: Message utilisateur
+            user_id: ID Telegram de l'utilisateur
+            on_reply_progress: Appelé avec le texte de réponse cumulé pendant
+                la génération (réponses "chat" uniquement), pour l'afficher en flux
+            on_intent_ready: Appelé une fois, pendant la génération, dès que
+                l'intention (document) et extracted_data complet sont reçus,
+                avec les données enrichies : la validation peut commencer
+                sans attendre reply_text
         """
+        iterations = 0
+        usage = TurnUsage(user_id)
         try:
             logger.info(f"🧠 Analyse du message: '{text[:50]}...'")
-            
-            # Récupérer l'historique
-            history_data = await self.db.get_chat_history(user_id, limit=10)
+
+            # Récupérer l'historique et le contexte métier en parallèle
+            history_data, business_rows = await asyncio.gather(
+                self.db.get_chat_history(user_id, limit=10),
+                self.business_context.rows(),
+            )
+
+            cache_key = None
+            if self.settings.response_cache_enabled:
+                cache_key = self.response_cache.key(text, history_data, rows_fingerprint(business_rows))
+                cached = self.response_cache.get(user_id, cache_key)
+                if cached is not None:
+                    # Le cache garde les données avant enrichissement : recalées, puis complétées
+                    cached["extracted_data"] = enrich_extracted_data(
+                        cached["intent"], cached["extracted_data"], business_rows
+                    )
+                    logger.info(f"♻️ Réponse en cache: {cached['intent']} (aucun appel LLM)")
+                    self._save_usage(usage, cached["intent"])
+                    return cached
+            text = text.lstrip().removeprefix(BYPASS_PREFIX).lstrip() or text
             
             # Convertir en objets Messages LangChain
             history_messages = []
@@ -90,102 +498,209 @@ class OrchestratorAgent:
                 else:
                     history_messages.append(AIMessage(content=msg["content"]))
             
-            from datetime import datetime
-            current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            now = datetime.now()
+            current_date = now.strftime("%Y-%m-%d %H:%M:%S")
+
+            # Pertinence évaluée sur le message et les derniers messages utilisateur (confirmations)
+            recent_user_text = " ".join(
+                [msg["content"] for msg in history_data if msg["role"] == "user"][-3:] + [text]
+            )
+            business_context = render_business_context(business_rows, recent_user_text, now.year)
+
+            early_intent_sent = False
+
+            def on_fields(fields: Dict[str, Any]) -> None:
+                nonlocal early_intent_sent
+                intent, data = fields.get("intent"), fields.get("extracted_data")
+                if early_intent_sent or intent not in DOCUMENT_INTENTS or not isinstance(data, dict):
+                    return
+                try:
+                    # Même filtrage par schéma que la réponse finale : données identiques
+                    data = parse_final_answer({"intent": intent, "extracted_data": data}).extracted_data
+                except ValueError:
+                    return
+                early_intent_sent = True
+                logger.info(f"⚡ Intention {intent} reçue en cours de génération, validation anticipée")
+                on_intent_ready(intent, enrich_extracted_data(intent, data, business_rows))
 
             agent_scratchpad = []
+            executed_tool_calls = []
             max_iterations = 5
+            parse_retries = 0
+            unreadable = False
             
             for i in range(max_iterations):
-                response = await self.runnable.ainvoke({
+                iterations = i + 1
+                model = self.router.model_for("routing")
+                variables = {
                     "input": text,
                     "history": history_messages,
                     "agent_scratchpad": agent_scratchpad,
-                    "current_date": current_date
-                })
+                    "current_date": current_date,
+                    "business_context": business_context,
+                }
+                parser = None
+                started = time.perf_counter()
+                if on_reply_progress is None and on_intent_ready is None:
+                    response = await self._invoke(model, variables)
+                else:
+                    response, parser = await self._astream_response(
+                        model, variables, on_reply_progress, on_fields if on_intent_ready else None
+                    )
+                usage.add_llm_call(model, (time.perf_counter() - started) * 1000, response)
                 
-                # Si Tool Calls
-                if response.tool_calls:
-                    logger.info(f"🛠️ Tool calls détectés (Iter {i+1}): {[tc['name'] for tc in response.tool_calls]}")
+                # Si Tool Calls (hors final_answer, qui porte la réponse finale)
+                tool_calls = [tc for tc in response.tool_calls if tc["name"] != FINAL_ANSWER_TOOL]
+                if tool_calls:
+                    logger.info(f"🛠️ Tool calls détectés (Iter {i+1}): {[tc['name'] for tc in tool_calls]}")
                     
                     # Ajouter la réponse de l'assistant aux messages temporaires
                     agent_scratchpad.append(response)
+                    executed_tool_calls.extend(
+                        {"name": tc["name"], "args": tc["args"]} for tc in tool_calls
+                    )
                     
-                    # Exécuter les outils
-                    for tool_call in response.tool_calls:
-                        tool_name = tool_call["name"]
-                        args = tool_call["args"]
-                        tool_call_id = tool_call["id"]
-                        
-                        tool = self.tools_map.get(tool_name)
-                        if tool:
-                            try:
-                                # Execution: Always prefer async invoke if tool is async
-                                # In LangChain, ainvoke handles the routing to _arun automatically
-                                tool_output = await tool.ainvoke(args)
-                                    
-                                logger.info(f"   ✅ Output {tool_name}: {str(tool_output)[:50]}...")
-                            except Exception as e:
-                                tool_output = f"Error executing {tool_name}: {str(e)}"
-                                logger.error(f"   ❌ Error {tool_name}: {e}")
-                        else:
-                            tool_output = f"Tool {tool_name} not found."
-                        
-                        # Ajouter le résultat au scratchpad
-                        agent_scratchpad.append(ToolMessage(
-                            content=str(tool_output),
-                            tool_call_id=tool_call_id
-                        ))
+                    # Exécuter les outils (en parallèle, résultats dans l'ordre des appels)
+                    started = time.perf_counter()
+                    tool_messages = await execute_tool_calls(
+                        tool_calls,
+                        self.tools_map,
+                        max_concurrency=self.settings.orchestrator_tool_concurrency,
+                        default_timeout_s=self.settings.orchestrator_tool_timeout_s,
+                    )
+                    tool_ms = (time.perf_counter() - started) * 1000
+                    usage.add_tool_time(tool_ms)
+                    logger.info(f"   ⏱️ {len(tool_messages)} outil(s) exécuté(s) en {tool_ms:.0f} ms")
+
+                    # Ajouter les résultats au scratchpad
+                    agent_scratchpad.extend(tool_messages)
                     
                     # Continuer la boucle pour que le LLM traite le résultat
-                    continue
-                
-                # Si pas de tool call, c'est la réponse finale
-                content = response.content
-                intent = "chat"
-                data = {}
-                reply = None
+                    if len(tool_calls) == len(response.tool_calls):
+                        continue
                 
-                if content and "{" in content:
+                # Sinon, c'est la réponse finale
+                metrics.increment("orchestrator.final_answers")
+                try:
+                    answer = self._parse_final(response, parser)
+                except ValueError as e:
+                    metrics.increment("orchestrator.parse_failures")
+                    logger.warning(f"⚠️ Réponse finale illisible (Iter {i+1}): {e}")
+                    if parse_retries >= self.settings.orchestrator_parse_retries:
+                        unreadable = True
+                        break
+                    parse_retries += 1
+                    agent_scratchpad.extend(self._repair_messages(response, e, in_scratchpad=bool(tool_calls)))
+                    continue
+                if answer.dropped:
+                    metrics.increment("orchestrator.schema_errors")
+                    logger.warning(f"⚠️ Champs hors schéma {answer.intent} écartés: {answer.dropped}")
+                intent, data, reply = answer.intent, answer.extracted_data, answer.reply_text
+                confidence = answer.confidence
+
+                # Extraction confiée au modèle de l'intention s'il diffère du modèle de routage,
+                # seulement si la réponse du routage est incomplète
+                extraction_model = self.router.model_for("extraction", intent)
+                escalate, missing = False, []
+                if intent in DOCUMENT_INTENTS and extraction_model != model:
+                    missing = missing_fields(intent, enrich_extracted_data(intent, data, business_rows))
+                    escalate = bool(missing or answer.dropped)
+                if escalate:
+                    iterations += 1
+                    metrics.increment("orchestrator.extraction_escalations")
+                    logger.info(
+                        f"🔀 Extraction {intent} confiée à {extraction_model} "
+                        f"(manquants: {missing}, écartés: {answer.dropped})"
+                    )
                     try:
-                        # Extraire le JSON si entouré de texte
-                        json_str = content[content.find("{"):content.rfind("}")+1]
-                        result = json.loads(json_str)
-                        intent = result.get("intent", "chat")
-                        data = result.get("extracted_data", {})
-                        reply = result.get("reply_text")
-                    except Exception as e:
-                        logger.warning(f"Failed to parse JSON content: {e}")
-                        reply = content
-                else:
-                    reply = content
+                        started = time.perf_counter()
+                        escalated = await self._invoke(extraction_model, variables)
+                        usage.add_llm_call(extraction_model, (time.perf_counter() - started) * 1000, escalated)
+                        extracted = self._parse_final(escalated, None)
+                        if extracted.intent == intent:
+                            data, reply = extracted.extracted_data, extracted.reply_text or reply
+                            confidence = extracted.confidence
+                    except ValueError as e:
+                        metrics.increment("orchestrator.parse_failures")
+                        logger.warning(f"⚠️ Extraction {extraction_model} illisible, réponse du routage conservée: {e}")
+
+                # Post-traitement local (déterministe, sans appel LLM)
+                raw_data = data
+                data = enrich_extracted_data(intent, data, business_rows)
+                if reply:
+                    reply = clean_for_telegram(str(reply))
 
-                logger.info(f"🎯 Intention détectée: {intent}")
+                logger.info(f"🎯 Intention détectée: {intent} ({iterations} appel(s) LLM)")
+                self._record_iterations(iterations)
+                self._save_usage(usage, intent)
                 
-                return {
+                result: IntentResult = {
                     "intent": intent,
-                    "confidence": 1.0,
+                    "confidence": confidence,
                     "extracted_data": data,
                     "reply_text": reply,
-                    "tool_calls": None
+                    "tool_calls": executed_tool_calls or None,
+                    "llm_iterations": iterations,
                 }
+                self.response_cache.put(user_id, cache_key, {**result, "extracted_data": raw_data})
+                return result
             
-            # Si max iterations atteint
+            # Si max iterations atteint (ou réponse finale toujours illisible)
             logger.warning("⚠️ Max iterations reached without final response")
+            self._record_iterations(iterations)
+            self._save_usage(usage, "chat")
             return {
                 "intent": "chat",
                 "confidence": 0.0,
                 "extracted_data": {},
-                "reply_text": "Je travaille dessus mais cela prend plus de temps que prévu.",
-                "tool_calls": None
+                "reply_text": (
+                    "Je n'ai pas réussi à interpréter votre demande, pouvez-vous la reformuler ?"
+                    if unreadable else "Je travaille dessus mais cela prend plus de temps que prévu."
+                ),
+                "tool_calls": None,
+                "llm_iterations": iterations,
             }
             
         except Exception as e:
             logger.error(f"❌ Erreur d'analyse NLU: {e}", exc_info=True)
+            self._record_iterations(iterations)
+            self._save_usage(usage, "chat")
             return {
                 "intent": "chat",
                 "confidence": 0.0,
                 "extracted_data": {},
                 "reply_text": "Désolé, une erreur technique est survenue.",
-                "tool_calls": None
-            }
\ No newline at end of file
+                "tool_calls": None,
+                "llm_iterations": iterations,
+            }
+
+    def _save_usage(self, usage: TurnUsage, intent: str) -> None:
+        """Enregistre tokens et temps du tour dans llm_usage, en tâche de fond (hors du temps de réponse)."""
+        if not self.settings.llm_usage_tracking_enabled:
+            return
+        record = usage.as_record(intent)
+        metrics.observe("orchestrator.prompt_tokens", record["prompt_tokens"])
+        metrics.observe("orchestrator.completion_tokens", record["completion_tokens"])
+        metrics.observe("orchestrator.cached_prompt_tokens", record["cached_tokens"])
+
+        async def persist() -> None:
+            try:
+                await self.db.save_llm_usage(**record)
+            except Exception as e:
+                logger.warning(f"⚠️ Usage LLM non enregistré: {e}")
+
+        task = asyncio.create_task(persist())
+        self._usage_tasks.add(task)
+        task.add_done_callback(self._usage_tasks.discard)
+
+    async def flush_usage(self) -> None:
+        """Attend l'enregistrement des usages en cours (arrêt, tests)."""
+        if self._usage_tasks:
+            await asyncio.gather(*self._usage_tasks)
+
+    @staticmethod
+    def _record_iterations(iterations: int) -> None:
+        """Métrique : nombre d'appels LLM par tour de conversation."""
+        metrics.observe("orchestrator.llm_iterations", iterations)
+        if iterations == 1:
+            metrics.increment("orchestrator.single_call_turns")
@@ -0,0 +1,150 @@
+"""Préchargement spéculatif pendant que le LLM analyse un message."""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from execution.agents.business_context import BusinessContextProvider, normalize, row_kind
+from execution.agents.registry import AgentRegistry
+from execution.core.metrics import metrics
+from execution.tools.db_manager import NumberLease
+
+logger = logging.getLogger(__name__)
+
+# Intention probable -> motif sur le texte normalisé (le premier qui correspond l'emporte)
+INTENT_PATTERNS: dict[str, re.Pattern] = {
+    "quote": re.compile(r"\bdevis\b"),
+    "rental_charges": re.compile(r"regularisation|charges? locatives?"),
+    "rent_receipt": re.compile(r"quittance|\bloyer"),
+    "mileage": re.compile(r"kilometr|\d\s*km\b|\bkm\b|frais de deplacement"),
+    "invoice": re.compile(r"factur"),
+}
+
+# Intentions numérotées sur l'année d'émission : les quittances et régularisations
+# le sont sur leur période, inconnue avant l'extraction du LLM (pas de numéro préchargé)
+CURRENT_YEAR_NUMBERED = frozenset({"invoice", "quote", "mileage"})
+
+
+def guess_intent(text: str, rows: list[dict[str, Any]]) -> str | None:
+    """
+    Intention probable d'un message, sur signaux peu coûteux (sans LLM).
+
+    Mots-clés du type de document, à défaut un client connu de
+    data_administration cité dans le message (facture).
+
+    Returns:
+        Intention devinée, ou None sans signal
+    """
+    normalized = normalize(text)
+    for intent, pattern in INTENT_PATTERNS.items():
+        if pattern.search(normalized):
+            return intent
+    for row in rows:
+        name = row.get("nom_client")
+        if row_kind(row) == "facturation_client" and name and normalize(name) in normalized:
+            return "invoice"
+    return None
+
+
+@dataclass
+class Prefetched:
+    """Travail spéculatif terminé pour une intention devinée."""
+
+    intent: str
+    lease: NumberLease | None = None
+
+
+class SpeculativePrefetcher:
+    """
+    Prépare l'exécution d'un document pendant l'appel LLM de l'orchestrateur.
+
+    Sur l'intention devinée (guess_intent) : lignes data_administration
+    chargées dans le cache du contexte métier, agent construit, prochain
+    numéro du document lu à l'avance (types numérotés sur l'année en cours,
+    hors brouillons). Si le LLM confirme l'intention, le numéro est repris
+    (s'il est toujours valable) ; sinon le travail est annulé ou ignoré.
+    """
+
+    def __init__(self, agents: AgentRegistry, business_context: BusinessContextProvider):
+        """
+        Args:
+            agents: Registre des agents (et DatabaseManager des numéros)
+            business_context: Contexte métier partagé avec l'orchestrateur
+        """
+        self.agents = agents
+        self.business_context = business_context
+
+    def start(self, text: str, lease_number: bool = True) -> asyncio.Task:
+        """
+        Lance le travail spéculatif d'un message.
+
+        Args:
+            text: Message brut de l'utilisateur
+            lease_number: Lire le prochain numéro (inutile si le document passe par un brouillon)
+
+        Returns:
+            Tâche à confier à take() une fois l'intention connue
+        """
+        return asyncio.create_task(self._run(text, lease_number))
+
+    async def _run(self, text: str, lease_number: bool) -> Prefetched | None:
+        rows = await self.business_context.rows()
+        intent = guess_intent(text, rows)
+        if intent is None:
+            metrics.increment("prefetch.skipped")
+            return None
+
+        metrics.increment("prefetch.started")
+        self.agents.get(intent)
+        lease = None
+        if lease_number and intent in CURRENT_YEAR_NUMBERED:
+            try:
+                lease = await self.agents.db.lease_next_number(intent, date.today().year)
+            except Exception as e:
+                logger.warning(f"⚠️ Numéro non préchargé ({intent}): {e}")
+        logger.info(f"🔮 Préchargement {intent}" + (f" (numéro {lease.number})" if lease else ""))
+        return Prefetched(intent, lease)
+
+    @staticmethod
+    def take(task: asyncio.Task, intent: str) -> NumberLease | None:
+        """
+        Confronte le travail spéculatif à l'intention confirmée par le LLM.
+
+        Un travail inachevé est annulé : le lancer plus tôt n'aura rien coûté
+        au tour, l'attendre le ralentirait.
+
+        Returns:
+            Numéro lu à l'avance si l'intention devinée est confirmée, sinon None
+        """
+        if not task.done():
+            task.cancel()
+            metrics.increment("prefetch.cancelled")
+            return None
+        if task.cancelled() or task.exception() is not None:
+            return None
+        prefetched = task.result()
+        if prefetched is None:
+            return None
+        if prefetched.intent != intent:
+            metrics.increment("prefetch.misses")
+            metrics.increment(f"prefetch.misses.{prefetched.intent}")
+            return None
+        metrics.increment("prefetch.hits")
+        metrics.increment(f"prefetch.hits.{intent}")
+        return prefetched.lease
+
+
+def prefetch_report() -> dict[str, float]:
+    """Taux de réussite du préchargement et reprise des numéros lus à l'avance."""
+    hits = metrics.counter("prefetch.hits")
+    misses = metrics.counter("prefetch.misses") + metrics.counter("prefetch.cancelled")
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "leases_used": metrics.counter("prefetch.lease_used"),
+        "leases_stale": metrics.counter("prefetch.lease_stale"),
+    }
@@ -36,7 +36,7 @@ class QuoteAgent(BaseAdminAgent):
             # 1. Génère numéro de devis si absent
             if "quote_number" not in data or not data["quote_number"]:
                 year = date.today().year
-                data["quote_number"] = await self.db.get_next_quote_number(year)
+                data["quote_number"] = await self.document_number(state, lambda: self.db.get_next_quote_number(year), year)
                 self.logger.info(f"Numéro de devis généré: {data['quote_number']}")
 
             # 2. Date par défaut = aujourd'hui
@@ -106,6 +106,16 @@ class QuoteAgent(BaseAdminAgent):
             self.logger.error(f"Unexpected error: {e}", exc_info=True)
             return state
 
+    def summarize(self, validated_data: dict) -> list[str]:
+        """Totaux HT / TVA / TTC et validité du devis."""
+        quote = Quote(**validated_data)
+        return [
+            f"Total HT : {float(quote.total_ht):.2f}€",
+            f"TVA : {float(quote.total_vat):.2f}€",
+            f"<b>Total TTC : {float(quote.total_ttc):.2f}€</b>",
+            f"Valable jusqu'au : {quote.valid_until.strftime('%d/%m/%Y')}",
+        ]
+
     async def generate_pdf(self, state: AdminAgentState) -> AdminAgentState:
         """
         Génère le PDF du devis.
@@ -129,7 +139,11 @@ class QuoteAgent(BaseAdminAgent):
             company_info = get_company_info()
 
             # Générer le PDF
-            pdf_path = self.pdf_gen.generate_quote_pdf(quote, company_info)
+            pdf_path = await self.render_with_store(
+                state,
+                DocumentType.QUOTE,
+                lambda: self.pdf_gen.generate_quote_pdf(quote, company_info),
+            )
 
             state["pdf_path"] = pdf_path
             self.logger.info(f"✅ PDF généré: {pdf_path}")
@@ -165,6 +179,8 @@ class QuoteAgent(BaseAdminAgent):
                 data=state["validated_data"],
                 pdf_path=str(state["pdf_path"]) if state["pdf_path"] else None,
                 user_id=state["user_id"],
+                telegram_file_id=state.get("telegram_file_id"),
+                content_hash=state.get("content_hash"),
             )
 
             state["db_record_id"] = doc.id
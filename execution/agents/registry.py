@@ -0,0 +1,110 @@
+"""Registre des agents administratifs, construits une seule fois par processus."""
+
+import logging
+
+from langchain_openai import ChatOpenAI
+
+from execution.agents.base_admin_agent import (
+    AdminAgentState,
+    BaseAdminAgent,
+    build_storage_manager,
+)
+from execution.agents.invoice_agent import InvoiceAgent
+from execution.agents.mileage_agent import MileageAgent
+from execution.agents.quote_agent import QuoteAgent
+from execution.agents.rent_receipt_agent import RentReceiptAgent
+from execution.agents.rental_charges_agent import RentalChargesAgent
+from execution.core.config import get_settings
+from execution.core.llm import ModelRouter
+from execution.tools.db_manager import DatabaseManager
+from execution.tools.document_store import DocumentStore
+from execution.tools.pdf_generator import PDFGenerator
+
+logger = logging.getLogger(__name__)
+
+# request_type -> classe d'agent
+AGENT_CLASSES: dict[str, type[BaseAdminAgent]] = {
+    "invoice": InvoiceAgent,
+    "quote": QuoteAgent,
+    "mileage": MileageAgent,
+    "rent_receipt": RentReceiptAgent,
+    "rental_charges": RentalChargesAgent,
+}
+
+
+class AgentRegistry:
+    """
+    Construit chaque agent (et son graph compilé) une fois, puis le réutilise.
+
+    Tous les agents partagent le même DatabaseManager (un seul pool de
+    connexions), le même PDFGenerator, le même gestionnaire de stockage et
+    un client LLM par modèle (routage par intention, voir ModelRouter). Les
+    agents sont sans état entre deux requêtes : tout l'état d'une requête
+    vit dans AdminAgentState.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager | None = None,
+        pdf_gen: PDFGenerator | None = None,
+        llm: ChatOpenAI | None = None,
+        router: ModelRouter | None = None,
+    ):
+        """
+        Initialise le registre et les outils partagés.
+
+        Args:
+            db: Gestionnaire de base de données partagé (optionnel)
+            pdf_gen: Générateur de PDF partagé (optionnel)
+            llm: Modèle de langage imposé à tous les agents (optionnel)
+            router: Routeur de modèles partagé ; à défaut de llm, chaque agent
+                reçoit le modèle d'extraction de son intention
+        """
+        self.settings = get_settings()
+        self.db = db or DatabaseManager()
+        self.pdf_gen = pdf_gen or PDFGenerator.from_settings(self.settings)
+        self.store = DocumentStore(self.db, self.pdf_gen.template_version)
+        self.storage = build_storage_manager(self.settings, self.pdf_gen, self.db, self.store)
+        self.router = router or ModelRouter(self.settings)
+        self._llm_override = llm
+        self.llm = llm or self.router.chat_model(self.router.primary)
+        self._agents: dict[str, BaseAdminAgent] = {}
+
+    def get(self, request_type: str) -> BaseAdminAgent:
+        """
+        Retourne l'agent d'un type de requête, construit au premier appel.
+
+        Raises:
+            ValueError: Si le type de requête est inconnu
+        """
+        agent = self._agents.get(request_type)
+        if agent is None:
+            agent_class = AGENT_CLASSES.get(request_type)
+            if agent_class is None:
+                raise ValueError(f"Type de requête inconnu: {request_type}")
+
+            llm = self._llm_override or self.router.chat_model(
+                self.router.model_for("extraction", request_type)
+            )
+            agent = agent_class(storage=self.storage, llm=llm)
+            _ = agent.graph  # Compilation immédiate du graph
+            self._agents[request_type] = agent
+        return agent
+
+    def warm_up(self) -> None:
+        """Construit tous les agents et compile leurs graphs (au démarrage)."""
+        for request_type in AGENT_CLASSES:
+            self.get(request_type)
+        logger.info(f"✅ {len(self._agents)} agents prêts (graphs compilés)")
+
+    async def prepare(self, state: AdminAgentState) -> AdminAgentState:
+        """Valide la requête à l'avance avec l'agent de state["request_type"] (voir BaseAdminAgent.prepare)."""
+        return await self.get(state["request_type"]).prepare(state)
+
+    async def preview(self, state: AdminAgentState) -> AdminAgentState:
+        """Brouillon de la requête, sans numéro ni persistance (voir BaseAdminAgent.preview)."""
+        return await self.get(state["request_type"]).preview(state)
+
+    async def execute(self, state: AdminAgentState) -> AdminAgentState:
+        """Exécute la requête avec l'agent correspondant à state["request_type"]."""
+        return await self.get(state["request_type"]).execute(state)
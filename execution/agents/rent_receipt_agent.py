@@ -47,7 +47,9 @@ class RentReceiptAgent(BaseAdminAgent):
 
             # 2. Générer numéro de quittance
             if "receipt_number" not in data or not data["receipt_number"]:
-                data["receipt_number"] = await self.db.get_next_rent_receipt_number(data["period_year"])
+                data["receipt_number"] = await self.document_number(
+                    state, lambda: self.db.get_next_rent_receipt_number(data["period_year"]), data["period_year"]
+                )
                 self.logger.info(f"Numéro de quittance généré: {data['receipt_number']}")
 
             # 3. Date paiement par défaut = aujourd'hui
@@ -89,8 +91,9 @@ class RentReceiptAgent(BaseAdminAgent):
                 payment_method=data.get("payment_method", "virement")
             )
 
-            # 7. Convertir en dict pour stockage
+            # 7. Convertir en dict pour stockage (avec la date d'émission imprimée sur le PDF)
             state["validated_data"] = receipt.model_dump(mode="json")
+            state["validated_data"]["issued_on"] = date.today().isoformat()
 
             self.logger.info(
                 f"✅ Quittance validée: {receipt.receipt_number} - "
@@ -108,6 +111,15 @@ class RentReceiptAgent(BaseAdminAgent):
             self.logger.error(f"Unexpected error: {e}", exc_info=True)
             return state
 
+    def summarize(self, validated_data: dict) -> list[str]:
+        """Période, loyer, charges et total de la quittance."""
+        receipt = RentReceipt(**validated_data)
+        return [
+            f"Période : {receipt.period_str}",
+            f"Loyer : {float(receipt.rent_amount):.2f}€ + charges : {float(receipt.charges_amount):.2f}€",
+            f"<b>Total : {float(receipt.total_amount):.2f}€</b>",
+        ]
+
     async def generate_pdf(self, state: AdminAgentState) -> AdminAgentState:
         """
         Génère le PDF de la quittance.
@@ -124,10 +136,16 @@ class RentReceiptAgent(BaseAdminAgent):
         try:
             self.logger.info("Génération du PDF de quittance...")
 
-            receipt = RentReceipt(**state["validated_data"])
+            data = state["validated_data"]
             company_info = get_company_info()
 
-            pdf_path = self.pdf_gen.generate_rent_receipt_pdf(receipt, company_info)
+            pdf_path = await self.render_with_store(
+                state,
+                DocumentType.RENT_RECEIPT,
+                lambda: self.pdf_gen.render_document(
+                    DocumentType.RENT_RECEIPT, data, company_info
+                ).pdf_path,
+            )
 
             state["pdf_path"] = pdf_path
             self.logger.info(f"✅ PDF généré: {pdf_path}")
@@ -163,6 +181,8 @@ class RentReceiptAgent(BaseAdminAgent):
                 data=state["validated_data"],
                 pdf_path=str(state["pdf_path"]) if state["pdf_path"] else None,
                 user_id=state["user_id"],
+                telegram_file_id=state.get("telegram_file_id"),
+                content_hash=state.get("content_hash"),
             )
 
             state["db_record_id"] = doc.id
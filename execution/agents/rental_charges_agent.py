@@ -80,11 +80,12 @@ class RentalChargesAgent(BaseAdminAgent):
 
             # 6. Générer numéro de document
             year = data["period_end"].year
-            doc_number = await self.db.get_next_rental_charges_number(year)
+            doc_number = await self.document_number(state, lambda: self.db.get_next_rental_charges_number(year), year)
 
-            # 7. Convertir en dict pour stockage (avec numéro)
+            # 7. Convertir en dict pour stockage (avec numéro et date d'émission)
             validated_data = charges_doc.model_dump(mode="json")
             validated_data["document_number"] = doc_number
+            validated_data["issued_on"] = date.today().isoformat()
             state["validated_data"] = validated_data
 
             self.logger.info(
@@ -103,6 +104,15 @@ class RentalChargesAgent(BaseAdminAgent):
             self.logger.error(f"Unexpected error: {e}", exc_info=True)
             return state
 
+    def summarize(self, validated_data: dict) -> list[str]:
+        """Total des charges, provisions et régularisation."""
+        charges_doc = RentalCharges(**{k: v for k, v in validated_data.items() if k != "document_number"})
+        return [
+            f"Charges réelles : {float(charges_doc.total_charges):.2f}€",
+            f"Provisions versées : {float(charges_doc.provisions_amount):.2f}€",
+            f"<b>Régularisation : {float(charges_doc.regularization_amount):.2f}€</b>",
+        ]
+
     async def generate_pdf(self, state: AdminAgentState) -> AdminAgentState:
         """Génère le PDF."""
         if state.get("error"):
@@ -111,14 +121,18 @@ class RentalChargesAgent(BaseAdminAgent):
         try:
             self.logger.info("Génération du PDF de charges...")
 
-            # Pour le PDF generator, on a besoin de l'objet RentalCharges
-            # Le doc_number est dans validated_data mais pas dans le modèle RentalCharges (ce n'est pas un champ du modèle pour l'instant)
-            # Mais generate_rental_charges_pdf n'utilise pas le numéro dans le contenu visible (juste nom de fichier)
-            
-            charges = RentalCharges(**state["validated_data"])
+            # Le doc_number est dans validated_data mais pas dans le modèle RentalCharges :
+            # render_document s'en sert pour le nom de fichier, pas pour le contenu visible
+            data = state["validated_data"]
             company_info = get_company_info()
 
-            pdf_path = self.pdf_gen.generate_rental_charges_pdf(charges, company_info)
+            pdf_path = await self.render_with_store(
+                state,
+                DocumentType.RENTAL_CHARGES,
+                lambda: self.pdf_gen.render_document(
+                    DocumentType.RENTAL_CHARGES, data, company_info
+                ).pdf_path,
+            )
 
             state["pdf_path"] = pdf_path
             self.logger.info(f"✅ PDF généré: {pdf_path}")
@@ -146,6 +160,8 @@ class RentalChargesAgent(BaseAdminAgent):
                 data=state["validated_data"],
                 pdf_path=str(state["pdf_path"]) if state["pdf_path"] else None,
                 user_id=state["user_id"],
+                telegram_file_id=state.get("telegram_file_id"),
+                content_hash=state.get("content_hash"),
             )
 
             state["db_record_id"] = doc.id
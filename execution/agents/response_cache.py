@@ -0,0 +1,256 @@
+"""Cache des résultats de l'orchestrateur pour les demandes répétées."""
+
+import calendar
+import copy
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from execution.agents.business_context import normalize
+from execution.core.metrics import metrics
+
+# Préfixe qui force un nouvel appel LLM ("!quittance de ce mois")
+BYPASS_PREFIX = "!"
+
+# Intentions dont le résultat peut être rejoué (pas de "chat" : réponse libre)
+CACHEABLE_INTENTS = ("invoice", "quote", "mileage", "rent_receipt", "rental_charges", "stats")
+
+# Outils sans effet de bord : un résultat obtenu avec d'autres outils (send_email...) n'est pas rejoué
+READ_ONLY_TOOLS = ("database_query", "calculator", "markdown_cleaner")
+
+# Messages qui n'ont de sens qu'avec la conversation en cours (confirmations, actions)
+CONFIRMATIONS = frozenset(
+    {
+        "oui",
+        "ok",
+        "okay",
+        "vas y",
+        "go",
+        "c est bon",
+        "confirme",
+        "je confirme",
+        "valide",
+        "non",
+        "annule",
+        "stop",
+        "d accord",
+        "parfait",
+        "yes",
+        "fais le",
+        "envoie",
+        "envoie la",
+    }
+)
+
+# Références à la conversation : l'historique récent entre alors dans la clé
+CONTEXT_MARKERS = (
+    "meme",
+    "pareil",
+    "idem",
+    "comme",
+    "dernier",
+    "derniere",
+    "precedent",
+    "encore",
+    "aussi",
+)
+
+# Expressions de date relatives -> granularité du décalage à appliquer lors d'un rejeu
+RELATIVE_DAY_MARKERS = ("aujourd", "hier", "demain")
+RELATIVE_MONTH_MARKERS = ("ce mois", "mois dernier", "mois precedent", "mois prochain", "du mois")
+
+_NON_WORD = re.compile(r"[^\w€.,]+")
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def normalize_message(text: str) -> str:
+    """Message sans accents, casse ni ponctuation superflue."""
+    return " ".join(_NON_WORD.sub(" ", normalize(text).replace("'", " ")).split())
+
+
+def date_bucket(normalized: str) -> str:
+    """Granularité temporelle du message : "day", "month" ou "absolute"."""
+    if any(marker in normalized for marker in RELATIVE_DAY_MARKERS):
+        return "day"
+    if any(marker in normalized for marker in RELATIVE_MONTH_MARKERS):
+        return "month"
+    return "absolute"
+
+
+def _shift_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    year, month = divmod(month_index, 12)
+    return value.replace(
+        year=year, month=month + 1, day=min(value.day, calendar.monthrange(year, month + 1)[1])
+    )
+
+
+def redate(data: Any, bucket: str, cached_on: date, today: date) -> Any:
+    """
+    Recale les dates d'un extracted_data mis en cache sur la date du jour.
+
+    - "day" (aujourd'hui, hier...) : toutes les dates sont décalées du nombre de jours écoulés ;
+    - "month" (ce mois, mois dernier...) : dates et period_month/period_year décalés du nombre de mois ;
+    - "absolute" : seules les dates égales au jour de mise en cache (dates par défaut) deviennent aujourd'hui.
+    """
+    if cached_on == today:
+        return data
+    months = (today.year - cached_on.year) * 12 + today.month - cached_on.month
+
+    def shift(value: date) -> date:
+        if bucket == "day":
+            return value + (today - cached_on)
+        if bucket == "month":
+            return _shift_months(value, months)
+        return today if value == cached_on else value
+
+    if isinstance(data, dict):
+        shifted = {key: redate(value, bucket, cached_on, today) for key, value in data.items()}
+        if (
+            bucket == "month"
+            and isinstance(data.get("period_month"), int)
+            and isinstance(data.get("period_year"), int)
+        ):
+            period = _shift_months(date(data["period_year"], data["period_month"], 1), months)
+            shifted["period_month"], shifted["period_year"] = period.month, period.year
+        return shifted
+    if isinstance(data, list):
+        return [redate(value, bucket, cached_on, today) for value in data]
+    if isinstance(data, str) and _ISO_DATE.match(data):
+        try:
+            return shift(date.fromisoformat(data)).isoformat()
+        except ValueError:
+            return data
+    return data
+
+
+@dataclass
+class CacheEntry:
+    """Résultat mis en cache et son contexte de création."""
+
+    result: dict[str, Any]
+    bucket: str
+    cached_on: date
+    stored_at: float
+
+
+class ResponseCache:
+    """
+    Cache par utilisateur des résultats de l'orchestrateur (IntentResult).
+
+    Clé : message normalisé + empreinte de l'historique récent (seulement si
+    le message y fait référence) + empreinte du contexte métier + granularité
+    de date. Un rejeu renvoie le résultat précédent avec ses dates recalées,
+    sans appel LLM.
+
+    Éviction : durée de vie (ttl_s) et LRU par utilisateur (max_entries_per_user).
+    Contournement : préfixe "!", confirmations et messages courts dépendant
+    de la conversation, résultats "chat", peu sûrs ou obtenus avec des outils
+    à effet de bord.
+    """
+
+    def __init__(
+        self, ttl_s: float = 40 * 86400, max_entries_per_user: int = 50, min_confidence: float = 0.9
+    ):
+        """
+        Args:
+            ttl_s: Durée de vie d'une entrée (secondes), au-delà d'un mois par défaut
+            max_entries_per_user: Nombre maximal d'entrées par utilisateur (LRU)
+            min_confidence: Confiance minimale d'un résultat pour être mis en cache
+        """
+        self.ttl_s = ttl_s
+        self.max_entries_per_user = max_entries_per_user
+        self.min_confidence = min_confidence
+        self._entries: dict[int, OrderedDict[str, CacheEntry]] = {}
+
+    def key(self, text: str, history: list[dict[str, str]], context: str = "") -> str | None:
+        """
+        Clé de cache d'un message, ou None si le message ne doit pas être mis en cache.
+
+        Args:
+            text: Message utilisateur
+            history: Historique récent (dicts role/content, du plus ancien au plus récent)
+            context: Empreinte du contexte métier (rows_fingerprint) : une
+                modification de data_administration rend les entrées caduques
+        """
+        if text.lstrip().startswith(BYPASS_PREFIX):
+            return None
+        normalized = normalize_message(text)
+        if not normalized or normalized in CONFIRMATIONS or len(normalized.split()) < 2:
+            return None
+
+        fingerprint = ""
+        if any(marker in normalized.split() for marker in CONTEXT_MARKERS):
+            previous = [msg["content"] for msg in history if msg["role"] == "user"]
+            if previous and normalize_message(previous[-1]) == normalized:
+                previous = previous[:-1]  # Le message courant est déjà enregistré
+            fingerprint = hashlib.sha1(
+                "\n".join(normalize_message(m) for m in previous[-3:]).encode()
+            ).hexdigest()[:16]
+
+        return f"{date_bucket(normalized)}|{fingerprint}|{context}|{normalized}"
+
+    def get(
+        self, user_id: int, key: str | None, today: date | None = None
+    ) -> dict[str, Any] | None:
+        """Résultat mis en cache (dates recalées), ou None."""
+        if key is None:
+            metrics.increment("response_cache.bypass")
+            return None
+        entries = self._entries.get(user_id)
+        entry = entries.get(key) if entries else None
+        if entry is None or time.monotonic() - entry.stored_at > self.ttl_s:
+            if entry is not None:
+                del entries[key]
+            metrics.increment("response_cache.misses")
+            return None
+
+        entries.move_to_end(key)
+        metrics.increment("response_cache.hits")
+        result = copy.deepcopy(entry.result)
+        result["extracted_data"] = redate(
+            result["extracted_data"], entry.bucket, entry.cached_on, today or date.today()
+        )
+        result["llm_iterations"] = 0
+        return result
+
+    def put(
+        self, user_id: int, key: str | None, result: dict[str, Any], today: date | None = None
+    ) -> bool:
+        """
+        Met un résultat en cache s'il est rejouable.
+
+        Returns:
+            True si le résultat a été mis en cache
+        """
+        tools_used = {call.get("name") for call in result.get("tool_calls") or []}
+        if (
+            key is None
+            or result.get("intent") not in CACHEABLE_INTENTS
+            or result.get("confidence", 0.0) < self.min_confidence
+            or not tools_used <= set(READ_ONLY_TOOLS)
+        ):
+            return False
+
+        entries = self._entries.setdefault(user_id, OrderedDict())
+        entries[key] = CacheEntry(
+            result=copy.deepcopy(result),
+            bucket=key.split("|", 1)[0],
+            cached_on=today or date.today(),
+            stored_at=time.monotonic(),
+        )
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries_per_user:
+            entries.popitem(last=False)
+        return True
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Vide le cache d'un utilisateur, ou de tous."""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
@@ -0,0 +1,173 @@
+"""Enregistrement des échanges LLM (cassettes) pour les rejouer hors ligne."""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(request: dict[str, Any]) -> str:
+    """
+    Empreinte d'une requête chat completions, stable d'une exécution à l'autre.
+
+    Sont pris en compte : le modèle et les messages hors prompt système
+    (qui contient la date et l'heure courantes), contenus et appels d'outils
+    compris, sans leurs identifiants. Le mode flux n'en fait pas partie :
+    une réponse enregistrée peut être rejouée en flux ou non.
+    """
+    messages = []
+    for message in request.get("messages", []):
+        if message.get("role") == "system":
+            continue
+        calls = [
+            (call.get("function", {}).get("name"), call.get("function", {}).get("arguments"))
+            for call in message.get("tool_calls") or []
+        ]
+        messages.append((message.get("role"), message.get("content"), calls))
+    payload = json.dumps([request.get("model"), messages], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def parse_completion(content_type: str, body: bytes) -> dict[str, Any]:
+    """
+    Réponse d'un modèle (contenu, appels d'outils, usage) depuis le corps HTTP.
+
+    Accepte une réponse JSON ou un flux SSE, dont les deltas sont réassemblés.
+    """
+    if "text/event-stream" not in content_type:
+        data = json.loads(body)
+        message = data["choices"][0]["message"]
+        return {
+            "content": message.get("content"),
+            "tool_calls": [
+                {
+                    "id": call.get("id"),
+                    "name": call["function"]["name"],
+                    "arguments": call["function"].get("arguments") or "",
+                }
+                for call in message.get("tool_calls") or []
+            ],
+            "usage": data.get("usage"),
+        }
+
+    content, calls, usage = [], {}, None
+    for line in body.decode().splitlines():
+        if not line.startswith("data:") or line[5:].strip() == "[DONE]":
+            continue
+        data = json.loads(line[5:])
+        usage = data.get("usage") or usage
+        for choice in data.get("choices") or []:
+            delta = choice.get("delta") or {}
+            if delta.get("content"):
+                content.append(delta["content"])
+            for call in delta.get("tool_calls") or []:
+                entry = calls.setdefault(
+                    call.get("index", 0), {"id": None, "name": "", "arguments": ""}
+                )
+                entry["id"] = call.get("id") or entry["id"]
+                function = call.get("function") or {}
+                entry["name"] += function.get("name") or ""
+                entry["arguments"] += function.get("arguments") or ""
+    return {
+        "content": "".join(content) or None,
+        "tool_calls": [calls[index] for index in sorted(calls)],
+        "usage": usage,
+    }
+
+
+class Cassette:
+    """
+    Échanges LLM enregistrés (une interaction JSON par ligne).
+
+    Chaque interaction contient l'empreinte de la requête, la requête
+    (modèle, messages), la réponse normalisée et la latence observée.
+    En relecture, les interactions d'une même empreinte sont servies dans
+    l'ordre d'enregistrement, puis en boucle.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: Fichier de la cassette (.jsonl), chargé s'il existe
+        """
+        self.path = Path(path)
+        self.interactions: list[dict[str, Any]] = []
+        self._served: dict[str, int] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self.interactions = [json.loads(line) for line in f if line.strip()]
+
+    def record(self, request: dict[str, Any], response: dict[str, Any], latency_ms: float) -> None:
+        """Ajoute une interaction à la cassette (et au fichier)."""
+        interaction = {
+            "key": request_key(request),
+            "request": {"model": request.get("model"), "messages": request.get("messages", [])},
+            "response": response,
+            "latency_ms": round(latency_ms, 1),
+        }
+        self.interactions.append(interaction)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(interaction, ensure_ascii=False) + "\n")
+
+    def lookup(self, request: dict[str, Any]) -> dict[str, Any] | None:
+        """Interaction enregistrée pour cette requête, ou None."""
+        key = request_key(request)
+        matches = [interaction for interaction in self.interactions if interaction["key"] == key]
+        if not matches:
+            return None
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        return matches[served % len(matches)]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport httpx qui enregistre les appels chat completions dans une cassette.
+
+    Les réponses sont lues en entier avant d'être rendues au client : en
+    enregistrement, un flux n'arrive donc qu'une fois terminé.
+    """
+
+    def __init__(self, cassette: Cassette, inner: httpx.AsyncBaseTransport | None = None):
+        """
+        Args:
+            cassette: Cassette de destination
+            inner: Transport réel (par défaut httpx.AsyncHTTPTransport())
+        """
+        self.cassette = cassette
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        if not request.url.path.endswith("/chat/completions") or response.status_code != 200:
+            return response
+
+        body = await response.aread()
+        latency_ms = (time.perf_counter() - started) * 1000
+        try:
+            self.cassette.record(
+                json.loads(request.content),
+                parse_completion(response.headers.get("content-type", ""), body),
+                latency_ms,
+            )
+        except (ValueError, KeyError, IndexError) as e:
+            logger.warning(f"⚠️ Échange LLM non enregistré: {e}")
+
+        # Corps déjà décodé : en-têtes d'encodage retirés
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -1,8 +1,13 @@
 """Configuration centralisée de l'application."""
 
+from pydantic import TypeAdapter, field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from typing import Optional
+import json
+
+# {"intention": "modèle"} : toute autre forme est refusée au démarrage
+_INTENT_MODELS = TypeAdapter(dict[str, str])
 
 
 class Settings(BaseSettings):
@@ -20,6 +25,32 @@ class Settings(BaseSettings):
     gemini_api_key: Optional[str] = None
     openrouter_api_key: str
     openrouter_model: str = "google/gemini-2.0-flash-001" # Default model
+    openrouter_base_url: Optional[str] = None  # Défaut : UPSTREAMS["openrouter"] (serveur simulé en test)
+    llm_cassette_path: Optional[str] = None  # Enregistre les échanges LLM (rejeu : benchmarks.openai_stub)
+
+    # Routage des modèles : petit modèle rapide par défaut, modèle plus capable par intention
+    llm_routing_model: Optional[str] = None  # Défaut : openrouter_model
+    llm_fallback_model: Optional[str] = None  # Secours quand le p95 dépasse le budget
+    llm_intent_models_raw: str = "{}"  # {"invoice": "openai/gpt-4o-mini", ...}
+    llm_latency_budget_p95_ms: float = 8000.0
+    llm_latency_min_samples: int = 20
+    llm_fallback_cooldown_s: float = 300.0
+
+    # Requêtes couvertes (hedging) : seconde requête si la première tarde, la plus rapide gagne
+    llm_hedging_enabled: bool = False
+    llm_hedge_model: Optional[str] = None  # Défaut : llm_fallback_model, sinon le même modèle
+    llm_hedge_percentile: float = 90.0  # Délai de couverture = ce percentile des latences observées
+    llm_hedge_delay_ms: float = 3000.0  # Délai tant que les mesures sont insuffisantes
+
+    @field_validator("llm_intent_models_raw")
+    @classmethod
+    def _check_intent_models(cls, value: str) -> str:
+        _INTENT_MODELS.validate_json(value)
+        return value
+
+    @property
+    def llm_intent_models(self) -> dict[str, str]:
+        return json.loads(self.llm_intent_models_raw)
 
     # Telegram
     telegram_bot_token: str
@@ -27,7 +58,6 @@ class Settings(BaseSettings):
 
     @property
     def telegram_admin_users(self) -> list[int]:
-        import json
         try:
             return json.loads(self.telegram_admin_users_raw)
         except:
@@ -48,11 +78,67 @@ class Settings(BaseSettings):
     company_address: str
     company_tva_number: str
     company_logo_path: Optional[str] = None
+    company_signature_path: Optional[str] = None
 
     # Paths
     tmp_dir: str = ".tmp"
     templates_dir: str = "execution/templates"
 
+    # PDF Storage (.tmp/documents) - PDFs re-rendus depuis Document.data si évincés
+    pdf_storage_max_mb: int = 500
+    pdf_storage_max_age_days: int = 365
+    pdf_storage_sweep_interval_s: int = 3600
+    # Demande identique dans ce délai = nouvel essai : le document non payé est renvoyé tel quel
+    document_reuse_window_s: int = 900
+
+    # PDF Rendering (taille des fichiers envoyés sur Telegram / par email)
+    pdf_page_compression: bool = True
+    pdf_font_path: Optional[str] = None  # Police TTF embarquée en sous-ensemble
+    pdf_font_bold_path: Optional[str] = None
+    pdf_font_italic_path: Optional[str] = None
+    pdf_size_budget_kb: Optional[int] = None
+
+    # Clients HTTP partagés (OpenRouter, OpenAI) - connexions keep-alive
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_s: float = 120.0
+    http_connect_timeout_s: float = 10.0
+    http_read_timeout_s: float = 60.0
+    http_http2: bool = True
+
+    # Orchestrateur - exécution parallèle des appels d'outils d'une même réponse
+    orchestrator_tool_concurrency: int = 4
+    orchestrator_tool_timeout_s: float = 30.0
+    business_context_ttl_s: float = 300.0  # Cache des lignes data_administration injectées
+    orchestrator_early_validation: bool = True  # Validation lancée dès que extracted_data est reçu
+    orchestrator_structured_output: bool = True  # Réponse finale via l'outil final_answer (schéma par intention)
+    orchestrator_parse_retries: int = 1  # Nouvel essai du LLM quand la réponse finale est illisible
+    llm_usage_tracking_enabled: bool = True  # Tokens et temps par tour dans llm_usage (/usage)
+    llm_prompt_caching_enabled: bool = True  # Prompt système statique marqué cache_control (cache fournisseur)
+    # Contexte, agent et numéro préparés pendant l'appel LLM. Seul le numéro fait gagner du
+    # temps, et il n'est pas lu avec les brouillons (défaut) : désactivé par défaut
+    speculative_prefetch_enabled: bool = False
+
+    # Classifieur d'intentions local (stats, salutations, remerciements sans LLM)
+    intent_fast_path_enabled: bool = True
+    intent_fast_path_threshold: float = 0.85
+    intent_fast_path_max_chars: int = 60
+    intent_fast_path_history_limit: int = 2000
+
+    # Cache des résultats de l'orchestrateur (demandes répétées servies sans LLM)
+    response_cache_enabled: bool = True
+    response_cache_ttl_s: float = 40 * 86400.0  # Couvre les demandes mensuelles
+    response_cache_max_entries_per_user: int = 50
+    response_cache_min_confidence: float = 0.9  # Réponses moins sûres toujours réanalysées
+
+    # Réponses "chat" affichées en flux (éditions successives d'un même message)
+    telegram_streaming_enabled: bool = True
+    telegram_stream_edit_interval_s: float = 1.0
+
+    # Brouillons : document proposé avec boutons Confirmer / Modifier avant génération
+    draft_confirmation_enabled: bool = True
+    draft_ttl_s: float = 1800.0
+
     # Application
     app_name: str = "Admin Agent Pro"
     app_version: str = "0.1.0"
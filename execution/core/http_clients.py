@@ -0,0 +1,109 @@
+"""Clients HTTP partagés (pool keep-alive, HTTP/2) par service amont."""
+
+import logging
+from functools import lru_cache
+
+import httpx
+
+from execution.core.cassette import Cassette, RecordingTransport
+from execution.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 - requis par httpx pour HTTP/2
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Nom du service amont -> URL de base
+UPSTREAMS: dict[str, str] = {
+    "openrouter": "https://openrouter.ai/api/v1",
+    "openai": "https://api.openai.com/v1",
+}
+
+
+class HTTPClientRegistry:
+    """
+    Un httpx.AsyncClient par service amont, partagé par tous ses utilisateurs.
+
+    Les connexions restent ouvertes entre deux requêtes (keep-alive) : en
+    régime établi, un appel LLM ou Whisper ne paie plus ni résolution DNS ni
+    poignée de main TLS. Limites et timeouts viennent de Settings.
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        Initialise le registre (les clients sont créés au premier usage).
+
+        Args:
+            settings: Configuration (limites de connexions, timeouts, HTTP/2)
+        """
+        self.timeout = httpx.Timeout(
+            settings.http_read_timeout_s,
+            connect=settings.http_connect_timeout_s,
+        )
+        self.limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_s,
+        )
+        self.http2 = settings.http_http2 and HTTP2_AVAILABLE
+        if settings.http_http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 demandé mais le paquet h2 est absent, repli sur HTTP/1.1")
+        self.cassette_path = settings.llm_cassette_path
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """
+        Retourne le client partagé d'un service amont (recréé s'il a été fermé).
+
+        Raises:
+            ValueError: Si le service amont est inconnu
+        """
+        if upstream not in UPSTREAMS:
+            raise ValueError(f"Service amont inconnu: {upstream}")
+
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            transport = None
+            if upstream == "openrouter" and self.cassette_path:
+                # Mode enregistrement : échanges LLM écrits dans la cassette
+                transport = RecordingTransport(
+                    Cassette(self.cassette_path),
+                    httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits),
+                )
+                logger.info(f"📼 Échanges LLM enregistrés dans {self.cassette_path}")
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=transport,
+            )
+            self._clients[upstream] = client
+        return client
+
+    async def warm_up(self, upstreams: list[str] | None = None) -> None:
+        """
+        Ouvre une connexion vers chaque service amont (DNS + TLS au démarrage).
+
+        Les erreurs sont ignorées : le préchauffage n'est qu'une optimisation.
+        """
+        for upstream in upstreams or list(UPSTREAMS):
+            try:
+                await self.get(upstream).head(UPSTREAMS[upstream])
+            except httpx.HTTPError as e:
+                logger.debug(f"Préchauffage de {upstream} impossible: {e}")
+
+    async def aclose(self) -> None:
+        """Ferme tous les clients (à l'arrêt de l'application)."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+@lru_cache
+def get_http_clients() -> HTTPClientRegistry:
+    """Retourne le registre de clients HTTP partagé du processus."""
+    return HTTPClientRegistry(get_settings())
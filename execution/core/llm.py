@@ -0,0 +1,220 @@
+"""Construction des clients LLM (OpenRouter) sur les connexions HTTP partagées, routage des modèles, hedging."""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from langchain_openai import ChatOpenAI
+
+from execution.core.config import Settings, get_settings
+from execution.core.http_clients import UPSTREAMS, get_http_clients
+from execution.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def build_chat_model(
+    settings: Settings | None = None,
+    model: str | None = None,
+    **kwargs: Any,
+) -> ChatOpenAI:
+    """
+    Crée un ChatOpenAI branché sur OpenRouter via le client HTTP partagé.
+
+    Args:
+        settings: Configuration (par défaut get_settings())
+        model: Modèle OpenRouter (par défaut settings.openrouter_model)
+        **kwargs: Paramètres supplémentaires de ChatOpenAI (default_headers, ...)
+
+    Returns:
+        Modèle de chat prêt à l'emploi
+    """
+    settings = settings or get_settings()
+    clients = get_http_clients()
+    return ChatOpenAI(
+        base_url=settings.openrouter_base_url or UPSTREAMS["openrouter"],
+        api_key=settings.openrouter_api_key,
+        model=model or settings.openrouter_model,
+        temperature=kwargs.pop("temperature", 0),
+        timeout=clients.timeout,
+        http_async_client=clients.get("openrouter"),
+        **kwargs,
+    )
+
+
+class ModelRouter:
+    """
+    Choisit le modèle OpenRouter par étape et par intention, selon la latence observée.
+
+    Étapes :
+    - "routing" : analyse du message par l'orchestrateur (petit modèle rapide) ;
+    - "extraction" : données d'un document, modèle configurable par intention
+      (settings.llm_intent_models), à défaut celui du routage.
+
+    Si le p95 de latence d'un modèle dépasse settings.llm_latency_budget_p95_ms
+    (sur au moins llm_latency_min_samples appels), le modèle de secours le
+    remplace pendant llm_fallback_cooldown_s, puis il est réessayé.
+    """
+
+    def __init__(self, settings: Settings | None = None, window: int = 100):
+        """
+        Args:
+            settings: Configuration (par défaut get_settings())
+            window: Nombre de latences conservées par modèle pour le p95
+        """
+        self.settings = settings or get_settings()
+        self.primary = self.settings.llm_routing_model or self.settings.openrouter_model
+        self.fallback = self.settings.llm_fallback_model
+        self.intent_models = self.settings.llm_intent_models
+        self._latencies: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._first_token: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._degraded_until: dict[str, float] = {}
+        self._models: dict[tuple, ChatOpenAI] = {}
+
+    def model_for(self, stage: str, intent: str | None = None) -> str:
+        """
+        Modèle à utiliser pour une étape (et une intention pour "extraction").
+
+        Returns:
+            Nom du modèle OpenRouter, modèle de secours compris
+        """
+        model = self.primary
+        if stage == "extraction" and intent:
+            model = self.intent_models.get(intent, model)
+        if self.fallback and self.is_degraded(model):
+            return self.fallback
+        return model
+
+    def is_degraded(self, model: str) -> bool:
+        """Vrai si le modèle est écarté pour latence excessive."""
+        return time.monotonic() < self._degraded_until.get(model, 0.0)
+
+    def p95(self, model: str) -> float | None:
+        """p95 des dernières latences du modèle (ms), ou None sans mesure."""
+        return self.percentile(model, 95)
+
+    def percentile(self, model: str, q: float, first_token: bool = False) -> float | None:
+        """Percentile q (0-100) des dernières latences (ou délais du premier token) du modèle, en ms."""
+        samples = sorted((self._first_token if first_token else self._latencies).get(model, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))]
+
+    def record(self, model: str, elapsed_ms: float) -> None:
+        """Enregistre la latence d'un appel et bascule sur le secours si le budget p95 est dépassé."""
+        metrics.observe(f"llm.latency_ms.{model}", elapsed_ms)
+        samples = self._latencies[model]
+        samples.append(elapsed_ms)
+        if (
+            not self.fallback
+            or model == self.fallback
+            or len(samples) < self.settings.llm_latency_min_samples
+        ):
+            return
+
+        p95 = self.p95(model)
+        if p95 > self.settings.llm_latency_budget_p95_ms:
+            self._degraded_until[model] = time.monotonic() + self.settings.llm_fallback_cooldown_s
+            samples.clear()  # Nouvelle mesure à la reprise
+            metrics.increment("llm.fallbacks")
+            logger.warning(
+                f"🐢 p95 {model} = {p95:.0f} ms > budget {self.settings.llm_latency_budget_p95_ms:.0f} ms, "
+                f"bascule sur {self.fallback} pendant {self.settings.llm_fallback_cooldown_s:.0f} s"
+            )
+
+    def record_first_token(self, model: str, elapsed_ms: float) -> None:
+        """Enregistre le délai avant le premier token d'un appel en flux (délai de hedging)."""
+        self._first_token[model].append(elapsed_ms)
+        metrics.observe(f"llm.first_token_ms.{model}", elapsed_ms)
+
+    def hedge_model(self, model: str) -> str:
+        """Modèle de la requête de couverture : llm_hedge_model, le secours, sinon le même modèle."""
+        return self.settings.llm_hedge_model or self.fallback or model
+
+    def hedge_delay_s(self, model: str, first_token: bool = False) -> float:
+        """
+        Délai avant la requête de couverture : percentile llm_hedge_percentile
+        des latences du modèle (délai du premier token pour un flux), ou
+        llm_hedge_delay_ms tant qu'il y a moins de llm_latency_min_samples mesures.
+        """
+        samples = (self._first_token if first_token else self._latencies).get(model, ())
+        delay_ms = self.settings.llm_hedge_delay_ms
+        if len(samples) >= self.settings.llm_latency_min_samples:
+            delay_ms = self.percentile(model, self.settings.llm_hedge_percentile, first_token)
+        return delay_ms / 1000
+
+    def chat_model(self, model: str, **kwargs: Any) -> ChatOpenAI:
+        """ChatOpenAI du modèle, construit une fois (mêmes kwargs) puis réutilisé."""
+        key = (model, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        if key not in self._models:
+            self._models[key] = build_chat_model(self.settings, model=model, **kwargs)
+        return self._models[key]
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    delay_s: float,
+    discard: Callable[[Any], Awaitable[None]] | None = None,
+) -> tuple[Any, bool]:
+    """
+    Requête couverte : la première réponse gagne, l'autre requête est annulée.
+
+    primary() est lancé immédiatement ; si aucune réponse n'est arrivée après
+    delay_s, backup() est lancé à son tour. Si primary échoue avant, backup()
+    sert de nouvel essai (ce n'est pas une couverture). Métriques :
+    llm.hedge.calls, llm.hedge.fired (taux de couverture = fired / calls),
+    llm.hedge.wins (la couverture a répondu en premier) et llm.hedge.retries.
+
+    Args:
+        primary: Fabrique de la requête principale
+        backup: Fabrique de la requête de couverture
+        delay_s: Délai avant la requête de couverture (secondes)
+        discard: Libère le résultat d'une requête terminée mais perdante
+            (flux déjà ouvert, ...)
+
+    Returns:
+        (résultat, True si la requête de couverture a devancé la principale)
+
+    Raises:
+        Exception: L'erreur de la requête principale si les deux échouent
+    """
+    metrics.increment("llm.hedge.calls")
+    first = asyncio.create_task(primary())
+    second: asyncio.Task | None = None
+    pending = {first}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay_s)
+        if first in done:
+            if first.exception() is None:
+                return first.result(), False
+            metrics.increment("llm.hedge.retries")
+            try:
+                return await backup(), False
+            except Exception:
+                raise first.exception()
+
+        metrics.increment("llm.hedge.fired")
+        second = asyncio.create_task(backup())
+        pending.add(second)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # À égalité, la requête principale l'emporte
+            for task in sorted(done, key=lambda t: t is not first):
+                if task.exception() is None:
+                    won = task is second
+                    if won:
+                        metrics.increment("llm.hedge.wins")
+                    if discard:
+                        for other in done - {task}:
+                            if other.exception() is None:
+                                await discard(other.result())
+                    return task.result(), won
+        raise first.exception()
+    finally:
+        for task in (first, second):
+            if task is not None and not task.done():
+                task.cancel()
@@ -0,0 +1,81 @@
+"""Métriques applicatives en mémoire (compteurs et distributions)."""
+
+import threading
+from collections import defaultdict, deque
+
+
+class Metrics:
+    """
+    Compteurs et distributions de valeurs, partagés par tout le processus.
+
+    Les distributions conservent les `window` dernières observations pour
+    les percentiles ; le nombre et la somme portent sur toutes les observations.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._samples: dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals: dict[str, tuple[int, float]] = defaultdict(lambda: (0, 0.0))
+
+    def increment(self, name: str, value: float = 1.0) -> None:
+        """Incrémente un compteur."""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        """Enregistre une observation dans une distribution."""
+        with self._lock:
+            self._samples[name].append(value)
+            count, total = self._totals[name]
+            self._totals[name] = (count + 1, total + value)
+
+    def counter(self, name: str) -> float:
+        """Valeur courante d'un compteur (0 si jamais incrémenté)."""
+        with self._lock:
+            return self._counters.get(name, 0.0)
+
+    def percentile(self, name: str, q: float) -> float | None:
+        """Percentile q (0-100) des dernières observations, ou None sans observation."""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))]
+
+    def summary(self, name: str) -> dict[str, float]:
+        """Nombre, moyenne, p50, p95 et max d'une distribution."""
+        with self._lock:
+            count, total = self._totals.get(name, (0, 0.0))
+            samples = list(self._samples.get(name, ()))
+        if not count:
+            return {"count": 0}
+        return {
+            "count": count,
+            "mean": total / count,
+            "p50": self.percentile(name, 50),
+            "p95": self.percentile(name, 95),
+            "max": max(samples),
+        }
+
+    def snapshot(self) -> dict[str, dict]:
+        """Vue complète des compteurs et distributions."""
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._totals)
+        return {
+            "counters": counters,
+            "distributions": {name: self.summary(name) for name in names},
+        }
+
+    def reset(self) -> None:
+        """Remet toutes les métriques à zéro (tests, benchmarks)."""
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
+            self._totals.clear()
+
+
+# Instance partagée du processus
+metrics = Metrics()
@@ -0,0 +1,117 @@
+"""Comptabilité des tokens et latences LLM par tour de conversation (table llm_usage)."""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def usage_tokens(response: Any) -> tuple[int, int]:
+    """(tokens du prompt, tokens générés) d'une réponse ChatOpenAI, (0, 0) si inconnus."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+
+
+def cached_tokens(response: Any) -> int:
+    """Tokens du prompt servis par le cache du fournisseur (prompt_tokens_details.cached_tokens)."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return int((usage.get("input_token_details") or {}).get("cache_read") or 0)
+
+
+@dataclass
+class TurnUsage:
+    """
+    Tokens et temps d'un tour d'analyze_message, appel LLM par appel LLM.
+
+    Chaque appel LLM ouvre une itération ; le temps des outils exécutés
+    ensuite lui est rattaché. Le reste du temps total (historique, contexte
+    métier, analyse de la réponse) est le surcoût de l'orchestrateur.
+    """
+
+    user_id: int
+    started: float = field(default_factory=time.perf_counter)
+    model: str | None = None
+    iterations: list[list[int]] = field(default_factory=list)
+    cached_tokens: int = 0
+
+    def add_llm_call(self, model: str, elapsed_ms: float, response: Any) -> None:
+        """Enregistre un appel LLM (durée et tokens de la réponse)."""
+        # Modèle effectivement servi (requête de couverture, secours) s'il est connu
+        self.model = (getattr(response, "response_metadata", None) or {}).get("model_name") or model
+        prompt_tokens, completion_tokens = usage_tokens(response)
+        self.iterations.append([round(elapsed_ms), 0, prompt_tokens, completion_tokens])
+        self.cached_tokens += cached_tokens(response)
+
+    def add_tool_time(self, elapsed_ms: float) -> None:
+        """Rattache le temps d'exécution des outils au dernier appel LLM."""
+        if self.iterations:
+            self.iterations[-1][1] += round(elapsed_ms)
+
+    def as_record(self, intent: str) -> dict[str, Any]:
+        """Ligne llm_usage du tour (à appeler à la fin du tour)."""
+        return {
+            "user_id": self.user_id,
+            "intent": intent,
+            "model": self.model,
+            "llm_calls": len(self.iterations),
+            "prompt_tokens": sum(it[2] for it in self.iterations),
+            "completion_tokens": sum(it[3] for it in self.iterations),
+            "cached_tokens": self.cached_tokens,
+            "total_ms": round((time.perf_counter() - self.started) * 1000),
+            "llm_ms": sum(it[0] for it in self.iterations),
+            "tool_ms": sum(it[1] for it in self.iterations),
+            "iterations": self.iterations or None,
+        }
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))] if values else 0.0
+
+
+def _aggregate(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    latencies = [row["total_ms"] or 0 for row in rows]
+    return {
+        "turns": len(rows),
+        "llm_calls": sum(row["llm_calls"] or 0 for row in rows),
+        "prompt_tokens": sum(row["prompt_tokens"] or 0 for row in rows),
+        "completion_tokens": sum(row["completion_tokens"] or 0 for row in rows),
+        "cached_tokens": sum(row.get("cached_tokens") or 0 for row in rows),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+    }
+
+
+def aggregate_usage(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Agrégats du rapport /usage : par jour, par intention et répartition du temps.
+
+    Args:
+        rows: Lignes llm_usage (dicts avec created_at, intent, tokens et temps)
+
+    Returns:
+        {"days": [(date, agrégat)], "intents": [(intent, agrégat)], "total": agrégat,
+        "split": {"llm": %, "tools": %, "other": %}}
+    """
+    by_day: dict[Any, list] = defaultdict(list)
+    by_intent: dict[str, list] = defaultdict(list)
+    for row in rows:
+        by_day[row["created_at"].date()].append(row)
+        by_intent[row["intent"] or "?"].append(row)
+
+    total_ms = sum(row["total_ms"] or 0 for row in rows) or 1
+    llm_ms = sum(row["llm_ms"] or 0 for row in rows)
+    tool_ms = sum(row["tool_ms"] or 0 for row in rows)
+    return {
+        "days": [(day, _aggregate(by_day[day])) for day in sorted(by_day)],
+        "intents": sorted(
+            ((intent, _aggregate(items)) for intent, items in by_intent.items()),
+            key=lambda item: -item[1]["turns"],
+        ),
+        "total": _aggregate(rows),
+        "split": {
+            "llm": 100 * llm_ms / total_ms,
+            "tools": 100 * tool_ms / total_ms,
+            "other": max(0.0, 100 * (total_ms - llm_ms - tool_ms) / total_ms),
+        },
+    }
@@ -78,6 +78,12 @@ class Document(Base):
 
     telegram_file_id = Column(String, nullable=True)
 
+    # Empreinte du contenu rendu (voir DocumentContent)
+    content_hash = Column(String(64), index=True, nullable=True)
+
+    # Date de paiement (factures) ; pdf_path pointe alors vers le PDF tamponné
+    paid_at = Column(DateTime, nullable=True)
+
 
 
 
@@ -190,3 +196,35 @@ class ChatHistory(Base):
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+
+class DocumentContent(Base):
+    """Index des PDFs stockés par empreinte de contenu (validated_data + version de gabarit)."""
+    __tablename__ = "document_contents"
+
+    content_hash = Column(String(64), primary_key=True)
+    document_type = Column(Enum(DocumentType), index=True)
+    template_version = Column(String(32))
+    pdf_path = Column(String)
+    size_bytes = Column(Integer, nullable=True)
+    telegram_file_id = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class LLMUsage(Base):
+    """Consommation LLM d'un tour de conversation (tokens et temps par étape, analyse des coûts)."""
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    user_id = Column(BigInteger, index=True)
+    intent = Column(String(32), index=True)
+    model = Column(String(100), nullable=True)  # Modèle de la réponse finale
+    llm_calls = Column(Integer, default=0)  # 0 : réponse servie par le cache
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)  # Tokens du prompt servis par le cache du fournisseur
+    total_ms = Column(Integer)
+    llm_ms = Column(Integer, default=0)
+    tool_ms = Column(Integer, default=0)
+    # Détail par appel LLM : [[llm_ms, tool_ms, prompt_tokens, completion_tokens], ...]
+    iterations = Column(JSON, nullable=True)
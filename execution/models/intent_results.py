@@ -0,0 +1,227 @@
+"""Modèles Pydantic de la réponse finale de l'orchestrateur (sortie structurée)."""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+
+from execution.models.documents import Invoice, MileageRecord, Quote, RentalCharges, RentReceipt
+
+# Nom de l'outil de réponse finale
+FINAL_ANSWER_TOOL = "final_answer"
+
+INTENTS = ("invoice", "quote", "mileage", "rent_receipt", "rental_charges", "stats", "chat")
+
+# Intention -> (modèle du document, champs attribués par l'application)
+DOCUMENT_MODELS: dict[str, tuple[type[BaseModel], tuple[str, ...]]] = {
+    "invoice": (Invoice, ("invoice_number",)),
+    "quote": (Quote, ("quote_number",)),
+    "mileage": (MileageRecord, ()),
+    "rent_receipt": (RentReceipt, ("receipt_number",)),
+    "rental_charges": (RentalCharges, ()),
+}
+
+# Champs obligatoires complétés par défaut par l'agent spécialisé (date du jour, mois courant...)
+AGENT_DEFAULT_FIELDS = frozenset(
+    {"invoice_date", "due_date", "quote_date", "period_month", "period_year", "payment_date"}
+)
+
+
+class ExtractedData(BaseModel):
+    """Données extraites d'un message ; champs inconnus conservés (complétés par l'application)."""
+
+    model_config = ConfigDict(extra="allow")
+
+
+def draft_model(model: type[BaseModel], exclude: tuple[str, ...] = ()) -> type[ExtractedData]:
+    """
+    Version brouillon d'un modèle de document : mêmes champs et types, tous facultatifs.
+
+    Les contraintes (min_length, gt...) et validateurs croisés ne sont pas
+    repris : le LLM ne donne qu'une partie des champs, l'agent spécialisé
+    valide le document complet.
+    """
+    fields: dict[str, Any] = {}
+    for name, info in model.model_fields.items():
+        if name in exclude:
+            continue
+        annotation = info.annotation
+        item = get_args(annotation)[0] if get_origin(annotation) is list else None
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            annotation = list[draft_model(item)]
+        fields[name] = (annotation | None, Field(default=None, description=info.description))
+    return create_model(f"{model.__name__}Draft", __base__=ExtractedData, **fields)
+
+
+# Schéma de extracted_data par intention
+EXTRACTED_DATA_SCHEMAS: dict[str, type[ExtractedData]] = {
+    intent: draft_model(model, exclude) for intent, (model, exclude) in DOCUMENT_MODELS.items()
+}
+EXTRACTED_DATA_SCHEMAS.update({"stats": ExtractedData, "chat": ExtractedData})
+
+
+class IntentResultModel(BaseModel):
+    """Réponse finale de l'orchestrateur (enveloppe commune aux intentions)."""
+
+    intent: str
+    confidence: float = Field(default=1.0, ge=0, le=1)
+    extracted_data: ExtractedData = Field(default_factory=ExtractedData)
+    reply_text: str | None = None
+
+
+# Modèle de réponse par intention : intent figé, extracted_data typé
+INTENT_RESULT_MODELS: dict[str, type[IntentResultModel]] = {
+    intent: create_model(
+        f"{''.join(part.title() for part in intent.split('_'))}Result",
+        __base__=IntentResultModel,
+        intent=(Literal[intent], ...),
+        extracted_data=(schema, Field(default_factory=schema)),
+    )
+    for intent, schema in EXTRACTED_DATA_SCHEMAS.items()
+}
+
+
+class FinalAnswer(BaseModel):
+    """Return the final decision for the user's message. Call it exactly once, when no other tool is needed."""
+
+    intent: Literal[INTENTS] = Field(..., description="Detected intent")
+    confidence: float = Field(default=1.0, ge=0, le=1, description="Confidence between 0 and 1")
+    extracted_data: Union[tuple(EXTRACTED_DATA_SCHEMAS[intent] for intent in INTENTS[:5])] = Field(  # noqa: UP007
+        default_factory=dict,
+        description="Fields of the document matching the intent (empty object for chat and stats)",
+    )
+    reply_text: str | None = Field(default=None, description="Message for the user (plain text)")
+
+
+def _without_titles(schema: Any) -> Any:
+    """
+    Schéma JSON sans les "title" générés par Pydantic (tokens inutiles à chaque appel).
+
+    Une propriété nommée "title" (valeur dict) est conservée.
+    """
+    if isinstance(schema, dict):
+        return {
+            key: _without_titles(value)
+            for key, value in schema.items()
+            if not (key == "title" and isinstance(value, str))
+        }
+    if isinstance(schema, list):
+        return [_without_titles(value) for value in schema]
+    return schema
+
+
+def final_answer_tool() -> dict[str, Any]:
+    """Définition de l'outil final_answer (format OpenAI tools) pour bind_tools."""
+    return {
+        "type": "function",
+        "function": {
+            "name": FINAL_ANSWER_TOOL,
+            "description": FinalAnswer.__doc__,
+            "parameters": _without_titles(FinalAnswer.model_json_schema()),
+        },
+    }
+
+
+@dataclass
+class ParsedAnswer:
+    """Réponse finale validée ; dropped liste les champs de extracted_data écartés."""
+
+    intent: str
+    confidence: float
+    extracted_data: dict[str, Any]
+    reply_text: str | None
+    dropped: list[str] = field(default_factory=list)
+
+
+def missing_fields(intent: str, data: dict[str, Any]) -> list[str]:
+    """
+    Champs obligatoires du document absents de extracted_data.
+
+    Les numéros attribués par l'application et les champs complétés par
+    défaut par l'agent spécialisé ne sont pas comptés.
+    """
+    if intent not in DOCUMENT_MODELS:
+        return []
+    model, assigned = DOCUMENT_MODELS[intent]
+    return [
+        name
+        for name, info in model.model_fields.items()
+        if info.is_required()
+        and name not in assigned
+        and name not in AGENT_DEFAULT_FIELDS
+        and data.get(name) in (None, "", [], {})
+    ]
+
+
+def _path_sort_key(path: tuple) -> tuple:
+    """Clé de tri d'un chemin d'erreur : index de liste comparés numériquement, clés par nom."""
+    return tuple((0, key, "") if isinstance(key, int) else (1, 0, str(key)) for key in path)
+
+
+def _drop(data: Any, path: tuple) -> bool:
+    """Supprime la valeur au chemin path (clés et index) ; False si le chemin n'existe plus."""
+    for key in path[:-1]:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return False
+    try:
+        del data[path[-1]]
+        return True
+    except (KeyError, IndexError, TypeError):
+        return False
+
+
+def parse_final_answer(args: str | dict[str, Any]) -> ParsedAnswer:
+    """
+    Valide une réponse finale (arguments de final_answer ou JSON du contenu).
+
+    L'enveloppe (intent, confidence, reply_text) doit être valide ; dans
+    extracted_data, les champs invalides pour le schéma de l'intention sont
+    écartés plutôt que de rejeter toute la réponse : l'agent spécialisé
+    redemandera seulement ce qui manque.
+
+    Raises:
+        ValueError: JSON illisible, intention inconnue ou enveloppe invalide
+    """
+    if isinstance(args, str):
+        args = json.loads(args)
+    if not isinstance(args, dict):
+        raise ValueError("final answer must be a JSON object")
+    model = INTENT_RESULT_MODELS.get(args.get("intent"))
+    if model is None:
+        raise ValueError(
+            f"unknown intent {args.get('intent')!r}, expected one of {', '.join(INTENTS)}"
+        )
+
+    data = args.get("extracted_data") or {}
+    if not isinstance(data, dict):
+        raise ValueError("extracted_data must be an object")
+    data = json.loads(json.dumps(data))  # Copie profonde modifiable
+    dropped: list[str] = []
+    while True:
+        try:
+            answer = model.model_validate({**args, "extracted_data": data})
+            break
+        except ValidationError as e:
+            errors = e.errors()
+            envelope = [err for err in errors if err["loc"][:1] != ("extracted_data",)]
+            if envelope:
+                raise ValueError(
+                    f"invalid final answer: {envelope[0]['loc']} {envelope[0]['msg']}"
+                ) from e
+            # Les index de liste se décalent à la suppression : chemins les plus profonds et derniers d'abord
+            paths = sorted({err["loc"][1:] for err in errors}, key=_path_sort_key, reverse=True)
+            removed = [path for path in paths if path and _drop(data, path)]
+            if not removed:
+                raise ValueError(f"invalid extracted_data: {errors[0]['msg']}") from e
+            dropped.extend(".".join(str(key) for key in path) for path in removed)
+
+    return ParsedAnswer(
+        intent=answer.intent,
+        confidence=answer.confidence,
+        extracted_data=data,
+        reply_text=answer.reply_text,
+        dropped=dropped,
+    )
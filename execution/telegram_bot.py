@@ -2,20 +2,26 @@
 
 from telegram import Update
 from telegram.ext import (
+    CallbackQueryHandler,
     Application,
     CommandHandler,
     ContextTypes,
     MessageHandler,
     filters,
 )
-from datetime import date
-from execution.agents.invoice_agent import InvoiceAgent
-from execution.agents.quote_agent import QuoteAgent
-from execution.agents.mileage_agent import MileageAgent
-from execution.agents.rent_receipt_agent import RentReceiptAgent
-from execution.agents.rental_charges_agent import RentalChargesAgent
+from datetime import date, datetime, timedelta
+from functools import partial
 from execution.agents.orchestrator_agent import OrchestratorAgent
-from execution.agents.base_admin_agent import AdminAgentState
+from execution.agents.intent_classifier import (
+    CANNED_REPLIES,
+    IntentClassifier,
+    fast_path_report,
+    record_fast_path,
+    seed_dataset,
+)
+from execution.agents.prefetch import SpeculativePrefetcher, prefetch_report
+from execution.agents.registry import AgentRegistry
+from execution.agents.base_admin_agent import AdminAgentState, get_company_info
 from execution.tools.telegram_helpers import (
     send_document_with_preview,
     parse_command_args,
@@ -24,10 +30,25 @@ from execution.tools.telegram_helpers import (
     build_help_text,
     validate_user_access,
     send_typing_action,
+    TelegramStreamWriter,
+    PendingDraft,
+    build_draft_keyboard,
+    format_draft_summary,
+    format_usage_report,
+    is_draft_confirmation,
+    parse_draft_callback,
 )
-from execution.tools.db_manager import DatabaseManager
+from execution.tools.db_manager import DatabaseManager, NumberLease
+from execution.tools.pdf_stamp import stamp_paid
+from execution.models.database import DocumentType
 from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
+from execution.core.llm import ModelRouter
+from execution.core.metrics import metrics
+from execution.core.usage import aggregate_usage
+import asyncio
 import logging
+import time
 
 logging.basicConfig(
     level=logging.INFO,
@@ -43,22 +64,72 @@ class AdminBot:
         """Initialise le bot avec la configuration."""
         self.settings = get_settings()
         self.db = DatabaseManager()
-        self.orchestrator = OrchestratorAgent()
+
+        # Agents et graphs compilés une seule fois, partagés par toutes les requêtes
+        self.router = ModelRouter(self.settings)
+        self.agents = AgentRegistry(db=self.db, router=self.router)
+        self.agents.warm_up()
+        self.store = self.agents.store
+        self.storage = self.agents.storage
+        self.orchestrator = OrchestratorAgent(router=self.router, db=self.db)
+        self.prefetcher = SpeculativePrefetcher(self.agents, self.orchestrator.business_context)
+
+        # Commandes de génération par type de document (intent de l'orchestrateur)
+        self.document_commands = {
+            "invoice": self.cmd_invoice,
+            "quote": self.cmd_quote,
+            "mileage": self.cmd_mileage,
+            "rent_receipt": self.cmd_rent_receipt,
+            "rental_charges": self.cmd_rental_charges,
+        }
+
+        # Classifieur local : entraîné sur les exemples, ré-entraîné avec l'historique au démarrage
+        self.intent_classifier = IntentClassifier(
+            threshold=self.settings.intent_fast_path_threshold,
+            max_chars=self.settings.intent_fast_path_max_chars,
+        ).fit(*seed_dataset())
 
         # Créer l'application
-        self.app = Application.builder().token(self.settings.telegram_bot_token).build()
+        self.app = (
+            Application.builder()
+            .token(self.settings.telegram_bot_token)
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
 
         # Enregistrer les commandes
         self._register_handlers()
 
         logger.info("✅ Bot initialisé")
 
+    async def _post_init(self, app: Application) -> None:
+        """Ouvre les connexions vers les APIs LLM avant la première requête."""
+        await get_http_clients().warm_up()
+        if self.settings.intent_fast_path_enabled:
+            await self._train_intent_classifier()
+
+    async def _train_intent_classifier(self) -> None:
+        """Ré-entraîne le classifieur d'intentions avec l'historique chat_history."""
+        try:
+            messages = await self.db.get_user_messages(self.settings.intent_fast_path_history_limit)
+            await asyncio.to_thread(self.intent_classifier.fit_with_history, messages)
+        except Exception as e:
+            logger.warning(f"Classifieur d'intentions limité aux exemples annotés: {e}")
+
+    async def _post_shutdown(self, app: Application) -> None:
+        """Ferme les clients HTTP partagés et le pool de connexions base."""
+        await self.orchestrator.flush_usage()
+        await get_http_clients().aclose()
+        await self.db.close()
+
     def _register_handlers(self) -> None:
         """Enregistre tous les handlers de commandes."""
         # Commandes générales
         self.app.add_handler(CommandHandler("start", self.cmd_start))
         self.app.add_handler(CommandHandler("help", self.cmd_help))
         self.app.add_handler(CommandHandler("stats", self.cmd_stats))
+        self.app.add_handler(CommandHandler("usage", self.cmd_usage))
 
         # Commandes de génération de documents
         self.app.add_handler(CommandHandler("facture", self.cmd_invoice))
@@ -67,6 +138,12 @@ class AdminBot:
         self.app.add_handler(CommandHandler("quittance", self.cmd_rent_receipt))
         self.app.add_handler(CommandHandler("charges", self.cmd_rental_charges))
 
+        # Suivi des paiements
+        self.app.add_handler(CommandHandler("payee", self.cmd_paid))
+
+        # Boutons "Confirmer / Modifier" des brouillons de documents
+        self.app.add_handler(CallbackQueryHandler(self.handle_draft_callback, pattern=r"^draft:"))
+
         # Handler pour les messages textuels (IA Conversationnelle)
         self.app.add_handler(
             MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_natural_language)
@@ -79,7 +156,7 @@ class AdminBot:
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 "❌ **Accès non autorisé**\n\n"
                 "Vous n'êtes pas autorisé à utiliser ce bot.",
                 parse_mode="Markdown",
@@ -104,37 +181,40 @@ Utilisez `/help` pour voir toutes les commandes disponibles.
 Entreprise: {self.settings.company_name}
 SIRET: {self.settings.company_siret}
 """
-        await update.message.reply_text(welcome_text, parse_mode="Markdown")
+        await update.effective_message.reply_text(welcome_text, parse_mode="Markdown")
 
     async def cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Commande /help - Affiche l'aide."""
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         help_text = build_help_text()
-        await update.message.reply_text(help_text, parse_mode="Markdown")
+        await update.effective_message.reply_text(help_text, parse_mode="Markdown")
 
     async def cmd_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Commande /stats - Affiche les statistiques de l'utilisateur."""
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         await send_typing_action(update, context)
+        await self._reply_stats(update)
 
+    async def _reply_stats(self, update: Update) -> str:
+        """Envoie les statistiques de l'utilisateur et retourne le texte envoyé."""
+        user_id = update.effective_user.id
         try:
             counts = await self.db.get_document_count_by_type(user_id)
 
             if not counts:
-                await update.message.reply_text(
-                    "📊 Vous n'avez encore généré aucun document."
-                )
-                return
+                stats_text = "📊 Vous n'avez encore généré aucun document."
+                await update.effective_message.reply_text(stats_text)
+                return stats_text
 
             stats_text = "📊 **Vos Statistiques**\n\n"
             emoji_map = {
@@ -152,18 +232,49 @@ SIRET: {self.settings.company_siret}
             total = sum(counts.values())
             stats_text += f"\n**Total: {total} documents**"
 
-            await update.message.reply_text(stats_text, parse_mode="Markdown")
+            await update.effective_message.reply_text(stats_text, parse_mode="Markdown")
+            return stats_text
 
         except Exception as e:
             logger.error(f"Erreur stats: {e}", exc_info=True)
-            await update.message.reply_text("❌ Erreur lors de la récupération des statistiques")
+            error_text = "❌ Erreur lors de la récupération des statistiques"
+            await update.effective_message.reply_text(error_text)
+            return error_text
+
+    async def cmd_usage(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Commande /usage [jours] - Tokens et latences LLM (agrégats journaliers, p50/p95)."""
+        user_id = update.effective_user.id
+
+        if not validate_user_access(user_id, self.settings.telegram_admin_users):
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
+            return
+
+        days = 7
+        if context.args:
+            try:
+                days = max(1, min(int(context.args[0]), 90))
+            except ValueError:
+                await update.effective_message.reply_text(
+                    "Usage: `/usage [jours]`\nExemple: `/usage 30`", parse_mode="Markdown"
+                )
+                return
+
+        await send_typing_action(update, context)
+        try:
+            since = datetime.utcnow() - timedelta(days=days)  # created_at en UTC
+            rows = await self.db.get_llm_usage(since)
+            report = format_usage_report(aggregate_usage(rows), days)
+            await update.effective_message.reply_text(report, parse_mode="HTML")
+        except Exception as e:
+            logger.error(f"Erreur usage: {e}", exc_info=True)
+            await update.effective_message.reply_text("❌ Erreur lors de la récupération de la consommation LLM")
 
     async def cmd_invoice(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Commande /facture - Génère une facture."""
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         # Vérifier si on a des données pré-extraites par l'IA
@@ -174,14 +285,14 @@ SIRET: {self.settings.company_siret}
             input_data = pre_extracted
             # Validation minimale pour le mode IA
             if not input_data.get("client_name") or not input_data.get("items"):
-                await update.message.reply_text("⚠️ J'ai compris que vous voulez une facture, mais je n'ai pas trouvé le nom du client ou le montant. Pouvez-vous reformuler ?\n\nExemple : 'Facture pour Apple de 500€'")
+                await update.effective_message.reply_text("⚠️ J'ai compris que vous voulez une facture, mais je n'ai pas trouvé le nom du client ou le montant. Pouvez-vous reformuler ?\n\nExemple : 'Facture pour Apple de 500€'")
                 return
         else:
             # Mode Commande Classique
             args = parse_command_args(update.message.text)
 
             if not args.get("client") or not args.get("montant"):
-                await update.message.reply_text(
+                await update.effective_message.reply_text(
                     "❌ **Arguments manquants**\n\n"
                     "Usage:\n"
                     "`/facture client=\"Nom Client\" montant=1500 description=\"Service\"`",
@@ -206,7 +317,7 @@ SIRET: {self.settings.company_siret}
             }
 
         await send_typing_action(update, context)
-        msg = await update.message.reply_text("⏳ Génération de la facture en cours...")
+        await update.effective_message.reply_text("⏳ Génération de la facture en cours...")
 
         try:
             # Préparer l'état
@@ -221,13 +332,12 @@ SIRET: {self.settings.company_siret}
             }
 
             # Exécuter l'agent
-            agent = InvoiceAgent()
-            result = await agent.execute(state)
+            result = await self.agents.execute(await self._take_prepared_state(context, state))
 
             # Gérer le résultat
             if result.get("error"):
                 error_msg = format_error_message(result["error"])
-                await update.message.reply_text(error_msg, parse_mode="Markdown")
+                await update.effective_message.reply_text(error_msg, parse_mode="Markdown")
                 return
 
             # Envoyer le PDF
@@ -240,13 +350,11 @@ SIRET: {self.settings.company_siret}
                 f"{float(invoice.total_ttc):.2f}€",
             )
 
-            await send_document_with_preview(
-                update, context, result["pdf_path"], success_msg
-            )
+            await self._send_result_document(update, context, result, success_msg)
 
         except Exception as e:
             logger.error(f"Erreur facture: {e}", exc_info=True)
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 f"❌ Erreur lors de la génération: {str(e)}"
             )
 
@@ -255,7 +363,7 @@ SIRET: {self.settings.company_siret}
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         # Vérifier si on a des données pré-extraites par l'IA
@@ -264,13 +372,13 @@ SIRET: {self.settings.company_siret}
         if pre_extracted is not None:
             input_data = pre_extracted
             if not input_data.get("client_name") or not input_data.get("items"):
-                await update.message.reply_text("⚠️ Je n'ai pas trouvé le client ou les articles pour le devis. Pouvez-vous préciser ?")
+                await update.effective_message.reply_text("⚠️ Je n'ai pas trouvé le client ou les articles pour le devis. Pouvez-vous préciser ?")
                 return
         else:
             args = parse_command_args(update.message.text)
 
             if not args.get("client") or not args.get("montant"):
-                await update.message.reply_text(
+                await update.effective_message.reply_text(
                     "❌ **Arguments manquants**\n\n"
                     "Usage:\n"
                     "`/devis client=\"Nom Client\" montant=1500 description=\"Service\"`",
@@ -295,7 +403,7 @@ SIRET: {self.settings.company_siret}
             }
 
         await send_typing_action(update, context)
-        await update.message.reply_text("⏳ Génération du devis en cours...")
+        await update.effective_message.reply_text("⏳ Génération du devis en cours...")
 
         try:
             # Préparer l'état
@@ -310,13 +418,12 @@ SIRET: {self.settings.company_siret}
             }
 
             # Exécuter l'agent
-            agent = QuoteAgent()
-            result = await agent.execute(state)
+            result = await self.agents.execute(await self._take_prepared_state(context, state))
 
             # Gérer le résultat
             if result.get("error"):
                 error_msg = format_error_message(result["error"])
-                await update.message.reply_text(error_msg, parse_mode="Markdown")
+                await update.effective_message.reply_text(error_msg, parse_mode="Markdown")
                 return
 
             # Envoyer le PDF
@@ -329,13 +436,11 @@ SIRET: {self.settings.company_siret}
                 f"{float(quote.total_ttc):.2f}€",
             )
 
-            await send_document_with_preview(
-                update, context, result["pdf_path"], success_msg
-            )
+            await self._send_result_document(update, context, result, success_msg)
 
         except Exception as e:
             logger.error(f"Erreur devis: {e}", exc_info=True)
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 f"❌ Erreur lors de la génération: {str(e)}"
             )
 
@@ -344,7 +449,7 @@ SIRET: {self.settings.company_siret}
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         pre_extracted = context.user_data.pop("pre_extracted_data", None)
@@ -352,13 +457,13 @@ SIRET: {self.settings.company_siret}
         if pre_extracted is not None:
             input_data = pre_extracted
             if not input_data.get("trips"):
-                 await update.message.reply_text("⚠️ Je n'ai pas trouvé les détails du trajet. Précisez Départ, Arrivée et KM.")
+                 await update.effective_message.reply_text("⚠️ Je n'ai pas trouvé les détails du trajet. Précisez Départ, Arrivée et KM.")
                  return
         else:
             args = parse_command_args(update.message.text)
 
             if not args.get("depart") or not args.get("arrivee") or not args.get("km"):
-                await update.message.reply_text(
+                await update.effective_message.reply_text(
                     "❌ **Arguments manquants**\n\n"
                     "Usage:\n"
                     "`/frais_km depart=\"Paris\" arrivee=\"Lyon\" km=460 motif=\"Client X\"`",
@@ -381,7 +486,7 @@ SIRET: {self.settings.company_siret}
             }
 
         await send_typing_action(update, context)
-        await update.message.reply_text("⏳ Génération de la note de frais en cours...")
+        await update.effective_message.reply_text("⏳ Génération de la note de frais en cours...")
 
         try:
             # Préparer l'état
@@ -396,13 +501,12 @@ SIRET: {self.settings.company_siret}
             }
 
             # Exécuter l'agent
-            agent = MileageAgent()
-            result = await agent.execute(state)
+            result = await self.agents.execute(await self._take_prepared_state(context, state))
 
             # Gérer le résultat
             if result.get("error"):
                 error_msg = format_error_message(result["error"])
-                await update.message.reply_text(error_msg, parse_mode="Markdown")
+                await update.effective_message.reply_text(error_msg, parse_mode="Markdown")
                 return
 
             # Envoyer le PDF
@@ -416,13 +520,11 @@ SIRET: {self.settings.company_siret}
                 f"{total:.2f}€",
             )
 
-            await send_document_with_preview(
-                update, context, result["pdf_path"], success_msg
-            )
+            await self._send_result_document(update, context, result, success_msg)
 
         except Exception as e:
             logger.error(f"Erreur frais_km: {e}", exc_info=True)
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 f"❌ Erreur lors de la génération: {str(e)}"
             )
 
@@ -433,7 +535,7 @@ SIRET: {self.settings.company_siret}
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         pre_extracted = context.user_data.pop("pre_extracted_data", None)
@@ -441,13 +543,13 @@ SIRET: {self.settings.company_siret}
         if pre_extracted is not None:
             input_data = pre_extracted
             if not input_data.get("tenant_name") or not input_data.get("rent_amount"):
-                await update.message.reply_text("⚠️ Il manque le nom du locataire ou le montant du loyer.")
+                await update.effective_message.reply_text("⚠️ Il manque le nom du locataire ou le montant du loyer.")
                 return
         else:
             args = parse_command_args(update.message.text)
             
             if not args.get("locataire") or not args.get("montant"):
-                await update.message.reply_text(
+                await update.effective_message.reply_text(
                     "❌ **Arguments manquants**\n\n"
                     "Usage:\n"
                     "`/quittance locataire=\"Jean Dupont\" montant=800 charges=50 mois=1`",
@@ -466,7 +568,7 @@ SIRET: {self.settings.company_siret}
             }
 
         await send_typing_action(update, context)
-        await update.message.reply_text("⏳ Génération de la quittance en cours...")
+        await update.effective_message.reply_text("⏳ Génération de la quittance en cours...")
 
         try:
             # Préparer l'état
@@ -481,13 +583,12 @@ SIRET: {self.settings.company_siret}
             }
 
             # Exécuter l'agent
-            agent = RentReceiptAgent()
-            result = await agent.execute(state)
+            result = await self.agents.execute(await self._take_prepared_state(context, state))
 
             # Gérer le résultat
             if result.get("error"):
                 error_msg = format_error_message(result["error"])
-                await update.message.reply_text(error_msg, parse_mode="Markdown")
+                await update.effective_message.reply_text(error_msg, parse_mode="Markdown")
                 return
 
             # Envoyer le PDF
@@ -500,13 +601,11 @@ SIRET: {self.settings.company_siret}
                 f"{float(receipt.total_amount):.2f}€",
             )
 
-            await send_document_with_preview(
-                update, context, result["pdf_path"], success_msg
-            )
+            await self._send_result_document(update, context, result, success_msg)
 
         except Exception as e:
             logger.error(f"Erreur quittance: {e}", exc_info=True)
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 f"❌ Erreur lors de la génération: {str(e)}"
             )
 
@@ -517,7 +616,7 @@ SIRET: {self.settings.company_siret}
         user_id = update.effective_user.id
 
         if not validate_user_access(user_id, self.settings.telegram_admin_users):
-            await update.message.reply_text("❌ Accès non autorisé.")
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
             return
 
         pre_extracted = context.user_data.pop("pre_extracted_data", None)
@@ -525,13 +624,13 @@ SIRET: {self.settings.company_siret}
         if pre_extracted is not None:
             input_data = pre_extracted
             if not input_data.get("tenant_name") or not input_data.get("charges"):
-                await update.message.reply_text("⚠️ Il manque le nom du locataire ou la liste des charges.")
+                await update.effective_message.reply_text("⚠️ Il manque le nom du locataire ou la liste des charges.")
                 return
         else:
             args = parse_command_args(update.message.text)
             
             if not args.get("locataire") or not args.get("montant"):
-                await update.message.reply_text(
+                await update.effective_message.reply_text(
                     "❌ **Arguments manquants**\n\n"
                     "Usage:\n"
                     "`/charges locataire=\"Jean Dupont\" montant=450 provisions=400 annee=2023`",
@@ -563,7 +662,7 @@ SIRET: {self.settings.company_siret}
             }
 
         await send_typing_action(update, context)
-        await update.message.reply_text("⏳ Génération du décompte en cours...")
+        await update.effective_message.reply_text("⏳ Génération du décompte en cours...")
 
         try:
             # Préparer l'état
@@ -578,13 +677,12 @@ SIRET: {self.settings.company_siret}
             }
 
             # Exécuter l'agent
-            agent = RentalChargesAgent()
-            result = await agent.execute(state)
+            result = await self.agents.execute(await self._take_prepared_state(context, state))
 
             # Gérer le résultat
             if result.get("error"):
                 error_msg = format_error_message(result["error"])
-                await update.message.reply_text(error_msg, parse_mode="Markdown")
+                await update.effective_message.reply_text(error_msg, parse_mode="Markdown")
                 return
 
             # Envoyer le PDF
@@ -608,16 +706,231 @@ SIRET: {self.settings.company_siret}
                 regul_str,
             )
 
-            await send_document_with_preview(
-                update, context, result["pdf_path"], success_msg
-            )
+            await self._send_result_document(update, context, result, success_msg)
 
         except Exception as e:
             logger.error(f"Erreur charges: {e}", exc_info=True)
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 f"❌ Erreur lors de la génération: {str(e)}"
             )
 
+    async def cmd_paid(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Commande /payee <numéro> - Marque une facture payée et renvoie le PDF tamponné."""
+        user_id = update.effective_user.id
+
+        if not validate_user_access(user_id, self.settings.telegram_admin_users):
+            await update.effective_message.reply_text("❌ Accès non autorisé.")
+            return
+
+        if not context.args:
+            await update.effective_message.reply_text(
+                "Usage: `/payee <numéro de facture>`\nExemple: `/payee 2025-0001`",
+                parse_mode="Markdown",
+            )
+            return
+
+        doc_number = context.args[0]
+        await send_typing_action(update, context)
+
+        try:
+            document = await self.db.get_document_by_number(doc_number, user_id)
+            if document is None or document.document_type != DocumentType.INVOICE:
+                await update.effective_message.reply_text(f"❌ Facture {doc_number} introuvable.")
+                return
+
+            # PDF d'origine (re-rendu depuis Document.data s'il a été évincé)
+            pdf_path = await self.storage.ensure_available(document, get_company_info())
+            known_file_id = document.telegram_file_id
+
+            if document.paid_at:
+                caption = f"✅ Facture {doc_number} déjà payée le {document.paid_at.strftime('%d/%m/%Y')}"
+            else:
+                # Tampon superposé au PDF existant : pas de re-validation ni de re-rendu
+                paid_at = datetime.now()
+                pdf_path = await asyncio.to_thread(stamp_paid, pdf_path, paid_at.date())
+                await self.db.mark_document_paid(document.id, paid_at, str(pdf_path))
+                known_file_id = None
+                caption = f"✅ Facture {doc_number} marquée payée le {paid_at.strftime('%d/%m/%Y')}"
+
+            file_id = await send_document_with_preview(
+                update, context, pdf_path, caption, file_id=known_file_id
+            )
+            if file_id and file_id != known_file_id:
+                await self.db.set_document_telegram_file_id(document.id, file_id)
+
+        except Exception as e:
+            logger.error(f"Erreur payee: {e}", exc_info=True)
+            await update.effective_message.reply_text(f"❌ Erreur lors du marquage: {str(e)}")
+
+    async def _send_result_document(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        result: AdminAgentState,
+        caption: str,
+    ) -> None:
+        """Envoie le PDF produit par un agent et mémorise son file_id Telegram."""
+        if result.get("reused_document"):
+            caption += (
+                "\n\n♻️ Demande identique à un document émis il y a quelques minutes : "
+                "ce document est renvoyé, aucun nouveau numéro n'a été attribué."
+            )
+        known_file_id = result.get("telegram_file_id")
+        file_id = await send_document_with_preview(
+            update, context, result["pdf_path"], caption, file_id=known_file_id
+        )
+
+        if file_id and file_id != known_file_id and result.get("content_hash"):
+            await self.store.remember_telegram_file_id(
+                result["content_hash"], file_id, result.get("db_record_id")
+            )
+
+    def _start_early_validation(
+        self, context: ContextTypes.DEFAULT_TYPE, user_id: int, intent: str, data: dict
+    ) -> None:
+        """
+        Lance la validation pendant que le LLM termine sa réponse.
+
+        Avec les brouillons, c'est l'aperçu (sans numéro) qui est préparé ;
+        sinon la validation complète, numéro compris.
+        """
+        state = self._initial_state(user_id, intent, data)
+        lease = self._take_speculation(context, intent)
+        if lease is not None:
+            state["number_lease"] = lease
+        mode = "preview" if self.settings.draft_confirmation_enabled else "prepare"
+        run = self.agents.preview if mode == "preview" else self.agents.prepare
+        context.user_data["early_validation"] = (mode, intent, data, asyncio.create_task(run(state)))
+
+    def _take_speculation(self, context: ContextTypes.DEFAULT_TYPE, intent: str) -> NumberLease | None:
+        """Numéro préchargé pendant l'appel LLM si l'intention devinée est confirmée (voir SpeculativePrefetcher)."""
+        task = context.user_data.pop("speculation", None)
+        if task is None:
+            return None
+        lease = self.prefetcher.take(task, intent)
+        report = prefetch_report()
+        logger.info(
+            f"🔮 Préchargement : taux de réussite {report['hit_rate']:.0%} "
+            f"({report['hits']}/{report['hits'] + report['misses']})"
+        )
+        return lease
+
+    @staticmethod
+    def _initial_state(user_id: int, request_type: str, input_data: dict) -> AdminAgentState:
+        return {
+            "user_id": user_id,
+            "request_type": request_type,
+            "input_data": input_data,
+            "validated_data": None,
+            "pdf_path": None,
+            "db_record_id": None,
+            "error": None,
+        }
+
+    async def _take_early_result(
+        self, context: ContextTypes.DEFAULT_TYPE, mode: str, state: AdminAgentState
+    ) -> AdminAgentState | None:
+        """
+        Résultat de la validation anticipée s'il correspond exactement à la requête.
+
+        La validation anticipée est abandonnée si son mode, le type ou les
+        données finales diffèrent de ceux reçus pendant le flux.
+        """
+        early = context.user_data.pop("early_validation", None)
+        if early is None:
+            return None
+        early_mode, intent, data, task = early
+        if early_mode != mode or intent != state["request_type"] or data != state["input_data"]:
+            task.cancel()
+            return None
+        metrics.increment(f"orchestrator.early_{mode}_used")
+        return await task
+
+    async def _take_prepared_state(
+        self, context: ContextTypes.DEFAULT_TYPE, state: AdminAgentState
+    ) -> AdminAgentState:
+        """État validé à l'avance (voir _take_early_result), ou state s'il est inutilisable."""
+        lease = context.user_data.pop("number_lease", None)
+        prepared = await self._take_early_result(context, "prepare", state)
+        if prepared is None or prepared.get("error") or not prepared.get("validated_data"):
+            if lease is not None and lease.request_type == state["request_type"]:
+                state["number_lease"] = lease
+            return state
+        return prepared
+
+    async def _propose_draft(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, draft: PendingDraft
+    ) -> None:
+        """
+        Affiche l'aperçu d'un document avec les boutons Confirmer / Modifier.
+
+        L'aperçu (validation et totaux) ne consomme ni numéro ni écriture en
+        base : le document n'est numéroté, rendu et enregistré qu'après
+        confirmation.
+        """
+        user_id = update.effective_user.id
+        state = self._initial_state(user_id, draft.intent, draft.data)
+        preview = await self._take_early_result(context, "preview", state) or await self.agents.preview(state)
+
+        if preview.get("error"):
+            msg = f"{format_error_message(preview['error'])}\n\nPrécisez ou corrigez votre demande."
+            await self.db.add_chat_message(user_id, "assistant", msg)
+            await update.effective_message.reply_text(msg, parse_mode="Markdown")
+            return
+
+        context.user_data["pending_draft"] = draft
+        summary = format_draft_summary(draft.intent, draft.data, totals=preview.get("summary"))
+        await self.db.add_chat_message(user_id, "assistant", summary)
+        await update.effective_message.reply_text(
+            summary, parse_mode="HTML", reply_markup=build_draft_keyboard(draft.id)
+        )
+
+    async def _confirm_draft(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, draft_id: str
+    ) -> None:
+        """Génère le document du brouillon en attente, sans appel LLM."""
+        draft: PendingDraft | None = context.user_data.get("pending_draft")
+        if draft is None or draft.id != draft_id or draft.expired(self.settings.draft_ttl_s):
+            context.user_data.pop("pending_draft", None)
+            await update.effective_message.reply_text(
+                "⌛ Ce brouillon n'est plus disponible. Renvoyez votre demande."
+            )
+            return
+
+        context.user_data.pop("pending_draft")
+        metrics.increment("drafts.confirmed")
+        logger.info(f"✅ Brouillon {draft.id} confirmé ({draft.intent}), génération sans LLM")
+        await self.db.add_chat_message(update.effective_user.id, "assistant", f"Brouillon {draft.intent} confirmé.")
+        context.user_data["pre_extracted_data"] = draft.data
+        await self.document_commands[draft.intent](update, context)
+
+    async def handle_draft_callback(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """Gère les boutons Confirmer / Modifier d'un brouillon."""
+        query = update.callback_query
+        await query.answer()
+        if not validate_user_access(update.effective_user.id, self.settings.telegram_admin_users):
+            return
+
+        parsed = parse_draft_callback(query.data)
+        if parsed is None:
+            return
+        action, draft_id = parsed
+
+        # Les boutons ne servent qu'une fois
+        try:
+            await query.edit_message_reply_markup(reply_markup=None)
+        except Exception as e:
+            logger.debug(f"Clavier déjà retiré: {e}")
+
+        if action == "confirm":
+            await self._confirm_draft(update, context, draft_id)
+        elif action == "edit":
+            msg = "✏️ Que faut-il modifier ? (montant, client, date...)"
+            await self.db.add_chat_message(update.effective_user.id, "assistant", msg)
+            await update.effective_message.reply_text(msg)
+
     async def handle_natural_language(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -633,13 +946,64 @@ SIRET: {self.settings.company_siret}
         # 1. Sauvegarder le message utilisateur
         await self.db.add_chat_message(user_id, "user", text)
 
-        # Analyser l'intention avec l'IA
-        analysis = await self.orchestrator.analyze_message(text, user_id)
+        # Confirmation textuelle d'un brouillon en attente : aucun appel LLM
+        if context.user_data.get("pending_draft") and is_draft_confirmation(text):
+            await self._confirm_draft(update, context, context.user_data["pending_draft"].id)
+            return
+
+        # Raccourci local : intentions évidentes traitées sans appel LLM
+        if self.settings.intent_fast_path_enabled:
+            prediction = self.intent_classifier.predict(text)
+            record_fast_path(prediction)
+            if prediction.fast_path:
+                report = fast_path_report()
+                logger.info(
+                    f"⚡ Raccourci {prediction.label} ({prediction.confidence:.2f}, "
+                    f"{prediction.elapsed_ms:.1f} ms) - taux {report['hit_rate']:.0%}, "
+                    f"{report['latency_saved_ms'] / 1000:.1f} s économisées"
+                )
+                if prediction.label == "stats":
+                    reply = await self._reply_stats(update)
+                else:
+                    reply = CANNED_REPLIES[prediction.label]
+                    await update.effective_message.reply_text(reply, parse_mode="HTML")
+                await self.db.add_chat_message(user_id, "assistant", reply)
+                return
+
+        # Analyser l'intention avec l'IA (réponses "chat" affichées en flux)
+        stream = None
+        if self.settings.telegram_streaming_enabled:
+            stream = TelegramStreamWriter(update.message, self.settings.telegram_stream_edit_interval_s)
+        started = time.perf_counter()
+        stale = context.user_data.pop("early_validation", None)
+        if stale:
+            stale[-1].cancel()
+        stale = context.user_data.pop("speculation", None)
+        if stale:
+            stale.cancel()
+        context.user_data.pop("number_lease", None)
+        if self.settings.speculative_prefetch_enabled:
+            context.user_data["speculation"] = self.prefetcher.start(
+                text, lease_number=not self.settings.draft_confirmation_enabled
+            )
+        on_intent_ready = None
+        if self.settings.orchestrator_early_validation:
+            on_intent_ready = partial(self._start_early_validation, context, user_id)
+        analysis = await self.orchestrator.analyze_message(
+            text,
+            user_id,
+            on_reply_progress=stream.push if stream else None,
+            on_intent_ready=on_intent_ready,
+        )
+        metrics.observe("orchestrator.analyze_ms", (time.perf_counter() - started) * 1000)
         intent = analysis["intent"]
         data = analysis["extracted_data"]
         confidence = analysis["confidence"]
 
         logger.info(f"Intention: {intent} ({confidence:.2f})")
+        lease = self._take_speculation(context, intent)
+        if lease is not None:
+            context.user_data["number_lease"] = lease
 
         # Router vers la bonne commande
         if intent == "chat":
@@ -649,35 +1013,27 @@ SIRET: {self.settings.company_siret}
             
             # 2. Sauvegarder la réponse assistant
             await self.db.add_chat_message(user_id, "assistant", reply)
-            await update.message.reply_text(reply, parse_mode="HTML")
+            if stream:
+                await stream.finalize(reply)
+                metrics.observe("telegram.first_visible_ms", (stream.first_visible_at - started) * 1000)
+            else:
+                await update.effective_message.reply_text(reply, parse_mode="HTML")
             
-        elif intent == "invoice":
-            context.user_data["pre_extracted_data"] = data
-            await self.cmd_invoice(update, context)
-            
-        elif intent == "quote":
-            context.user_data["pre_extracted_data"] = data
-            await self.cmd_quote(update, context)
-            
-        elif intent == "mileage":
-            context.user_data["pre_extracted_data"] = data
-            await self.cmd_mileage(update, context)
-            
-        elif intent == "rent_receipt":
-            context.user_data["pre_extracted_data"] = data
-            await self.cmd_rent_receipt(update, context)
-            
-        elif intent == "rental_charges":
-            context.user_data["pre_extracted_data"] = data
-            await self.cmd_rental_charges(update, context)
+        elif intent in self.document_commands:
+            if self.settings.draft_confirmation_enabled:
+                await self._propose_draft(update, context, PendingDraft(intent, data))
+            else:
+                context.user_data["pre_extracted_data"] = data
+                await self.document_commands[intent](update, context)
             
         elif intent == "stats":
-            await self.cmd_stats(update, context)
+            reply = await self._reply_stats(update)
+            await self.db.add_chat_message(user_id, "assistant", reply)
             
         else:
             msg = "Je n'ai pas bien compris votre demande. Pouvez-vous reformuler ?"
             await self.db.add_chat_message(user_id, "assistant", msg)
-            await update.message.reply_text(msg)
+            await update.effective_message.reply_text(msg)
 
     def run(self) -> None:
         """Lance le bot en mode polling."""
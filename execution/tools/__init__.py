@@ -7,6 +7,8 @@ from execution.tools.whisper_transcription_tool import WhisperTranscriptionTool
 from execution.tools.markdown_cleaner_tool import MarkdownCleanerTool
 from execution.tools.db_manager import DatabaseManager
 from execution.tools.pdf_generator import PDFGenerator
+from execution.tools.document_store import DocumentStore
+from execution.tools.pdf_storage import PDFStorageManager
 from execution.tools import telegram_helpers
 
 __all__ = [
@@ -17,5 +19,7 @@ __all__ = [
     "MarkdownCleanerTool",
     "DatabaseManager",
     "PDFGenerator",
+    "DocumentStore",
+    "PDFStorageManager",
     "telegram_helpers",
 ]
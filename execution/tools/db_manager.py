@@ -1,18 +1,73 @@
 """Gestionnaire de base de données PostgreSQL."""
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select, func, desc
-from execution.models.database import Base, Document, DocumentType, ChatHistory
+from sqlalchemy import inspect, select, func, desc, text, update
+from execution.models.database import Base, Document, DocumentType, ChatHistory, DocumentContent, LLMUsage
 from execution.core.config import get_settings
+from dataclasses import dataclass
 from typing import Optional
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Colonnes ajoutées à des tables existantes : create_all ne modifie jamais une table déjà créée
+ADDED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "documents": ("content_hash", "paid_at"),
+    "llm_usage": ("cached_tokens",),
+}
+
+
+def add_missing_columns(sync_conn) -> list[str]:
+    """
+    Ajoute les colonnes de ADDED_COLUMNS absentes d'une base existante (idempotent).
+
+    Le type et l'index viennent du modèle SQLAlchemy ; les colonnes ajoutées
+    sont nullables, les lignes existantes restent valides.
+
+    Returns:
+        Colonnes ajoutées ("table.colonne")
+    """
+    inspector = inspect(sync_conn)
+    added = []
+    for table_name, column_names in ADDED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in column_names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+            if column.index:
+                sync_conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{name} ON {table_name} ({name})"))
+            added.append(f"{table_name}.{name}")
+    return added
+
+
+@dataclass(frozen=True)
+class NumberLease:
+    """
+    Prochain numéro d'un type de document, lu à l'avance (préchargement).
+
+    Les numéros ne sont pas réservés : le bail n'est valable que si aucun
+    document n'a été enregistré depuis sa lecture (voir document_writes).
+    """
+
+    request_type: str
+    year: int
+    number: str
+    writes: int
+
 
 class DatabaseManager:
     """Gestionnaire centralisé pour les opérations de base de données."""
 
+    # Documents enregistrés par ce processus (validité des NumberLease)
+    document_writes: int = 0
+
     def __init__(self):
         """Initialise le gestionnaire avec la configuration."""
         settings = get_settings()
@@ -39,10 +94,13 @@ class DatabaseManager:
         )
 
     async def init_db(self) -> None:
-        """Crée toutes les tables si elles n'existent pas."""
+        """Crée les tables absentes et ajoute aux tables existantes les colonnes récentes (ADDED_COLUMNS)."""
         try:
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                added = await conn.run_sync(add_missing_columns)
+            if added:
+                logger.info(f"🔧 Colonnes ajoutées: {', '.join(added)}")
             logger.info("✅ Tables de base de données initialisées")
         except Exception as e:
             logger.error(f"❌ Erreur lors de l'initialisation de la base: {e}")
@@ -62,6 +120,7 @@ class DatabaseManager:
         pdf_path: Optional[str],
         user_id: int,
         telegram_file_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> Document:
         """
         Enregistre un nouveau document en base.
@@ -73,15 +132,29 @@ class DatabaseManager:
             pdf_path: Chemin vers le PDF généré
             user_id: ID Telegram de l'utilisateur
             telegram_file_id: ID du fichier sur Telegram (optionnel)
+            content_hash: Empreinte du contenu rendu (optionnel)
 
         Returns:
-            Document: L'objet Document créé
+            Document: L'objet Document créé (ou existant si le même contenu
+            a déjà été enregistré sous ce numéro)
 
         Raises:
             Exception: Si une erreur se produit lors de la sauvegarde
         """
         try:
             async with self.async_session_maker() as session:
+                if content_hash:
+                    # Nouvel essai d'un document déjà enregistré : on le réutilise
+                    result = await session.execute(
+                        select(Document)
+                        .where(Document.document_number == doc_number)
+                        .where(Document.content_hash == content_hash)
+                    )
+                    existing = result.scalar_one_or_none()
+                    if existing is not None:
+                        logger.info(f"♻️ Document déjà enregistré: #{doc_number} (ID: {existing.id})")
+                        return existing
+
                 document = Document(
                     document_type=doc_type,
                     document_number=doc_number,
@@ -89,10 +162,12 @@ class DatabaseManager:
                     pdf_path=pdf_path,
                     user_id=user_id,
                     telegram_file_id=telegram_file_id,
+                    content_hash=content_hash,
                 )
 
                 session.add(document)
                 await session.commit()
+                self.document_writes += 1
                 await session.refresh(document)
 
                 logger.info(
@@ -105,14 +180,127 @@ class DatabaseManager:
             logger.error(f"❌ Erreur lors de la sauvegarde du document: {e}")
             raise
 
-    async def get_document_by_number(self, doc_number: str) -> Optional[Document]:
-        """Récupère un document par son numéro."""
+    async def get_document_by_number(
+        self, doc_number: str, user_id: Optional[int] = None
+    ) -> Optional[Document]:
+        """Récupère un document par son numéro (limité aux documents de user_id si fourni)."""
         async with self.async_session_maker() as session:
-            result = await session.execute(
-                select(Document).where(Document.document_number == doc_number)
+            query = select(Document).where(Document.document_number == doc_number)
+            if user_id is not None:
+                query = query.where(Document.user_id == user_id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    async def get_document_by_content_hash(
+        self, content_hash: str, user_id: int, since: Optional[datetime] = None
+    ) -> Optional[Document]:
+        """
+        Dernier document non payé d'un utilisateur enregistré sous une empreinte
+        de contenu (créé après since si fourni).
+        """
+        async with self.async_session_maker() as session:
+            query = (
+                select(Document)
+                .where(Document.content_hash == content_hash)
+                .where(Document.user_id == user_id)
+                .where(Document.paid_at.is_(None))
             )
+            if since is not None:
+                query = query.where(Document.created_at >= since)
+            result = await session.execute(query.order_by(Document.id.desc()).limit(1))
             return result.scalar_one_or_none()
 
+    async def get_document_content(self, content_hash: str) -> Optional[DocumentContent]:
+        """Récupère l'entrée d'index d'un PDF stocké par son empreinte."""
+        async with self.async_session_maker() as session:
+            return await session.get(DocumentContent, content_hash)
+
+    async def save_document_content(
+        self,
+        content_hash: str,
+        doc_type: DocumentType,
+        template_version: str,
+        pdf_path: str,
+        size_bytes: Optional[int] = None,
+    ) -> DocumentContent:
+        """
+        Enregistre (ou remplace) l'entrée d'index d'un PDF stocké.
+
+        Un nouveau rendu invalide le telegram_file_id précédent, le fichier
+        envoyé n'étant plus le même.
+        """
+        async with self.async_session_maker() as session:
+            entry = await session.merge(
+                DocumentContent(
+                    content_hash=content_hash,
+                    document_type=doc_type,
+                    template_version=template_version,
+                    pdf_path=pdf_path,
+                    size_bytes=size_bytes,
+                    telegram_file_id=None,
+                )
+            )
+            await session.commit()
+            return entry
+
+    async def set_telegram_file_id(
+        self,
+        content_hash: str,
+        telegram_file_id: str,
+        document_id: Optional[int] = None,
+    ) -> None:
+        """Mémorise le file_id Telegram d'un PDF stocké (et du document associé)."""
+        async with self.async_session_maker() as session:
+            await session.execute(
+                update(DocumentContent)
+                .where(DocumentContent.content_hash == content_hash)
+                .values(telegram_file_id=telegram_file_id)
+            )
+            if document_id is not None:
+                await session.execute(
+                    update(Document)
+                    .where(Document.id == document_id)
+                    .values(telegram_file_id=telegram_file_id)
+                )
+            await session.commit()
+
+    async def update_document_pdf_path(self, document_id: int, pdf_path: str) -> None:
+        """Met à jour le chemin du PDF d'un document (après re-rendu)."""
+        async with self.async_session_maker() as session:
+            await session.execute(
+                update(Document).where(Document.id == document_id).values(pdf_path=pdf_path)
+            )
+            await session.commit()
+
+    async def mark_document_paid(
+        self,
+        document_id: int,
+        paid_at: datetime,
+        pdf_path: str,
+    ) -> None:
+        """
+        Marque un document comme payé et pointe vers son PDF tamponné.
+
+        Le telegram_file_id est réinitialisé : le fichier à renvoyer a changé.
+        """
+        async with self.async_session_maker() as session:
+            await session.execute(
+                update(Document)
+                .where(Document.id == document_id)
+                .values(paid_at=paid_at, pdf_path=pdf_path, telegram_file_id=None)
+            )
+            await session.commit()
+
+    async def set_document_telegram_file_id(self, document_id: int, telegram_file_id: str) -> None:
+        """Mémorise le file_id Telegram d'un document dont le PDF n'est pas indexé par empreinte."""
+        async with self.async_session_maker() as session:
+            await session.execute(
+                update(Document)
+                .where(Document.id == document_id)
+                .values(telegram_file_id=telegram_file_id)
+            )
+            await session.commit()
+
     async def get_documents_by_user(
         self,
         user_id: int,
@@ -174,6 +362,27 @@ class DatabaseManager:
 
             return f"{year}-{seq:04d}"
 
+    async def lease_next_number(self, request_type: str, year: int) -> NumberLease:
+        """
+        Lit à l'avance le prochain numéro d'un type de document, sans le réserver.
+
+        Args:
+            request_type: Type de requête (invoice, quote, mileage, rent_receipt, rental_charges)
+            year: Année du numéro
+
+        Raises:
+            KeyError: Si le type de requête n'est pas numéroté
+        """
+        allocate = {
+            "invoice": self.get_next_invoice_number,
+            "quote": self.get_next_quote_number,
+            "mileage": self.get_next_mileage_number,
+            "rent_receipt": self.get_next_rent_receipt_number,
+            "rental_charges": self.get_next_rental_charges_number,
+        }[request_type]
+        writes = self.document_writes  # Avant la lecture : un enregistrement concurrent invalide le bail
+        return NumberLease(request_type, year, await allocate(year), writes)
+
     async def get_next_quote_number(self, year: int) -> str:
         """
         Génère le prochain numéro de devis pour l'année donnée.
@@ -305,6 +514,38 @@ class DatabaseManager:
                 for msg in reversed(messages)
             ]
 
+    async def get_user_messages(self, limit: int = 2000) -> list[str]:
+        """Derniers messages utilisateur, tous utilisateurs confondus (entraînement du classifieur)."""
+        async with self.async_session_maker() as session:
+            result = await session.execute(
+                select(ChatHistory.content)
+                .where(ChatHistory.role == "user")
+                .order_by(desc(ChatHistory.created_at))
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def save_llm_usage(self, **fields) -> None:
+        """Enregistre la consommation LLM d'un tour (voir TurnUsage.as_record)."""
+        try:
+            async with self.async_session_maker() as session:
+                session.add(LLMUsage(**fields))
+                await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Erreur sauvegarde usage LLM: {e}")
+
+    async def get_llm_usage(self, since: datetime) -> list[dict]:
+        """Lignes llm_usage depuis une date (rapport /usage)."""
+        columns = (
+            LLMUsage.created_at, LLMUsage.intent, LLMUsage.llm_calls, LLMUsage.prompt_tokens,
+            LLMUsage.completion_tokens, LLMUsage.cached_tokens, LLMUsage.total_ms, LLMUsage.llm_ms, LLMUsage.tool_ms,
+        )
+        async with self.async_session_maker() as session:
+            result = await session.execute(
+                select(*columns).where(LLMUsage.created_at >= since).order_by(LLMUsage.created_at)
+            )
+            return [dict(row._mapping) for row in result.all()]
+
     async def get_document_count_by_type(self, user_id: int) -> dict[str, int]:
         """Retourne le nombre de documents par type pour un utilisateur."""
         async with self.async_session_maker() as session:
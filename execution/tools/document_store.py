@@ -0,0 +1,149 @@
+"""Stockage adressé par contenu des PDFs générés."""
+
+import hashlib
+import json
+import logging
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from execution.models.database import DocumentType
+from execution.tools.db_manager import DatabaseManager
+from execution.tools.pdf_generator import TEMPLATE_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Numéros attribués par l'application (hors empreinte : une même demande garde la même empreinte)
+ASSIGNED_NUMBER_FIELDS = ("invoice_number", "quote_number", "receipt_number", "document_number")
+
+
+def compute_content_hash(
+    doc_type: DocumentType,
+    validated_data: dict[str, Any],
+    template_version: str = TEMPLATE_VERSION,
+) -> str:
+    """
+    Calcule l'empreinte canonique d'un document.
+
+    Le JSON est sérialisé avec des clés triées et sans espaces, de sorte que
+    deux validated_data identiques (quel que soit l'ordre des clés) donnent
+    la même empreinte. Le numéro attribué par l'application n'en fait pas
+    partie : deux demandes identiques ont la même empreinte bien qu'un
+    nouveau numéro ait été lu pour chacune. Les dates restent incluses : une
+    date par défaut (aujourd'hui) ne change l'empreinte que d'un jour à
+    l'autre, où la demande donne bien un nouveau document.
+
+    Args:
+        doc_type: Type de document
+        validated_data: Données validées (dict JSON du modèle Pydantic)
+        template_version: Version de la mise en page du PDF
+
+    Returns:
+        Empreinte SHA-256 hexadécimale
+    """
+    payload = json.dumps(
+        {
+            "type": doc_type.value,
+            "template": template_version,
+            "data": {k: v for k, v in validated_data.items() if k not in ASSIGNED_NUMBER_FIELDS},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StoredDocument:
+    """PDF déjà rendu, retrouvé par son empreinte."""
+
+    content_hash: str
+    pdf_path: Path
+    telegram_file_id: str | None = None
+
+    def read_bytes(self) -> bytes:
+        """Retourne le contenu binaire du PDF stocké."""
+        return self.pdf_path.read_bytes()
+
+
+class DocumentStore:
+    """
+    Index des PDFs rendus, clé = empreinte de validated_data + version de gabarit.
+
+    Une demande de rendu identique (nouvel essai, renvoi) réutilise le fichier
+    existant et le file_id Telegram déjà capturé au lieu de re-rendre le PDF.
+    """
+
+    def __init__(self, db: DatabaseManager, template_version: str = TEMPLATE_VERSION):
+        """
+        Initialise le store.
+
+        Args:
+            db: Gestionnaire de base de données (table document_contents)
+            template_version: Version de la mise en page du PDF generator
+        """
+        self.db = db
+        self.template_version = template_version
+
+    def content_hash(self, doc_type: DocumentType, validated_data: dict[str, Any]) -> str:
+        """Calcule l'empreinte d'un document pour la version de gabarit courante."""
+        return compute_content_hash(doc_type, validated_data, self.template_version)
+
+    async def get(self, content_hash: str) -> StoredDocument | None:
+        """
+        Retrouve un PDF stocké.
+
+        Returns:
+            Le document stocké, ou None si l'empreinte est inconnue ou si le
+            fichier n'existe plus sur le disque
+        """
+        entry = await self.db.get_document_content(content_hash)
+        if entry is None:
+            return None
+
+        pdf_path = Path(entry.pdf_path)
+        if not pdf_path.is_file():
+            logger.info(f"PDF indexé mais absent du disque: {pdf_path}")
+            return None
+
+        # Dernier accès = date de modification (éviction LRU, voir PDFStorageManager)
+        with suppress(OSError):
+            pdf_path.touch()
+
+        return StoredDocument(
+            content_hash=content_hash,
+            pdf_path=pdf_path,
+            telegram_file_id=entry.telegram_file_id,
+        )
+
+    async def put(
+        self,
+        content_hash: str,
+        doc_type: DocumentType,
+        pdf_path: Path,
+    ) -> StoredDocument:
+        """Indexe un PDF fraîchement rendu sous son empreinte."""
+        pdf_path = Path(pdf_path)
+        await self.db.save_document_content(
+            content_hash=content_hash,
+            doc_type=doc_type,
+            template_version=self.template_version,
+            pdf_path=str(pdf_path),
+            size_bytes=pdf_path.stat().st_size,
+        )
+        return StoredDocument(content_hash=content_hash, pdf_path=pdf_path)
+
+    async def remember_telegram_file_id(
+        self,
+        content_hash: str,
+        telegram_file_id: str,
+        document_id: int | None = None,
+    ) -> None:
+        """Mémorise le file_id Telegram pour les renvois suivants."""
+        try:
+            await self.db.set_telegram_file_id(content_hash, telegram_file_id, document_id)
+        except Exception as e:
+            logger.warning(f"Impossible de mémoriser le file_id Telegram: {e}")
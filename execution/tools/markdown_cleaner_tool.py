@@ -7,6 +7,35 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def clean_for_telegram(text: str) -> str:
+    """Convert LLM Markdown output to the simple HTML Telegram accepts."""
+    # Escape HTML special characters first
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+    # Convert basic Markdown to HTML
+    # Bold: **bold** -> <b>bold</b>
+    text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
+    # Italic: *italic* -> <i>italic</i>
+    text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
+
+    # Support numbered lists from bullet points
+    lines = text.split('\n')
+    cleaned_lines = []
+    list_counter = 1
+
+    for line in lines:
+        if re.match(r'^\s*[\-\*]\s+', line):
+            stripped_line = re.sub(r'^\s*[\-\*]\s+', '', line)
+            cleaned_lines.append(f"{list_counter}. {stripped_line}")
+            list_counter += 1
+        else:
+            cleaned_lines.append(line)
+            if not line.strip():
+                list_counter = 1
+
+    return '\n'.join(cleaned_lines)
+
+
 class MarkdownCleanerTool(BaseTool):
     name: str = "markdown_cleaner"
     description: str = """
@@ -17,32 +46,7 @@ class MarkdownCleanerTool(BaseTool):
     def _run(self, text: str) -> Dict[str, str]:
         """Clean text and convert to simple HTML for Telegram display."""
         try:
-            # Escape HTML special characters first
-            text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            
-            # Convert basic Markdown to HTML
-            # Bold: **bold** -> <b>bold</b>
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-            # Italic: *italic* -> <i>italic</i>
-            text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
-            
-            # Support numbered lists from bullet points
-            lines = text.split('\n')
-            cleaned_lines = []
-            list_counter = 1
-
-            for line in lines:
-                if re.match(r'^\s*[\-\*]\s+', line):
-                    stripped_line = re.sub(r'^\s*[\-\*]\s+', '', line)
-                    cleaned_lines.append(f"{list_counter}. {stripped_line}")
-                    list_counter += 1
-                else:
-                    cleaned_lines.append(line)
-                    if not line.strip():
-                        list_counter = 1
-
-            cleaned_text = '\n'.join(cleaned_lines)
-            return {"cleaned_text": cleaned_text}
+            return {"cleaned_text": clean_for_telegram(text)}
 
         except Exception as e:
             logger.error(f"Markdown cleaner error: {e}")
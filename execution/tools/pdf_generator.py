@@ -4,29 +4,464 @@ from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm
 from reportlab.lib import colors
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import Table, TableStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from pathlib import Path
-from datetime import datetime
+from datetime import date
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Callable, Optional
 from decimal import Decimal
 from execution.models.documents import Invoice, Quote, MileageRecord, RentReceipt, RentalCharges
+from execution.models.database import DocumentType
+import hashlib
 import logging
+import os
+import tempfile
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Version de la mise en page des documents. À incrémenter à chaque modification
+# visible du rendu : elle entre dans l'empreinte des PDFs stockés (DocumentStore).
+TEMPLATE_VERSION = "4"
+
+# Colonnes des tableaux (abscisse, en-tête), redessinées en haut de chaque page de suite
+INVOICE_COLUMNS = ((2*cm, "Description"), (10*cm, "Qté"), (12*cm, "P.U. HT"), (14.5*cm, "Total HT"), (17.5*cm, "TVA"))
+QUOTE_COLUMNS = INVOICE_COLUMNS[:4]
+MILEAGE_COLUMNS = (
+    (2*cm, "Date"), (4*cm, "Trajet"), (11*cm, "Distance"),
+    (13.5*cm, "Véhicule"), (15.5*cm, "Tarif/km"), (17.5*cm, "Montant"),
+)
+CHARGES_COLUMNS = ((2*cm, "Libellé"), (16*cm, "Montant"))
+
+# Droits des PDFs publiés : mkstemp crée ses fichiers en 0600, ce qui les
+# rendrait illisibles pour un autre utilisateur (serveur de fichiers, sauvegarde).
+PDF_FILE_MODE = 0o644
+
+
+@dataclass
+class RenderReport:
+    """Rapport de rendu d'un PDF (taille et temps), pour arbitrer taille/vitesse."""
+
+    document_type: str
+    pdf_path: Path
+    size_bytes: int
+    render_ms: float
+    page_compression: bool
+    fonts: tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class ImageAsset:
+    """Image décodée une fois par processus et réutilisée pour tous les rendus."""
+
+    reader: ImageReader
+    fingerprint: str
+
+
+@lru_cache(maxsize=16)
+def _load_image_asset(image_path: str) -> Optional[ImageAsset]:
+    """
+    Charge et décode une image (logo, signature) une seule fois par processus.
+
+    Les pixels décodés restent en cache dans l'ImageReader : les rendus
+    suivants ne relisent ni ne redécodent le fichier.
+
+    Returns:
+        L'image et l'empreinte de son contenu, ou None si le fichier est illisible
+    """
+    try:
+        raw = Path(image_path).read_bytes()
+        reader = ImageReader(image_path)
+        reader.getRGBData()  # Force le décodage maintenant (mis en cache par le reader)
+    except Exception as e:
+        logger.warning(f"Image ignorée ({image_path}): {e}")
+        return None
+    return ImageAsset(reader=reader, fingerprint=hashlib.sha256(raw).hexdigest()[:12])
+
+
+@lru_cache(maxsize=8192)
+def _string_width(text: str, font_name: str, font_size: float) -> float:
+    """Largeur d'un texte en points, mémoïsée par (texte, police, taille)."""
+    return pdfmetrics.stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=4096)
+def _wrap_text(text: str, font_name: str, font_size: float, max_width: float) -> tuple[str, ...]:
+    """
+    Découpe un texte en lignes tenant dans max_width (retour à la ligne par mots).
+
+    Les sauts de ligne explicites sont conservés ; un mot plus large que la
+    colonne est coupé au caractère. Le résultat est mémoïsé : les libellés
+    répétés d'un lot de documents ne sont mesurés qu'une fois.
+    """
+    lines: list[str] = []
+    for paragraph in text.splitlines() or [""]:
+        current = ""
+        for word in paragraph.split():
+            candidate = f"{current} {word}" if current else word
+            if _string_width(candidate, font_name, font_size) <= max_width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            # Mot trop long pour la colonne : coupe au caractère
+            while _string_width(word, font_name, font_size) > max_width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and _string_width(word[:cut], font_name, font_size) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            current = word
+        lines.append(current)
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def _register_ttf_font(font_path: str) -> str:
+    """
+    Enregistre une police TrueType une seule fois par processus.
+
+    ReportLab n'embarque que les glyphes réellement utilisés (sous-ensemble),
+    ce qui garde les PDFs légers même avec une police complète.
+
+    Returns:
+        Nom de la police à utiliser avec setFont()
+    """
+    font_name = Path(font_path).stem
+    pdfmetrics.registerFont(TTFont(font_name, font_path))
+    return font_name
+
 
 class PDFGenerator:
     """Générateur de documents PDF professionnels."""
 
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        page_compression: bool = True,
+        font_path: Optional[str] = None,
+        font_bold_path: Optional[str] = None,
+        font_italic_path: Optional[str] = None,
+        size_budget_kb: Optional[int] = None,
+        logo_path: Optional[str] = None,
+        signature_path: Optional[str] = None,
+    ):
         """
         Initialise le générateur.
 
+        Sans police configurée, les polices standard Helvetica sont utilisées :
+        elles ne sont pas embarquées et donnent les fichiers les plus légers.
+        Une police TrueType est embarquée en sous-ensemble (glyphes utilisés).
+
         Args:
             output_dir: Répertoire de sortie pour les PDFs
+            page_compression: Compresser le contenu des pages (Flate)
+            font_path: Police TrueType normale à embarquer (optionnel)
+            font_bold_path: Police TrueType grasse (défaut: font_path)
+            font_italic_path: Police TrueType italique (défaut: font_path)
+            size_budget_kb: Taille au-delà de laquelle un PDF est signalé (optionnel)
+            logo_path: Logo de l'entreprise, apposé sur chaque document (optionnel)
+            signature_path: Image de signature pour quittances et décomptes (optionnel)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.width, self.height = A4
+        self.page_compression = page_compression
+        self.size_budget_kb = size_budget_kb
+
+        if font_path:
+            self.font_regular = _register_ttf_font(font_path)
+            self.font_bold = _register_ttf_font(font_bold_path) if font_bold_path else self.font_regular
+            self.font_italic = _register_ttf_font(font_italic_path) if font_italic_path else self.font_regular
+        else:
+            self.font_regular = "Helvetica"
+            self.font_bold = "Helvetica-Bold"
+            self.font_italic = "Helvetica-Oblique"
+
+        self.logo = _load_image_asset(logo_path) if logo_path else None
+        self.signature = _load_image_asset(signature_path) if signature_path else None
+
+        # Polices et images changent le rendu : elles font partie de la version de gabarit
+        self.template_version = TEMPLATE_VERSION
+        if font_path:
+            self.template_version += f"+{self.font_regular}/{self.font_bold}/{self.font_italic}"
+        if self.logo:
+            self.template_version += f"+logo:{self.logo.fingerprint}"
+        if self.signature:
+            self.template_version += f"+sig:{self.signature.fingerprint}"
+
+    @classmethod
+    def from_settings(cls, settings) -> "PDFGenerator":
+        """Construit le générateur à partir de la configuration de l'application."""
+        return cls(
+            Path(settings.tmp_dir) / "documents",
+            page_compression=settings.pdf_page_compression,
+            font_path=settings.pdf_font_path,
+            font_bold_path=settings.pdf_font_bold_path,
+            font_italic_path=settings.pdf_font_italic_path,
+            size_budget_kb=settings.pdf_size_budget_kb,
+            logo_path=settings.company_logo_path or None,
+            signature_path=settings.company_signature_path or None,
+        )
+
+    def _output_path(self, filename: str, issued_on: date) -> Path:
+        """
+        Retourne le chemin de sortie d'un PDF, réparti par année/mois d'émission.
+
+        Ex: documents/2025/01/facture_2025-0001.pdf, pour éviter qu'un seul
+        répertoire accumule des dizaines de milliers de fichiers. La date vient
+        du document, pas de l'horloge : un re-rendu retombe au même endroit.
+        """
+        shard_dir = self.output_dir / f"{issued_on:%Y}" / f"{issued_on:%m}"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        return shard_dir / filename
+
+    @staticmethod
+    def _document_filename(prefix: str, document_number: str | None) -> str:
+        """
+        Construit un nom de fichier unique : <type>_<numéro>_<suffixe aléatoire>.pdf.
+
+        Le suffixe garantit que deux rendus simultanés (même numéro, même
+        seconde) n'écrivent jamais dans le même fichier.
+        """
+        number = (document_number or "sans-numero").replace("/", "-").replace(" ", "_")
+        return f"{prefix}_{number}_{uuid.uuid4().hex[:12]}.pdf"
+
+    def _render(
+        self,
+        prefix: str,
+        document_number: str | None,
+        issued_on: date,
+        draw: Callable[[canvas.Canvas], None],
+    ) -> RenderReport:
+        """
+        Rend un PDF et retourne son rapport de taille.
+
+        Le rapport est retourné plutôt que conservé sur l'instance : le
+        générateur est partagé par les agents et les rendus simultanés
+        (threads) écraseraient le rapport les uns des autres.
+
+        Args:
+            prefix: Type de document dans le nom de fichier (facture, devis...)
+            document_number: Numéro du document (nom de fichier)
+            issued_on: Date d'émission du document (répertoire de sortie)
+            draw: Fonction qui dessine le document sur le canvas
+
+        Returns:
+            Rapport de rendu (chemin, taille, durée)
+        """
+        filepath = self._output_path(self._document_filename(prefix, document_number), issued_on)
+
+        start = time.perf_counter()
+        self._render_atomic(filepath, draw)
+        render_ms = (time.perf_counter() - start) * 1000
+
+        report = RenderReport(
+            document_type=prefix,
+            pdf_path=filepath,
+            size_bytes=filepath.stat().st_size,
+            render_ms=render_ms,
+            page_compression=self.page_compression,
+            fonts=(self.font_regular, self.font_bold, self.font_italic),
+        )
+
+        size_kb = report.size_bytes / 1024
+        logger.info(f"📏 {filepath.name}: {size_kb:.1f} Ko en {render_ms:.1f} ms")
+        if self.size_budget_kb and size_kb > self.size_budget_kb:
+            logger.warning(
+                f"⚠️ {filepath.name} dépasse le budget de taille "
+                f"({size_kb:.1f} Ko > {self.size_budget_kb} Ko)"
+            )
+        return report
+
+    def _render_atomic(self, filepath: Path, draw: Callable[[canvas.Canvas], None]) -> None:
+        """
+        Dessine un PDF dans un fichier temporaire puis le publie avec os.replace.
+
+        Un lecteur concurrent voit soit l'ancien fichier, soit le PDF complet,
+        jamais un fichier partiellement écrit.
+        """
+        fd, tmp_name = tempfile.mkstemp(
+            dir=filepath.parent, prefix=f".{filepath.stem}-", suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            c = canvas.Canvas(tmp_name, pagesize=A4, pageCompression=int(self.page_compression))
+            self._draw_logo(c)
+            draw(c)
+            c.save()
+            os.chmod(tmp_name, PDF_FILE_MODE)
+            os.replace(tmp_name, filepath)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+
+    def _draw_logo(self, c: canvas.Canvas) -> None:
+        """Appose le logo de l'entreprise dans la marge haute, à droite (chaque page)."""
+        if not self.logo:
+            return
+        c.drawImage(
+            self.logo.reader,
+            15*cm, self.height - 1.5*cm,
+            width=4*cm, height=1*cm,
+            preserveAspectRatio=True, anchor="ne", mask="auto",
+        )
+
+    def _draw_signature(self, c: canvas.Canvas, x: float, y: float) -> None:
+        """Appose l'image de signature avec son coin inférieur gauche en (x, y)."""
+        if not self.signature:
+            return
+        c.drawImage(
+            self.signature.reader,
+            x, y,
+            width=4*cm, height=1.5*cm,
+            preserveAspectRatio=True, anchor="sw", mask="auto",
+        )
+
+    def _draw_wrapped(
+        self,
+        c: canvas.Canvas,
+        x: float,
+        y: float,
+        text: str,
+        max_width: float,
+        font_name: str,
+        font_size: float,
+        leading: Optional[float] = None,
+    ) -> float:
+        """
+        Dessine un texte sur plusieurs lignes dans une colonne de largeur max_width.
+
+        Returns:
+            Ordonnée de la dernière ligne dessinée
+        """
+        leading = leading or font_size * 1.2
+        c.setFont(font_name, font_size)
+        for index, line in enumerate(_wrap_text(text, font_name, font_size, max_width)):
+            if index:
+                y -= leading
+            c.drawString(x, y, line)
+        return y
+
+    @staticmethod
+    def _wrapped_height(
+        text: str,
+        max_width: float,
+        font_name: str,
+        font_size: float,
+        leading: Optional[float] = None,
+    ) -> float:
+        """Hauteur occupée par un texte dessiné avec _draw_wrapped (toutes ses lignes)."""
+        leading = leading or font_size * 1.2
+        return len(_wrap_text(text, font_name, font_size, max_width)) * leading
+
+    def _ensure_space(
+        self,
+        c: canvas.Canvas,
+        y: float,
+        needed: float,
+        font_name: str,
+        font_size: float,
+        on_new_page: Optional[Callable[[canvas.Canvas, float], float]] = None,
+    ) -> float:
+        """
+        Passe à une nouvelle page si la hauteur nécessaire dépasse la marge basse.
+
+        Seul point de saut de page des gabarits : la nouvelle page reçoit le logo,
+        comme la première (voir _render_atomic).
+
+        Args:
+            on_new_page: Dessine le haut de la page de suite (en-têtes d'un
+                tableau) à partir de l'ordonnée donnée et retourne la suivante
+
+        Returns:
+            Ordonnée à utiliser pour la suite du dessin
+        """
+        if y - needed >= 3*cm:
+            return y
+        c.showPage()
+        self._draw_logo(c)
+        y = self.height - 2*cm
+        if on_new_page:
+            y = on_new_page(c, y)
+        c.setFont(font_name, font_size)
+        return y
+
+    def _draw_table_header(
+        self,
+        c: canvas.Canvas,
+        y: float,
+        columns: tuple[tuple[float, str], ...],
+        font_size: float,
+    ) -> float:
+        """
+        Dessine les en-têtes de colonnes d'un tableau et leur filet.
+
+        Returns:
+            Ordonnée de la première ligne du tableau
+        """
+        c.setFont(self.font_bold, font_size)
+        for x, label in columns:
+            c.drawString(x, y, label)
+        y -= 0.3*cm
+        c.line(2*cm, y, 19*cm, y)
+        return y - 0.7*cm
+
+    def render_document(
+        self,
+        doc_type: DocumentType,
+        data: dict,
+        company_info: dict,
+        issued_on: Optional[date] = None,
+    ) -> RenderReport:
+        """
+        Rend un PDF à partir des données validées (Document.data).
+
+        Le rendu ne dépend que de data : toutes les dates imprimées en
+        viennent (data["issued_on"] pour les documents sans date propre),
+        un re-rendu est donc identique au PDF d'origine.
+
+        Args:
+            doc_type: Type de document
+            data: validated_data tel qu'enregistré en base
+            company_info: Informations de l'entreprise émettrice
+            issued_on: Date d'émission si data n'en contient pas (documents
+                enregistrés avant issued_on : date de création en base)
+
+        Returns:
+            Rapport de rendu (report.pdf_path : PDF généré)
+        """
+        if data.get("issued_on"):
+            issued_on = date.fromisoformat(data["issued_on"])
+        if doc_type == DocumentType.INVOICE:
+            return self._render_invoice(Invoice(**data), company_info)
+        if doc_type == DocumentType.QUOTE:
+            return self._render_quote(Quote(**data), company_info)
+        if doc_type == DocumentType.MILEAGE:
+            return self._render_mileage(
+                records=[MileageRecord(**rec) for rec in data["records"]],
+                company_info=company_info,
+                period_label=f"Note de Frais #{data['document_number']}",
+                document_number=data["document_number"],
+                issued_on=issued_on,
+            )
+        if doc_type == DocumentType.RENT_RECEIPT:
+            return self._render_rent_receipt(RentReceipt(**data), company_info, issued_on=issued_on)
+        if doc_type == DocumentType.RENTAL_CHARGES:
+            return self._render_rental_charges(
+                RentalCharges(**data),
+                company_info,
+                document_number=data.get("document_number"),
+                issued_on=issued_on,
+            )
+        raise ValueError(f"Type de document non supporté: {doc_type}")
 
     def generate_invoice_pdf(self, invoice: Invoice, company_info: dict) -> Path:
         """
@@ -39,18 +474,27 @@ class PDFGenerator:
         Returns:
             Path vers le PDF généré
         """
-        filename = f"facture_{invoice.invoice_number.replace('/', '-')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        filepath = self.output_dir / filename
-
-        c = canvas.Canvas(str(filepath), pagesize=A4)
-
+        return self._render_invoice(invoice, company_info).pdf_path
+
+    def _render_invoice(self, invoice: Invoice, company_info: dict) -> RenderReport:
+        report = self._render(
+            "facture",
+            invoice.invoice_number,
+            invoice.invoice_date,
+            lambda c: self._draw_invoice(c, invoice, company_info),
+        )
+        logger.info(f"✅ Facture PDF générée: {report.pdf_path}")
+        return report
+
+    def _draw_invoice(self, c: canvas.Canvas, invoice: Invoice, company_info: dict) -> None:
+        """Dessine la facture sur le canvas."""
         # En-tête entreprise
         y = self.height - 2*cm
-        c.setFont("Helvetica-Bold", 16)
+        c.setFont(self.font_bold, 16)
         c.drawString(2*cm, y, company_info["name"])
 
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, company_info["address"])
 
         y -= 0.5*cm
@@ -61,19 +505,19 @@ class PDFGenerator:
 
         # Titre FACTURE
         y -= 2*cm
-        c.setFont("Helvetica-Bold", 24)
+        c.setFont(self.font_bold, 24)
         c.drawString(2*cm, y, "FACTURE")
 
-        c.setFont("Helvetica-Bold", 12)
+        c.setFont(self.font_bold, 12)
         c.drawString(2*cm, y - 0.7*cm, f"N° {invoice.invoice_number}")
 
         # Informations client (à droite)
         y_client = self.height - 2*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(12*cm, y_client, "Client:")
 
         y_client -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(12*cm, y_client, invoice.client_name)
 
         y_client -= 0.5*cm
@@ -88,7 +532,7 @@ class PDFGenerator:
 
         # Dates
         y -= 2*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, f"Date d'émission: {invoice.invoice_date.strftime('%d/%m/%Y')}")
 
         y -= 0.6*cm
@@ -97,40 +541,32 @@ class PDFGenerator:
         # Tableau des items
         y -= 1.5*cm
 
-        # En-têtes du tableau
-        c.setFont("Helvetica-Bold", 10)
-        headers_y = y
-        c.drawString(2*cm, headers_y, "Description")
-        c.drawString(10*cm, headers_y, "Qté")
-        c.drawString(12*cm, headers_y, "P.U. HT")
-        c.drawString(14.5*cm, headers_y, "Total HT")
-        c.drawString(17.5*cm, headers_y, "TVA")
-
-        # Ligne de séparation
-        y -= 0.3*cm
-        c.line(2*cm, y, 19*cm, y)
+        # En-têtes du tableau et ligne de séparation (repris sur chaque page de suite)
+        header = partial(self._draw_table_header, columns=INVOICE_COLUMNS, font_size=10)
+        y = header(c, y)
 
         # Items
-        y -= 0.7*cm
-        c.setFont("Helvetica", 9)
+        c.setFont(self.font_regular, 9)
 
         for item in invoice.items:
-            # Description (tronquer si trop long)
-            desc = item.description[:50]
-            c.drawString(2*cm, y, desc)
+            needed = self._wrapped_height(item.description, 7.8*cm, self.font_regular, 9) + 0.6*cm
+            y = self._ensure_space(c, y, needed, self.font_regular, 9, header)
             c.drawString(10*cm, y, str(item.quantity))
             c.drawString(12*cm, y, f"{float(item.unit_price):.2f} €")
             c.drawString(14.5*cm, y, f"{float(item.total_ht):.2f} €")
             c.drawString(17.5*cm, y, f"{float(item.vat_rate*100):.0f}%")
+            # Description sur plusieurs lignes si nécessaire
+            y = self._draw_wrapped(c, 2*cm, y, item.description, 7.8*cm, self.font_regular, 9)
             y -= 0.6*cm
 
         # Ligne de séparation avant totaux
+        y = self._ensure_space(c, y, 7*cm, self.font_regular, 9)
         y -= 0.5*cm
         c.line(12*cm, y, 19*cm, y)
 
         # Totaux
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(13*cm, y, "Total HT:")
         c.drawString(17*cm, y, f"{float(invoice.total_ht):.2f} €")
 
@@ -139,13 +575,13 @@ class PDFGenerator:
         c.drawString(17*cm, y, f"{float(invoice.total_vat):.2f} €")
 
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 13)
+        c.setFont(self.font_bold, 13)
         c.drawString(13*cm, y, "Total TTC:")
         c.drawString(17*cm, y, f"{float(invoice.total_ttc):.2f} €")
 
         # Conditions de paiement
         y -= 2*cm
-        c.setFont("Helvetica", 9)
+        c.setFont(self.font_regular, 9)
         c.drawString(2*cm, y, f"Conditions de paiement: {invoice.payment_conditions}")
 
         # Notes additionnelles
@@ -153,7 +589,7 @@ class PDFGenerator:
             y -= 1*cm
             c.drawString(2*cm, y, "Notes:")
             y -= 0.5*cm
-            c.setFont("Helvetica", 8)
+            c.setFont(self.font_regular, 8)
             # Gérer les notes multi-lignes
             notes_lines = invoice.notes.split("\n")
             for line in notes_lines[:3]:  # Limiter à 3 lignes
@@ -161,28 +597,30 @@ class PDFGenerator:
                 y -= 0.4*cm
 
         # Pied de page
-        c.setFont("Helvetica", 7)
+        c.setFont(self.font_regular, 7)
         c.drawCentredString(self.width / 2, 2*cm, company_info["name"])
         c.drawCentredString(self.width / 2, 1.6*cm, f"SIRET: {company_info['siret']} - TVA: {company_info['tva']}")
 
-        c.save()
-        logger.info(f"✅ Facture PDF générée: {filepath}")
-        return filepath
-
     def generate_quote_pdf(self, quote: Quote, company_info: dict) -> Path:
         """Génère un PDF de devis (similaire à la facture)."""
-        filename = f"devis_{quote.quote_number.replace('/', '-')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        filepath = self.output_dir / filename
+        return self._render_quote(quote, company_info).pdf_path
 
-        c = canvas.Canvas(str(filepath), pagesize=A4)
+    def _render_quote(self, quote: Quote, company_info: dict) -> RenderReport:
+        report = self._render(
+            "devis", quote.quote_number, quote.quote_date, lambda c: self._draw_quote(c, quote, company_info)
+        )
+        logger.info(f"✅ Devis PDF généré: {report.pdf_path}")
+        return report
 
+    def _draw_quote(self, c: canvas.Canvas, quote: Quote, company_info: dict) -> None:
+        """Dessine le devis sur le canvas."""
         # En-tête (identique à facture)
         y = self.height - 2*cm
-        c.setFont("Helvetica-Bold", 16)
+        c.setFont(self.font_bold, 16)
         c.drawString(2*cm, y, company_info["name"])
 
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, company_info["address"])
 
         y -= 0.5*cm
@@ -190,19 +628,19 @@ class PDFGenerator:
 
         # Titre DEVIS
         y -= 2*cm
-        c.setFont("Helvetica-Bold", 24)
+        c.setFont(self.font_bold, 24)
         c.drawString(2*cm, y, "DEVIS")
 
-        c.setFont("Helvetica-Bold", 12)
+        c.setFont(self.font_bold, 12)
         c.drawString(2*cm, y - 0.7*cm, f"N° {quote.quote_number}")
 
         # Client
         y_client = self.height - 2*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(12*cm, y_client, "Client:")
 
         y_client -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(12*cm, y_client, quote.client_name)
 
         y_client -= 0.5*cm
@@ -213,7 +651,7 @@ class PDFGenerator:
 
         # Dates
         y -= 2*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, f"Date: {quote.quote_date.strftime('%d/%m/%Y')}")
 
         y -= 0.6*cm
@@ -221,32 +659,26 @@ class PDFGenerator:
 
         # Tableau items (même logique que facture)
         y -= 1.5*cm
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(2*cm, y, "Description")
-        c.drawString(10*cm, y, "Qté")
-        c.drawString(12*cm, y, "P.U. HT")
-        c.drawString(14.5*cm, y, "Total HT")
-
-        y -= 0.3*cm
-        c.line(2*cm, y, 19*cm, y)
-
-        y -= 0.7*cm
-        c.setFont("Helvetica", 9)
+        header = partial(self._draw_table_header, columns=QUOTE_COLUMNS, font_size=10)
+        y = header(c, y)
+        c.setFont(self.font_regular, 9)
 
         for item in quote.items:
-            desc = item.description[:50]
-            c.drawString(2*cm, y, desc)
+            needed = self._wrapped_height(item.description, 7.8*cm, self.font_regular, 9) + 0.6*cm
+            y = self._ensure_space(c, y, needed, self.font_regular, 9, header)
             c.drawString(10*cm, y, str(item.quantity))
             c.drawString(12*cm, y, f"{float(item.unit_price):.2f} €")
             c.drawString(14.5*cm, y, f"{float(item.total_ht):.2f} €")
+            y = self._draw_wrapped(c, 2*cm, y, item.description, 7.8*cm, self.font_regular, 9)
             y -= 0.6*cm
 
         # Totaux
+        y = self._ensure_space(c, y, 5*cm, self.font_regular, 9)
         y -= 0.5*cm
         c.line(12*cm, y, 19*cm, y)
 
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(13*cm, y, "Total HT:")
         c.drawString(17*cm, y, f"{float(quote.total_ht):.2f} €")
 
@@ -255,106 +687,135 @@ class PDFGenerator:
         c.drawString(17*cm, y, f"{float(quote.total_vat):.2f} €")
 
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 13)
+        c.setFont(self.font_bold, 13)
         c.drawString(13*cm, y, "Total TTC:")
         c.drawString(17*cm, y, f"{float(quote.total_ttc):.2f} €")
 
         # Note de validité
         y -= 2*cm
-        c.setFont("Helvetica-Oblique", 9)
+        c.setFont(self.font_italic, 9)
         c.drawString(2*cm, y, f"Ce devis est valable {quote.validity_days} jours à compter de sa date d'émission.")
 
-        c.save()
-        logger.info(f"✅ Devis PDF généré: {filepath}")
-        return filepath
-
     def generate_mileage_pdf(
         self,
         records: list[MileageRecord],
         company_info: dict,
-        period_label: str = "Note de frais kilométriques"
+        period_label: str = "Note de frais kilométriques",
+        document_number: str | None = None,
+        issued_on: Optional[date] = None,
     ) -> Path:
-        """Génère un PDF de note de frais kilométriques."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"frais_km_{timestamp}.pdf"
-        filepath = self.output_dir / filename
-
-        c = canvas.Canvas(str(filepath), pagesize=A4)
+        """Génère un PDF de note de frais kilométriques (datée de issued_on, par défaut aujourd'hui)."""
+        return self._render_mileage(records, company_info, period_label, document_number, issued_on).pdf_path
 
+    def _render_mileage(
+        self,
+        records: list[MileageRecord],
+        company_info: dict,
+        period_label: str,
+        document_number: str | None,
+        issued_on: Optional[date],
+    ) -> RenderReport:
+        issued_on = issued_on or date.today()
+        report = self._render(
+            "frais_km",
+            document_number,
+            issued_on,
+            lambda c: self._draw_mileage(c, records, company_info, period_label, issued_on),
+        )
+        logger.info(f"✅ Note de frais PDF générée: {report.pdf_path}")
+        return report
+
+    def _draw_mileage(
+        self,
+        c: canvas.Canvas,
+        records: list[MileageRecord],
+        company_info: dict,
+        period_label: str,
+        issued_on: date,
+    ) -> None:
+        """Dessine la note de frais kilométriques sur le canvas."""
         # En-tête
         y = self.height - 2*cm
-        c.setFont("Helvetica-Bold", 18)
+        c.setFont(self.font_bold, 18)
         c.drawString(2*cm, y, period_label)
 
         y -= 1*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, f"Émis par: {company_info['name']}")
 
         y -= 0.5*cm
-        c.drawString(2*cm, y, f"Date: {datetime.now().strftime('%d/%m/%Y')}")
+        c.drawString(2*cm, y, f"Date: {issued_on.strftime('%d/%m/%Y')}")
 
         # Tableau
         y -= 1.5*cm
-        c.setFont("Helvetica-Bold", 9)
-        c.drawString(2*cm, y, "Date")
-        c.drawString(4*cm, y, "Trajet")
-        c.drawString(11*cm, y, "Distance")
-        c.drawString(13.5*cm, y, "Véhicule")
-        c.drawString(15.5*cm, y, "Tarif/km")
-        c.drawString(17.5*cm, y, "Montant")
-
-        y -= 0.3*cm
-        c.line(2*cm, y, 19*cm, y)
-
-        y -= 0.7*cm
-        c.setFont("Helvetica", 8)
+        header = partial(self._draw_table_header, columns=MILEAGE_COLUMNS, font_size=9)
+        y = header(c, y)
+        c.setFont(self.font_regular, 8)
 
         total = Decimal("0")
 
         for record in records:
+            trajet = f"{record.start_location} → {record.end_location}"
+            needed = self._wrapped_height(trajet, 6.8*cm, self.font_regular, 8) + 0.5*cm
+            y = self._ensure_space(c, y, needed, self.font_regular, 8, header)
             c.drawString(2*cm, y, record.travel_date.strftime('%d/%m/%Y'))
-            trajet = f"{record.start_location} → {record.end_location}"[:30]
-            c.drawString(4*cm, y, trajet)
             c.drawString(11*cm, y, f"{float(record.distance_km):.1f} km")
             c.drawString(13.5*cm, y, record.vehicle_type)
             c.drawString(15.5*cm, y, f"{float(record.rate_per_km):.3f} €")
             c.drawString(17.5*cm, y, f"{float(record.total_amount):.2f} €")
+            y = self._draw_wrapped(c, 4*cm, y, trajet, 6.8*cm, self.font_regular, 8)
 
             total += record.total_amount
             y -= 0.5*cm
 
         # Total
+        y = self._ensure_space(c, y, 1.5*cm, self.font_regular, 8)
         y -= 0.5*cm
         c.line(15*cm, y, 19*cm, y)
 
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(15*cm, y, "TOTAL:")
         c.drawString(17.5*cm, y, f"{float(total):.2f} €")
 
-        c.save()
-        logger.info(f"✅ Note de frais PDF générée: {filepath}")
-        return filepath
-
-    def generate_rent_receipt_pdf(self, receipt: RentReceipt, company_info: dict) -> Path:
-        """Génère un PDF de quittance de loyer."""
-        filename = f"quittance_{receipt.receipt_number.replace('/', '-')}.pdf"
-        filepath = self.output_dir / filename
-
-        c = canvas.Canvas(str(filepath), pagesize=A4)
-
+    def generate_rent_receipt_pdf(
+        self,
+        receipt: RentReceipt,
+        company_info: dict,
+        issued_on: Optional[date] = None,
+    ) -> Path:
+        """Génère un PDF de quittance de loyer (faite le issued_on, par défaut aujourd'hui)."""
+        return self._render_rent_receipt(receipt, company_info, issued_on).pdf_path
+
+    def _render_rent_receipt(
+        self, receipt: RentReceipt, company_info: dict, issued_on: Optional[date]
+    ) -> RenderReport:
+        issued_on = issued_on or date.today()
+        report = self._render(
+            "quittance",
+            receipt.receipt_number,
+            issued_on,
+            lambda c: self._draw_rent_receipt(c, receipt, company_info, issued_on),
+        )
+        logger.info(f"✅ Quittance de loyer PDF générée: {report.pdf_path}")
+        return report
+
+    def _draw_rent_receipt(
+        self, c: canvas.Canvas, receipt: RentReceipt, company_info: dict, issued_on: date
+    ) -> None:
+        """Dessine la quittance de loyer sur le canvas."""
         # Titre
         y = self.height - 3*cm
-        c.setFont("Helvetica-Bold", 20)
+        c.setFont(self.font_bold, 20)
         c.drawCentredString(self.width / 2, y, "QUITTANCE DE LOYER")
 
         # Propriétaire
         y -= 2*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(2*cm, y, "Propriétaire:")
 
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, company_info["name"])
 
         y -= 0.5*cm
@@ -362,11 +823,11 @@ class PDFGenerator:
 
         # Locataire
         y -= 1.5*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(2*cm, y, "Locataire:")
 
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, receipt.tenant_name)
 
         y -= 0.5*cm
@@ -374,16 +835,16 @@ class PDFGenerator:
 
         # Bien loué
         y -= 1.5*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(2*cm, y, "Bien loué:")
 
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, receipt.property_address)
 
         # Période et paiement
         y -= 1.5*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, f"Période: {receipt.period_str}")
 
         y -= 0.6*cm
@@ -394,7 +855,7 @@ class PDFGenerator:
 
         # Détail des montants
         y -= 2*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(10*cm, y, "Loyer:")
         c.drawString(16*cm, y, f"{float(receipt.rent_amount):.2f} €")
 
@@ -406,118 +867,135 @@ class PDFGenerator:
         c.line(10*cm, y, 18*cm, y)
 
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 13)
+        c.setFont(self.font_bold, 13)
         c.drawString(10*cm, y, "TOTAL:")
         c.drawString(16*cm, y, f"{float(receipt.total_amount):.2f} €")
 
         # Certification
         y -= 2*cm
-        c.setFont("Helvetica-Oblique", 9)
         text = "Je soussigné(e), certifie avoir reçu la somme indiquée ci-dessus au titre du loyer et des charges pour la période mentionnée."
-        c.drawString(2*cm, y, text)
+        y = self._draw_wrapped(c, 2*cm, y, text, 17*cm, self.font_italic, 9)
 
-        # Signature
-        y -= 2*cm
-        c.setFont("Helvetica", 10)
+        # Signature (date, libellé et image sur la même page)
+        y = self._ensure_space(c, y - 2*cm, 2*cm, self.font_regular, 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(12*cm, y, "Fait le:")
-        c.drawString(14.5*cm, y, datetime.now().strftime('%d/%m/%Y'))
+        c.drawString(14.5*cm, y, issued_on.strftime('%d/%m/%Y'))
 
         y -= 1*cm
         c.drawString(12*cm, y, "Signature:")
+        self._draw_signature(c, 14.5*cm, y - 1*cm)
 
-        c.save()
-        logger.info(f"✅ Quittance de loyer PDF générée: {filepath}")
-        return filepath
-
-    def generate_rental_charges_pdf(self, charges: RentalCharges, company_info: dict) -> Path:
-        """Génère un PDF de décompte de charges locatives."""
-        filename = f"charges_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = self.output_dir / filename
-
-        c = canvas.Canvas(str(filepath), pagesize=A4)
+    def generate_rental_charges_pdf(
+        self,
+        charges: RentalCharges,
+        company_info: dict,
+        document_number: str | None = None,
+        issued_on: Optional[date] = None,
+    ) -> Path:
+        """Génère un PDF de décompte de charges locatives (fait le issued_on, par défaut aujourd'hui)."""
+        return self._render_rental_charges(charges, company_info, document_number, issued_on).pdf_path
 
+    def _render_rental_charges(
+        self,
+        charges: RentalCharges,
+        company_info: dict,
+        document_number: str | None,
+        issued_on: Optional[date],
+    ) -> RenderReport:
+        issued_on = issued_on or date.today()
+        report = self._render(
+            "charges",
+            document_number,
+            issued_on,
+            lambda c: self._draw_rental_charges(c, charges, company_info, issued_on),
+        )
+        logger.info(f"✅ Décompte charges PDF généré: {report.pdf_path}")
+        return report
+
+    def _draw_rental_charges(
+        self, c: canvas.Canvas, charges: RentalCharges, company_info: dict, issued_on: date
+    ) -> None:
+        """Dessine le décompte de charges locatives sur le canvas."""
         # Titre
         y = self.height - 3*cm
-        c.setFont("Helvetica-Bold", 20)
+        c.setFont(self.font_bold, 20)
         c.drawCentredString(self.width / 2, y, "DÉCOMPTE DE CHARGES LOCATIVES")
 
         # Période
         y -= 1.5*cm
-        c.setFont("Helvetica-Bold", 12)
+        c.setFont(self.font_bold, 12)
         periode = f"Période du {charges.period_start.strftime('%d/%m/%Y')} au {charges.period_end.strftime('%d/%m/%Y')}"
         c.drawCentredString(self.width / 2, y, periode)
 
         # Propriétaire
         y -= 2*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(2*cm, y, "Bailleur:")
 
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, company_info["name"])
         c.drawString(2*cm, y-0.5*cm, company_info["address"])
 
         # Locataire
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(12*cm, y, "Locataire:")
 
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(12*cm, y-0.6*cm, charges.tenant_name)
 
         # Bien loué
         y -= 2.5*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(2*cm, y, "Bien loué:")
         
         y -= 0.6*cm
-        c.setFont("Helvetica", 10)
+        c.setFont(self.font_regular, 10)
         c.drawString(2*cm, y, charges.property_address)
 
         # Tableau des charges
         y -= 2*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(2*cm, y, "Détail des charges réelles")
 
         y -= 1*cm
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(2*cm, y, "Libellé")
-        c.drawString(16*cm, y, "Montant")
-
-        y -= 0.3*cm
-        c.line(2*cm, y, 19*cm, y)
-
-        y -= 0.7*cm
-        c.setFont("Helvetica", 10)
+        header = partial(self._draw_table_header, columns=CHARGES_COLUMNS, font_size=10)
+        y = header(c, y)
+        c.setFont(self.font_regular, 10)
 
         for item in charges.charges:
-            c.drawString(2*cm, y, item.label[:60])
+            needed = self._wrapped_height(item.label, 13.8*cm, self.font_regular, 10) + 0.6*cm
+            y = self._ensure_space(c, y, needed, self.font_regular, 10, header)
             c.drawString(16*cm, y, f"{float(item.amount):.2f} €")
+            y = self._draw_wrapped(c, 2*cm, y, item.label, 13.8*cm, self.font_regular, 10)
             y -= 0.6*cm
 
         # Total charges réelles
+        y = self._ensure_space(c, y, 10*cm, self.font_regular, 10)
         y -= 0.5*cm
         c.line(14*cm, y, 19*cm, y)
         y -= 0.7*cm
-        c.setFont("Helvetica-Bold", 11)
+        c.setFont(self.font_bold, 11)
         c.drawString(10*cm, y, "Total charges réelles:")
         c.drawString(16*cm, y, f"{float(charges.total_charges):.2f} €")
 
         # Provisions
         y -= 1*cm
-        c.setFont("Helvetica", 11)
+        c.setFont(self.font_regular, 11)
         c.drawString(10*cm, y, "Provisions versées:")
         c.drawString(16*cm, y, f"{float(charges.provisions_amount):.2f} €")
 
         # Régularisation
         y -= 1.5*cm
-        c.setFont("Helvetica-Bold", 13)
+        c.setFont(self.font_bold, 13)
         c.drawString(10*cm, y, "RÉGULARISATION:")
         
         regul = charges.regularization_amount
         c.drawString(16*cm, y, f"{float(regul):.2f} €")
 
         y -= 1*cm
-        c.setFont("Helvetica-Oblique", 10)
+        c.setFont(self.font_italic, 10)
         if regul > 0:
             c.drawString(2*cm, y, f"Solde à payer par le locataire: {float(regul):.2f} €")
         elif regul < 0:
@@ -527,13 +1005,10 @@ class PDFGenerator:
 
         # Note justificatifs
         y -= 2*cm
-        c.setFont("Helvetica", 9)
+        c.setFont(self.font_regular, 9)
         c.drawString(2*cm, y, "Les justificatifs des charges sont tenus à votre disposition sur demande.")
 
-        # Signature
-        y -= 2*cm
-        c.drawString(12*cm, y, f"Fait le {datetime.now().strftime('%d/%m/%Y')}")
-
-        c.save()
-        logger.info(f"✅ Décompte charges PDF généré: {filepath}")
-        return filepath
+        # Signature (date et image sur la même page)
+        y = self._ensure_space(c, y - 2*cm, 2*cm, self.font_regular, 9)
+        c.drawString(12*cm, y, f"Fait le {issued_on.strftime('%d/%m/%Y')}")
+        self._draw_signature(c, 12*cm, y - 2*cm)
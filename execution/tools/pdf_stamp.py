@@ -0,0 +1,110 @@
+"""Tampons superposés aux PDFs existants (ex: « PAYÉE le ... ») sans re-rendu."""
+
+import logging
+import os
+import tempfile
+from contextlib import suppress
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from execution.tools.pdf_generator import PDF_FILE_MODE
+
+logger = logging.getLogger(__name__)
+
+STAMP_COLOR = colors.Color(0.8, 0.1, 0.1)
+
+
+def paid_stamp_text(paid_on: date) -> str:
+    """Texte du tampon de paiement."""
+    return f"PAYÉE le {paid_on.strftime('%d/%m/%Y')}"
+
+
+@lru_cache(maxsize=32)
+def render_stamp_page(text: str, page_width: float = A4[0], page_height: float = A4[1]) -> bytes:
+    """
+    Rend une page PDF transparente ne contenant que le tampon.
+
+    La page est rendue une seule fois par (texte, format) puis réutilisée :
+    tamponner un document ne coûte qu'une fusion de page.
+
+    Returns:
+        Contenu binaire d'un PDF d'une page
+    """
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(page_width, page_height))
+
+    c.saveState()
+    c.translate(page_width - 6 * cm, page_height - 9 * cm)
+    c.rotate(15)
+    c.setStrokeColor(STAMP_COLOR)
+    c.setFillColor(STAMP_COLOR)
+    c.setLineWidth(2.5)
+    c.roundRect(-4.5 * cm, -0.9 * cm, 9 * cm, 1.8 * cm, 0.3 * cm, stroke=1, fill=0)
+    c.setFont("Helvetica-Bold", 18)
+    c.drawCentredString(0, -0.25 * cm, text)
+    c.restoreState()
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def apply_stamp(source_path: Path, output_path: Path, text: str) -> Path:
+    """
+    Superpose un tampon sur la première page d'un PDF existant.
+
+    Le fichier source n'est pas modifié ; le résultat est écrit de façon
+    atomique (fichier temporaire puis os.replace).
+
+    Args:
+        source_path: PDF d'origine
+        output_path: Chemin du PDF tamponné
+        text: Texte du tampon
+
+    Returns:
+        Chemin du PDF tamponné
+    """
+    source_path = Path(source_path)
+    output_path = Path(output_path)
+
+    writer = PdfWriter(clone_from=PdfReader(source_path))
+    first_page = writer.pages[0]
+    width, height = float(first_page.mediabox.width), float(first_page.mediabox.height)
+    stamp = PdfReader(BytesIO(render_stamp_page(text, width, height))).pages[0]
+    first_page.merge_page(stamp)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=output_path.parent, prefix=f".{output_path.stem}-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            writer.write(tmp_file)
+        os.chmod(tmp_name, PDF_FILE_MODE)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+    logger.info(f"🖋️ Tampon « {text} » apposé: {output_path}")
+    return output_path
+
+
+def stamp_paid(source_path: Path, paid_on: date) -> Path:
+    """
+    Tamponne « PAYÉE le ... » une facture existante.
+
+    Le PDF tamponné est écrit à côté de l'original, suffixé « _payee ».
+    """
+    source_path = Path(source_path)
+    output_path = source_path.with_name(f"{source_path.stem}_payee.pdf")
+    return apply_stamp(source_path, output_path, paid_stamp_text(paid_on))
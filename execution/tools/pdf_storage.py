@@ -0,0 +1,167 @@
+"""Gestion de l'espace disque des PDFs générés (.tmp/documents)."""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import suppress
+from pathlib import Path
+
+from execution.models.database import Document
+from execution.tools.db_manager import DatabaseManager
+from execution.tools.document_store import DocumentStore
+from execution.tools.pdf_generator import PDFGenerator
+from execution.tools.pdf_stamp import stamp_paid
+
+logger = logging.getLogger(__name__)
+
+
+class PDFStorageManager:
+    """
+    Borne la taille et l'âge du répertoire des PDFs, avec éviction LRU.
+
+    La date de dernier accès d'un PDF est sa date de modification : chaque
+    réutilisation (store, renvoi) la remet à jour via touch(). Un PDF évincé
+    n'est pas perdu : Document.data contient le modèle validé complet, et
+    ensure_available() le re-rend à la demande.
+    """
+
+    def __init__(
+        self,
+        pdf_gen: PDFGenerator,
+        db: DatabaseManager,
+        store: DocumentStore | None = None,
+        max_bytes: int = 500 * 1024 * 1024,
+        max_age_days: int = 365,
+        sweep_interval_s: float = 3600,
+    ):
+        """
+        Initialise le gestionnaire.
+
+        Args:
+            pdf_gen: Générateur utilisé pour les re-rendus (et dont output_dir est borné)
+            db: Gestionnaire de base de données
+            store: Index par empreinte à mettre à jour après un re-rendu (optionnel)
+            max_bytes: Taille maximale du répertoire
+            max_age_days: Âge maximal depuis le dernier accès
+            sweep_interval_s: Intervalle minimal entre deux balayages automatiques
+        """
+        self.pdf_gen = pdf_gen
+        self.db = db
+        self.store = store
+        self.root_dir = pdf_gen.output_dir
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_days * 86400
+        self.sweep_interval_s = sweep_interval_s
+        self._last_sweep: float | None = None
+
+    @staticmethod
+    def touch(pdf_path: Path) -> None:
+        """Marque un PDF comme récemment utilisé (LRU)."""
+        try:
+            os.utime(pdf_path)
+        except OSError as e:
+            logger.debug(f"touch impossible sur {pdf_path}: {e}")
+
+    def enforce_budget(self) -> list[Path]:
+        """
+        Évince les PDFs trop anciens puis les moins récemment utilisés
+        jusqu'à revenir sous le budget de taille.
+
+        Returns:
+            Liste des fichiers supprimés
+        """
+        entries = []
+        for pdf_path in self.root_dir.rglob("*.pdf"):
+            try:
+                stat = pdf_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, pdf_path))
+
+        # Du moins récemment utilisé au plus récent
+        entries.sort(key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - self.max_age_s
+
+        evicted = []
+        for mtime, size, pdf_path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                pdf_path.unlink()
+            total -= size
+            evicted.append(pdf_path)
+            self._prune_empty_dirs(pdf_path.parent)
+
+        if evicted:
+            logger.info(
+                f"🧹 {len(evicted)} PDF(s) évincé(s), "
+                f"{total / (1024 * 1024):.1f} Mo conservés dans {self.root_dir}"
+            )
+        return evicted
+
+    def enforce_budget_if_due(self) -> list[Path]:
+        """Lance enforce_budget() au plus une fois par sweep_interval_s."""
+        now = time.monotonic()
+        if self._last_sweep is not None and now - self._last_sweep < self.sweep_interval_s:
+            return []
+        self._last_sweep = now
+        return self.enforce_budget()
+
+    def _prune_empty_dirs(self, directory: Path) -> None:
+        """Supprime les répertoires année/mois devenus vides."""
+        while directory != self.root_dir and self.root_dir in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
+
+    async def ensure_available(self, document: Document, company_info: dict) -> Path:
+        """
+        Retourne le PDF d'un document, en le re-rendant depuis Document.data s'il a été évincé.
+
+        Args:
+            document: Enregistrement Document
+            company_info: Informations de l'entreprise émettrice
+
+        Returns:
+            Chemin d'un PDF existant sur le disque
+        """
+        if document.pdf_path and Path(document.pdf_path).is_file():
+            pdf_path = Path(document.pdf_path)
+            self.touch(pdf_path)
+            return pdf_path
+
+        logger.info(
+            f"PDF absent pour #{document.document_number}, re-rendu depuis les données stockées"
+        )
+        report = await asyncio.to_thread(
+            self.pdf_gen.render_document,
+            document.document_type,
+            document.data,
+            company_info,
+            document.created_at.date() if document.created_at else None,
+        )
+        pdf_path = report.pdf_path
+
+        await self.db.update_document_pdf_path(document.id, str(pdf_path))
+        document.pdf_path = str(pdf_path)
+
+        # Réindexer seulement si l'empreinte correspond à la version de gabarit courante
+        if (
+            self.store is not None
+            and document.content_hash
+            and self.store.content_hash(document.document_type, document.data)
+            == document.content_hash
+        ):
+            await self.store.put(document.content_hash, document.document_type, pdf_path)
+
+        # Un document payé est renvoyé avec son tampon (le store garde le rendu d'origine)
+        if document.paid_at:
+            pdf_path = await asyncio.to_thread(stamp_paid, pdf_path, document.paid_at.date())
+            await self.db.update_document_pdf_path(document.id, str(pdf_path))
+            document.pdf_path = str(pdf_path)
+
+        return pdf_path
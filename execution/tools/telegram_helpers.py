@@ -1,10 +1,18 @@
 """Fonctions utilitaires pour l'interaction Telegram."""
 
-from telegram import Update
+from dataclasses import dataclass, field
+from html import escape
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 from pathlib import Path
+from typing import Any
+import asyncio
 import re
 import logging
+import time
+import unicodedata
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -14,22 +22,38 @@ async def send_document_with_preview(
     context: ContextTypes.DEFAULT_TYPE,
     pdf_path: Path,
     caption: str,
+    file_id: str | None = None,
 ) -> str | None:
     """
     Envoie un document PDF à l'utilisateur via Telegram.
 
+    Si un file_id Telegram est déjà connu pour ce PDF, il est réutilisé
+    (pas de nouvel upload). En cas d'échec, le fichier local est envoyé.
+
     Args:
         update: Objet Update de Telegram
         context: Contexte Telegram
         pdf_path: Chemin vers le fichier PDF
         caption: Légende du message
+        file_id: file_id Telegram d'un envoi précédent (optionnel)
 
     Returns:
         file_id du document envoyé, ou None en cas d'erreur
     """
+    if file_id:
+        try:
+            message = await update.effective_message.reply_document(
+                document=file_id,
+                caption=caption,
+            )
+            logger.info(f"Document renvoyé via file_id: {pdf_path.name}")
+            return message.document.file_id if message.document else file_id
+        except Exception as e:
+            logger.warning(f"file_id Telegram inutilisable, envoi du fichier: {e}")
+
     try:
         with open(pdf_path, "rb") as pdf_file:
-            message = await update.message.reply_document(
+            message = await update.effective_message.reply_document(
                 document=pdf_file,
                 filename=pdf_path.name,
                 caption=caption,
@@ -39,12 +63,12 @@ async def send_document_with_preview(
 
     except FileNotFoundError:
         logger.error(f"Fichier PDF introuvable: {pdf_path}")
-        await update.message.reply_text(f"❌ Erreur: fichier {pdf_path.name} introuvable")
+        await update.effective_message.reply_text(f"❌ Erreur: fichier {pdf_path.name} introuvable")
         return None
 
     except Exception as e:
         logger.error(f"Erreur lors de l'envoi du document: {e}", exc_info=True)
-        await update.message.reply_text("❌ Erreur lors de l'envoi du document")
+        await update.effective_message.reply_text("❌ Erreur lors de l'envoi du document")
         return None
 
 
@@ -148,6 +172,7 @@ def build_help_text() -> str:
 **Facturation:**
 • `/facture` - Générer une facture
 • `/devis` - Générer un devis
+• `/payee <numéro>` - Marquer une facture payée
 
 **Frais:**
 • `/frais_km` - Note de frais kilométriques
@@ -159,6 +184,7 @@ def build_help_text() -> str:
 **Autres:**
 • `/help` - Afficher cette aide
 • `/stats` - Voir vos statistiques
+• `/usage [jours]` - Consommation LLM (tokens, latences)
 
 **Exemples d'utilisation:**
 
@@ -189,6 +215,153 @@ def build_help_text() -> str:
 """
 
 
+# Préfixe du callback_data des boutons de brouillon : "draft:<action>:<id>"
+DRAFT_CALLBACK_PREFIX = "draft"
+
+# Messages valant confirmation du brouillon en attente (normalisés)
+DRAFT_CONFIRMATIONS = frozenset({
+    "oui", "ok", "okay", "vas y", "go", "c est bon", "confirme", "je confirme", "valide",
+    "d accord", "yes", "fais le", "genere", "parfait", "top", "nickel", "oui vas y", "ok vas y",
+})
+
+DOCUMENT_LABELS = {
+    "invoice": "📄 Facture",
+    "quote": "📝 Devis",
+    "mileage": "🚗 Frais kilométriques",
+    "rent_receipt": "🏠 Quittance de loyer",
+    "rental_charges": "🏠 Décompte de charges",
+}
+
+# Libellés des champs de extracted_data affichés dans le récapitulatif
+FIELD_LABELS = {
+    "client_name": "Client",
+    "client_address": "Adresse",
+    "items": "Articles",
+    "payment_conditions": "Conditions",
+    "trips": "Trajets",
+    "tenant_name": "Locataire",
+    "property_address": "Bien",
+    "period_month": "Mois",
+    "period_year": "Année",
+    "rent_amount": "Loyer",
+    "charges_amount": "Charges",
+    "period_start": "Début",
+    "period_end": "Fin",
+    "charges": "Charges",
+}
+
+
+@dataclass
+class PendingDraft:
+    """Document proposé par l'orchestrateur, en attente de confirmation."""
+
+    intent: str
+    data: dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    created_at: float = field(default_factory=time.time)
+
+    def expired(self, ttl_s: float) -> bool:
+        """Vrai si le brouillon est plus vieux que ttl_s secondes."""
+        return time.time() - self.created_at > ttl_s
+
+
+def is_draft_confirmation(text: str) -> bool:
+    """Vrai si le message confirme simplement le brouillon en attente ("Vas-y", "Oui"...)."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return " ".join(re.sub(r"[^\w]+", " ", plain).split()) in DRAFT_CONFIRMATIONS
+
+
+def build_draft_keyboard(draft_id: str) -> InlineKeyboardMarkup:
+    """Boutons "Confirmer / Modifier" d'un brouillon."""
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton("✅ Confirmer", callback_data=f"{DRAFT_CALLBACK_PREFIX}:confirm:{draft_id}"),
+        InlineKeyboardButton("✏️ Modifier", callback_data=f"{DRAFT_CALLBACK_PREFIX}:edit:{draft_id}"),
+    ]])
+
+
+def parse_draft_callback(callback_data: str | None) -> tuple[str, str] | None:
+    """callback_data "draft:confirm:ab12cd34" -> ("confirm", "ab12cd34"), sinon None."""
+    parts = (callback_data or "").split(":")
+    if len(parts) != 3 or parts[0] != DRAFT_CALLBACK_PREFIX:
+        return None
+    return parts[1], parts[2]
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, dict):
+        return ", ".join(f"{k}: {_format_value(v)}" for k, v in value.items() if v not in (None, ""))
+    if isinstance(value, list):
+        return "".join(f"\n   • {_format_value(v)}" for v in value)
+    return escape(str(value))
+
+
+def format_draft_summary(intent: str, data: dict[str, Any], totals: str | None = None) -> str:
+    """
+    Récapitulatif HTML des données extraites, à confirmer avant génération.
+
+    Args:
+        intent: Type de document
+        data: extracted_data proposé
+        totals: Totaux calculés par l'aperçu de l'agent (optionnel)
+
+    Returns:
+        Texte HTML (parse_mode="HTML")
+    """
+    lines = [f"<b>{DOCUMENT_LABELS.get(intent, intent)} - brouillon</b>", ""]
+    for key, value in data.items():
+        if value in (None, "", [], {}):
+            continue
+        lines.append(f"• <b>{escape(FIELD_LABELS.get(key, key))}</b> : {_format_value(value)}")
+    if totals:
+        lines += ["", totals]
+    lines += ["", "Confirmez pour générer le document, ou modifiez la demande."]
+    return "\n".join(lines)
+
+
+def _tokens(value: int) -> str:
+    return f"{value / 1000:.1f}k" if value >= 1000 else str(value)
+
+
+def format_usage_report(report: dict[str, Any], days: int) -> str:
+    """
+    Rapport /usage en HTML : agrégats journaliers, par intention et répartition du temps.
+
+    Args:
+        report: Résultat de aggregate_usage
+        days: Période couverte (jours)
+
+    Returns:
+        Texte HTML (parse_mode="HTML")
+    """
+    total = report["total"]
+    if not total["turns"]:
+        return f"📈 Aucune consommation LLM enregistrée sur les {days} derniers jours."
+
+    header = f"{'':<11}{'tours':>6}{'LLM':>5}{'tok in':>8}{'tok out':>8}{'p50 ms':>8}{'p95 ms':>8}"
+
+    def row(label: str, agg: dict[str, Any]) -> str:
+        return (
+            f"{label[:11]:<11}{agg['turns']:>6}{agg['llm_calls']:>5}{_tokens(agg['prompt_tokens']):>8}"
+            f"{_tokens(agg['completion_tokens']):>8}{agg['p50_ms']:>8.0f}{agg['p95_ms']:>8.0f}"
+        )
+
+    daily = [row(day.strftime("%d/%m"), agg) for day, agg in report["days"]] + [row("total", total)]
+    intents = [row(intent, agg) for intent, agg in report["intents"]]
+    split = report["split"]
+    return "\n".join([
+        f"<b>📈 Consommation LLM ({days} derniers jours)</b>",
+        "",
+        "<b>Par jour</b>",
+        f"<pre>{escape(chr(10).join([header, *daily]))}</pre>",
+        "<b>Par intention</b>",
+        f"<pre>{escape(chr(10).join([header, *intents]))}</pre>",
+        f"⏱️ Temps : LLM {split['llm']:.0f}% · outils {split['tools']:.0f}% · orchestrateur {split['other']:.0f}%",
+        f"🔁 {total['llm_calls'] / total['turns']:.2f} appel(s) LLM par tour",
+        f"💾 Cache de prompt : {100 * total['cached_tokens'] / (total['prompt_tokens'] or 1):.0f}% des tokens du prompt",
+    ])
+
+
 def validate_user_access(user_id: int, allowed_users: list[int]) -> bool:
     """
     Vérifie si un utilisateur est autorisé à utiliser le bot.
@@ -223,3 +396,73 @@ async def send_typing_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
     except Exception as e:
         logger.error(f"Erreur lors de l'envoi de l'action typing: {e}")
+
+
+class TelegramStreamWriter:
+    """
+    Affiche une réponse en cours de génération dans un seul message Telegram.
+
+    Le premier texte reçu crée le message ; les suivants le modifient via
+    edit_message_text, au plus une fois par min_interval_s (limite d'édition
+    Telegram). Les éditions partent en tâche de fond : la lecture du flux LLM
+    n'attend jamais Telegram. finalize() applique le texte final en HTML.
+    """
+
+    def __init__(self, message: Message, min_interval_s: float = 1.0):
+        """
+        Args:
+            message: Message utilisateur auquel répondre
+            min_interval_s: Intervalle minimal entre deux éditions (secondes)
+        """
+        self.message = message
+        self.min_interval_s = min_interval_s
+        self.sent: Message | None = None
+        self.first_visible_at: float | None = None
+        self._text = ""
+        self._shown = ""
+        self._last_edit = 0.0
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        """Vrai si du texte a déjà été envoyé (ou est en cours d'envoi)."""
+        return self.sent is not None or self._flush_task is not None
+
+    async def push(self, text: str) -> None:
+        """Nouveau texte (cumulé depuis le début de la réponse) à afficher."""
+        self._text = text
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        if self.sent is not None and time.perf_counter() - self._last_edit < self.min_interval_s:
+            return
+        self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        text = self._text
+        if not text.strip() or text == self._shown:
+            return
+        try:
+            if self.sent is None:
+                self.sent = await self.message.reply_text(text)
+                self.first_visible_at = time.perf_counter()
+            else:
+                await self.sent.edit_text(text)
+            self._shown = text
+        except Exception as e:
+            logger.warning(f"Édition du message en flux impossible: {e}")
+        self._last_edit = time.perf_counter()
+
+    async def finalize(self, html_text: str) -> None:
+        """Remplace le texte en flux par la réponse finale (HTML nettoyé)."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self.sent is None:
+            self.sent = await self.message.reply_text(html_text, parse_mode="HTML")
+            self.first_visible_at = self.first_visible_at or time.perf_counter()
+            return
+        try:
+            await self.sent.edit_text(html_text, parse_mode="HTML")
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                logger.warning(f"Réponse finale HTML refusée, envoi en texte brut: {e}")
+                await self.sent.edit_text(self._text or html_text)
@@ -3,6 +3,7 @@
 from typing import Dict, Any, Optional
 from langchain_core.tools import BaseTool
 from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
 import logging
 import os
 
@@ -36,7 +37,11 @@ class WhisperTranscriptionTool(BaseTool):
 
         try:
             from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=settings.openai_api_key)
+            # Client HTTP partagé : pas de nouvelle connexion TLS par transcription
+            client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                http_client=get_http_clients().get("openai"),
+            )
 
             if not os.path.exists(audio_file_path):
                 return {"error": f"Audio file not found: {audio_file_path}"}
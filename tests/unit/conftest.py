@@ -0,0 +1,28 @@
+import pytest
+
+from execution.core.config import get_settings
+
+SETTINGS_ENV = {
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_DB": "test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "OPENROUTER_API_KEY": "sk-test",
+    "TELEGRAM_BOT_TOKEN": "123:abc",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+    "COMPANY_NAME": "Ma SASU",
+    "COMPANY_SIRET": "12345678900012",
+    "COMPANY_ADDRESS": "1 rue Example, 75001 Paris",
+    "COMPANY_TVA_NUMBER": "FR12345678901",
+}
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """Minimal environment so that get_settings() can be built in tests."""
+    for key, value in SETTINGS_ENV.items():
+        monkeypatch.setenv(key, value)
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
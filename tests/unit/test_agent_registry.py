@@ -0,0 +1,155 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from execution.agents.base_admin_agent import DRAFT_NUMBER, BaseAdminAgent
+from execution.agents.invoice_agent import InvoiceAgent
+from execution.agents.registry import AgentRegistry
+from execution.models.database import Base
+from execution.tools.db_manager import DatabaseManager
+from execution.tools.pdf_generator import PDFGenerator
+
+
+@pytest.fixture
+async def registry(settings_env, tmp_path):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.engine = engine
+    db.async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield AgentRegistry(db=db, pdf_gen=PDFGenerator(tmp_path))
+    await engine.dispose()
+
+
+def _invoice_state(user_id=1, unit_price=500):
+    return {
+        "user_id": user_id,
+        "request_type": "invoice",
+        "input_data": {
+            "client_name": "ALTECA",
+            "client_address": "1 rue Example, 75001 Paris",
+            "items": [
+                {"description": "Dev", "quantity": 1, "unit_price": unit_price, "vat_rate": 0.20}
+            ],
+        },
+        "validated_data": None,
+        "pdf_path": None,
+        "db_record_id": None,
+        "error": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_agents_are_built_once_and_share_tools(registry):
+    registry.warm_up()
+
+    invoice_agent = registry.get("invoice")
+    assert isinstance(invoice_agent, InvoiceAgent)
+    assert registry.get("invoice") is invoice_agent
+    for request_type in ("quote", "mileage", "rent_receipt", "rental_charges"):
+        agent = registry.get(request_type)
+        assert agent.storage is registry.storage
+        assert agent.db is registry.db
+        assert agent.llm is registry.llm
+
+    with pytest.raises(ValueError):
+        registry.get("unknown")
+
+
+@pytest.mark.asyncio
+async def test_graph_compiled_once_across_requests(registry, monkeypatch):
+    compiled = []
+    original = BaseAdminAgent.build_graph
+
+    def counting_build_graph(self):
+        compiled.append(self)
+        return original(self)
+
+    monkeypatch.setattr(BaseAdminAgent, "build_graph", counting_build_graph)
+
+    results = [
+        await registry.execute(_invoice_state(unit_price=price)) for price in (500, 600, 700)
+    ]
+
+    assert len(compiled) == 1
+    assert all(result["error"] is None for result in results)
+    assert len({result["validated_data"]["invoice_number"] for result in results}) == 3
+    assert all(result["pdf_path"].is_file() for result in results)
+
+
+@pytest.mark.asyncio
+async def test_prepared_state_skips_validation(registry, monkeypatch):
+    state = _invoice_state()
+    prepared = await registry.prepare(state)
+    assert state["validated_data"] is None
+    assert prepared["validated_data"]["invoice_number"]
+
+    validations = []
+    original = InvoiceAgent.validate_input
+
+    async def counting_validate(self, state):
+        validations.append(state)
+        return await original(self, state)
+
+    monkeypatch.setattr(InvoiceAgent, "validate_input", counting_validate)
+    registry.get("invoice")._graph = None  # Recompilé avec le nœud instrumenté
+
+    result = await registry.execute(prepared)
+    assert validations == []
+    assert result["error"] is None and result["pdf_path"].is_file()
+
+
+@pytest.mark.asyncio
+async def test_preview_allocates_no_number_and_persists_nothing(registry):
+    preview = await registry.preview(_invoice_state())
+
+    assert preview["error"] is None
+    assert preview["validated_data"]["invoice_number"] == DRAFT_NUMBER
+    assert preview["pdf_path"] is None
+    assert "Total TTC : 600.00€" in preview["summary"]
+    assert (
+        await registry.db.get_next_invoice_number(date.today().year) == f"{date.today().year}-0001"
+    )
+
+    # Brouillon approuvé : le graph complet attribue le vrai numéro
+    result = await registry.execute(preview)
+    assert result["validated_data"]["invoice_number"] == f"{date.today().year}-0001"
+    assert result["pdf_path"].is_file()
+
+
+@pytest.mark.asyncio
+async def test_identical_request_reuses_stored_document(registry):
+    year = date.today().year
+    first = await registry.execute(_invoice_state())
+    again = await registry.execute(_invoice_state())
+    other_user = await registry.execute(_invoice_state(user_id=2))
+
+    assert (
+        again["validated_data"]["invoice_number"]
+        == first["validated_data"]["invoice_number"]
+        == f"{year}-0001"
+    )
+    assert again["pdf_path"] == first["pdf_path"] and again["db_record_id"] == first["db_record_id"]
+    assert again["reused_document"] and "reused_document" not in first
+    assert again["content_hash"] == other_user["content_hash"]
+    assert other_user["validated_data"]["invoice_number"] == f"{year}-0002"
+
+
+@pytest.mark.asyncio
+async def test_paid_or_older_document_is_not_reused(registry, monkeypatch):
+    year = date.today().year
+    first = await registry.execute(_invoice_state())
+    await registry.db.mark_document_paid(
+        first["db_record_id"], datetime.now(), str(first["pdf_path"])
+    )
+    after_payment = await registry.execute(_invoice_state())
+
+    monkeypatch.setattr(registry.get("invoice").settings, "document_reuse_window_s", 0)
+    later = await registry.execute(_invoice_state())
+
+    numbers = [r["validated_data"]["invoice_number"] for r in (first, after_payment, later)]
+    assert numbers == [f"{year}-0001", f"{year}-0002", f"{year}-0003"]
+    assert not after_payment.get("reused_document") and not later.get("reused_document")
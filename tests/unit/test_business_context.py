@@ -0,0 +1,199 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from langchain_core.messages import AIMessage
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from execution.agents.business_context import (
+    BusinessContextProvider,
+    enrich_extracted_data,
+    render_business_context,
+    select_relevant_rows,
+)
+from execution.core.metrics import metrics
+from execution.models.database import Base, DataAdministration
+from execution.tools.db_manager import DatabaseManager
+
+ROWS = [
+    {"id_data_administration": "charge_locative_1", "charges": [{"label": "Eau", "amount": 120}]},
+    {
+        "id_data_administration": "facturation_client_1",
+        "nom_client": "ALTECA",
+        "adresse_client": "1 rue Example, 75001 Paris",
+        "produit": "Développement Python",
+        "prix_unitaire": "550",
+        "tva": "20",
+        "paiement": "Paiement à 30 jours",
+    },
+    {
+        "id_data_administration": "facturation_client_2",
+        "nom_client": "Écomobile",
+        "prix_unitaire": "400",
+    },
+    {"id_data_administration": "quittance_loyer_1", "montant_loyer": "800"},
+]
+
+
+@pytest.fixture
+async def sqlite_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.engine = engine
+    db.async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield db
+    await engine.dispose()
+
+
+def test_cited_client_only_and_keyword_rows():
+    relevant = select_relevant_rows(ROWS, "Facture pour alteca de 3 jours")
+    assert [row["id_data_administration"] for row in relevant] == ["facturation_client_1"]
+
+    # Client cité sans accents, et mots-clés quittance
+    relevant = select_relevant_rows(ROWS, "quittance de loyer et facture ecomobile")
+    assert [row["id_data_administration"] for row in relevant] == [
+        "facturation_client_2",
+        "quittance_loyer_1",
+    ]
+
+    assert select_relevant_rows(ROWS, "Salut, ça va ?") == []
+
+
+def test_rendered_context_is_compact():
+    context = render_business_context(ROWS, "Fais un devis", 2025)
+
+    assert context.startswith("BUSINESS CONTEXT (data_administration, année 2025):")
+    assert "Clients connus: ALTECA, Écomobile" in context
+    assert "prix_unitaire=550" in context
+    assert "charge_locative_1" not in context
+    assert render_business_context(ROWS, "Bonjour", 2025) == ""
+
+
+def test_enrich_fills_only_missing_fields():
+    data = enrich_extracted_data(
+        "invoice",
+        {
+            "client_name": "Alteca",
+            "items": [{"quantity": 3}, {"description": "Audit", "unit_price": 900, "quantity": 1}],
+        },
+        ROWS,
+    )
+
+    assert data["client_address"] == "1 rue Example, 75001 Paris"
+    assert data["payment_conditions"] == "Paiement à 30 jours"
+    assert data["items"][0] == {
+        "quantity": 3,
+        "unit_price": 550.0,
+        "description": "Développement Python",
+        "vat_rate": 0.2,
+    }
+    assert data["items"][1]["unit_price"] == 900
+    assert enrich_extracted_data("rent_receipt", {}, ROWS)["rent_amount"] == 800.0
+    assert enrich_extracted_data("invoice", {"client_name": "Inconnu"}, ROWS) == {
+        "client_name": "Inconnu"
+    }
+
+
+def test_client_match_is_exact_or_unique_prefix():
+    rows = ROWS + [
+        {
+            "id_data_administration": "facturation_client_3",
+            "nom_client": "Alteca Conseil",
+            "adresse_client": "2 rue B",
+        },
+        {
+            "id_data_administration": "facturation_client_4",
+            "nom_client": "Dupont Conseil",
+            "adresse_client": "3 rue C",
+        },
+        {
+            "id_data_administration": "facturation_client_5",
+            "nom_client": "Dupont Immobilier",
+            "adresse_client": "4 rue D",
+        },
+    ]
+
+    def address(name):
+        return enrich_extracted_data("quote", {"client_name": name}, rows).get("client_address")
+
+    assert address("alteca") == "1 rue Example, 75001 Paris"  # Nom exact avant préfixe
+    assert address("Alteca Conseil SAS") == "2 rue B"
+    assert address("dupont immobilier") == "4 rue D"
+    assert address("Teca") is None  # Pas de sous-chaîne
+    assert address("Dupont") is None  # Deux clients Dupont : ambigu
+
+
+@pytest.mark.asyncio
+async def test_provider_reads_current_year_and_caches(sqlite_db):
+    async with sqlite_db.async_session_maker() as session:
+        session.add_all(
+            [
+                DataAdministration(
+                    id_data_administration="facturation_client_1",
+                    annee=2025,
+                    nom_client="ALTECA",
+                    prix_unitaire=Decimal("550.00"),
+                ),
+                DataAdministration(
+                    id_data_administration="facturation_client_1_old", annee=2024, nom_client="OLD"
+                ),
+            ]
+        )
+        await session.commit()
+
+    provider = BusinessContextProvider(sqlite_db, ttl_s=60)
+    rows = await provider.rows(2025)
+    assert rows == [
+        {
+            "id_data_administration": "facturation_client_1",
+            "nom_client": "ALTECA",
+            "prix_unitaire": "550",
+        }
+    ]
+
+    async with sqlite_db.async_session_maker() as session:
+        session.add(
+            DataAdministration(
+                id_data_administration="quittance_loyer_1", annee=2025, montant_loyer=Decimal("800")
+            )
+        )
+        await session.commit()
+    assert await provider.rows(2025) == rows
+
+    provider.invalidate()
+    assert len(await provider.rows(2025)) == 2
+
+
+@pytest.mark.asyncio
+async def test_document_request_resolved_in_one_llm_call(settings_env, sqlite_db):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeRunnable:
+        def __init__(self):
+            self.calls = []
+
+        async def ainvoke(self, variables):
+            self.calls.append(variables)
+            return AIMessage(
+                content='{"intent": "invoice", "extracted_data": {"client_name": "ALTECA", "items": [{"quantity": 2}]}, "reply_text": "**OK** & merci"}'
+            )
+
+    agent = OrchestratorAgent(db=sqlite_db)
+    assert agent.business_context.db is sqlite_db
+    agent.business_context._cache[date.today().year] = (float("inf"), ROWS)
+    agent.runnable = FakeRunnable()
+    metrics.reset()
+
+    result = await agent.analyze_message("Facture ALTECA pour 2 jours", user_id=1)
+
+    assert result["llm_iterations"] == 1
+    assert len(agent.runnable.calls) == 1
+    assert "facturation_client_1" in agent.runnable.calls[0]["business_context"]
+    assert result["extracted_data"]["client_address"] == "1 rue Example, 75001 Paris"
+    assert result["extracted_data"]["items"][0]["unit_price"] == 550.0
+    assert result["reply_text"] == "<b>OK</b> &amp; merci"
+    assert metrics.summary("orchestrator.llm_iterations")["count"] == 1
+    assert metrics.counter("orchestrator.single_call_turns") == 1
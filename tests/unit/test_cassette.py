@@ -0,0 +1,119 @@
+import json
+from datetime import date
+
+import pytest
+
+from benchmarks.openai_stub import OpenAIStubServer, latency_distribution
+from execution.core.cassette import Cassette, parse_completion, request_key
+from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
+from execution.models.intent_results import FINAL_ANSWER_TOOL
+
+INVOICE = {
+    "intent": "invoice",
+    "extracted_data": {
+        "client_name": "ALTECA",
+        "items": [{"description": "Dev", "unit_price": 500}],
+    },
+}
+
+
+class FakeDB:
+    async def get_chat_history(self, user_id, limit=10):
+        return []
+
+
+async def _analyze(base_url, monkeypatch, **kwargs):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    monkeypatch.setenv("OPENROUTER_BASE_URL", base_url)
+    get_settings.cache_clear()
+    get_http_clients.cache_clear()
+    agent = OrchestratorAgent()
+    agent.db = FakeDB()
+    agent.business_context._cache[date.today().year] = (float("inf"), [])
+    try:
+        return await agent.analyze_message("facture ALTECA 500€", user_id=1, **kwargs)
+    finally:
+        await get_http_clients().aclose()
+        get_http_clients.cache_clear()
+
+
+def test_request_key_and_stream_parsing():
+    request = {
+        "model": "m",
+        "messages": [
+            {"role": "system", "content": "CURRENT DATE: 2026-01-01 10:00:00"},
+            {"role": "user", "content": "Salut"},
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{"id": "a", "function": {"name": "calculator", "arguments": "{}"}}],
+            },
+        ],
+    }
+    later = json.loads(json.dumps(request).replace("10:00:00", "11:30:00").replace('"a"', '"b"'))
+    assert request_key(request) == request_key(later)
+    assert request_key(request) != request_key({**request, "model": "other"})
+
+    sse = (
+        b"".join(
+            b"data: " + json.dumps({"choices": [{"delta": delta}]}).encode() + b"\n\n"
+            for delta in (
+                {"content": "Bon"},
+                {"content": "jour"},
+                {
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "id": "c1",
+                            "function": {"name": "final_answer", "arguments": '{"in'},
+                        }
+                    ]
+                },
+                {"tool_calls": [{"index": 0, "function": {"arguments": 'tent": "chat"}'}}]},
+            )
+        )
+        + b"data: [DONE]\n\n"
+    )
+    assert parse_completion("text/event-stream", sse) == {
+        "content": "Bonjour",
+        "tool_calls": [{"id": "c1", "name": "final_answer", "arguments": '{"intent": "chat"}'}],
+        "usage": None,
+    }
+    assert latency_distribution("250") == 0.25
+    assert 0 <= latency_distribution("normal:100,10")() < 1
+
+
+@pytest.mark.asyncio
+async def test_recorded_exchange_is_replayed_offline(settings_env, monkeypatch, tmp_path):
+    path = tmp_path / "llm.jsonl"
+    reply = {
+        "tool_calls": [
+            {"id": "call_1", "name": FINAL_ANSWER_TOOL, "arguments": json.dumps(INVOICE)}
+        ]
+    }
+
+    # Enregistrement : le serveur simulé tient lieu d'OpenRouter
+    monkeypatch.setenv("LLM_CASSETTE_PATH", str(path))
+    async with OpenAIStubServer(content=reply) as upstream:
+        recorded = await _analyze(upstream.base_url, monkeypatch)
+
+    cassette = Cassette(path)
+    assert len(cassette.interactions) == 1
+    assert cassette.interactions[0]["response"]["tool_calls"][0]["name"] == FINAL_ANSWER_TOOL
+
+    # Rejeu : réponse servie depuis la cassette, en flux
+    monkeypatch.setenv("LLM_CASSETTE_PATH", "")
+    progress = []
+    async with OpenAIStubServer(
+        content="{}", cassette=cassette, default_latency="recorded"
+    ) as replay:
+        replayed = await _analyze(
+            replay.base_url, monkeypatch, on_intent_ready=lambda i, d: progress.append(i)
+        )
+
+    assert replay.misses == [] and replay.completed == [get_settings().openrouter_model]
+    assert replayed["intent"] == recorded["intent"] == "invoice"
+    assert replayed["extracted_data"] == recorded["extracted_data"]
+    assert progress == ["invoice"]
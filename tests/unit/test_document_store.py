@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from execution.models.database import Base, DocumentType
+from execution.tools.db_manager import DatabaseManager
+from execution.tools.document_store import DocumentStore, compute_content_hash
+
+INVOICE_DATA = {
+    "invoice_number": "2025-0001",
+    "invoice_date": "2025-01-15",
+    "due_date": "2025-02-14",
+    "client_name": "ALTECA",
+    "client_address": "1 rue Example, 75001 Paris",
+    "items": [{"description": "Dev", "quantity": "1", "unit_price": "500", "vat_rate": "0.20"}],
+}
+
+
+@pytest.fixture
+async def sqlite_db():
+    """DatabaseManager backed by an in-memory SQLite database."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.engine = engine
+    db.async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield db
+    await engine.dispose()
+
+
+def test_content_hash_ignores_key_order():
+    reordered = dict(reversed(list(INVOICE_DATA.items())))
+    assert compute_content_hash(DocumentType.INVOICE, INVOICE_DATA) == compute_content_hash(
+        DocumentType.INVOICE, reordered
+    )
+
+
+def test_content_hash_ignores_assigned_number():
+    assert compute_content_hash(DocumentType.INVOICE, INVOICE_DATA) == compute_content_hash(
+        DocumentType.INVOICE, {**INVOICE_DATA, "invoice_number": "2025-0002"}
+    )
+
+
+def test_content_hash_depends_on_type_and_template():
+    base = compute_content_hash(DocumentType.INVOICE, INVOICE_DATA, "1")
+    assert base != compute_content_hash(DocumentType.QUOTE, INVOICE_DATA, "1")
+    assert base != compute_content_hash(DocumentType.INVOICE, INVOICE_DATA, "2")
+    assert base != compute_content_hash(
+        DocumentType.INVOICE, {**INVOICE_DATA, "client_name": "Autre"}, "1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_roundtrip(sqlite_db, tmp_path):
+    store = DocumentStore(sqlite_db, template_version="1")
+    content_hash = store.content_hash(DocumentType.INVOICE, INVOICE_DATA)
+    assert await store.get(content_hash) is None
+
+    pdf_path = tmp_path / "facture.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    await store.put(content_hash, DocumentType.INVOICE, pdf_path)
+
+    stored = await store.get(content_hash)
+    assert stored.pdf_path == pdf_path
+    assert stored.read_bytes() == b"%PDF-1.4 test"
+    assert stored.telegram_file_id is None
+
+    await store.remember_telegram_file_id(content_hash, "tg-file-1")
+    stored = await store.get(content_hash)
+    assert stored.telegram_file_id == "tg-file-1"
+
+
+@pytest.mark.asyncio
+async def test_store_miss_when_file_deleted(sqlite_db, tmp_path):
+    store = DocumentStore(sqlite_db, template_version="1")
+    content_hash = store.content_hash(DocumentType.INVOICE, INVOICE_DATA)
+
+    pdf_path = tmp_path / "facture.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    await store.put(content_hash, DocumentType.INVOICE, pdf_path)
+    pdf_path.unlink()
+
+    assert await store.get(content_hash) is None
+
+
+@pytest.mark.asyncio
+async def test_init_db_adds_new_columns_to_existing_tables(sqlite_db):
+    from sqlalchemy import select, text
+
+    from execution.models.database import Document
+
+    async with sqlite_db.engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_documents_content_hash"))
+        await conn.execute(text("ALTER TABLE documents DROP COLUMN content_hash"))
+        await conn.execute(text("ALTER TABLE documents DROP COLUMN paid_at"))
+
+    await sqlite_db.init_db()
+    await sqlite_db.init_db()  # Idempotent
+
+    await sqlite_db.save_document(
+        DocumentType.INVOICE, "2025-0001", INVOICE_DATA, None, user_id=1, content_hash="abc"
+    )
+    async with sqlite_db.async_session_maker() as session:
+        document = (await session.execute(select(Document))).scalar_one()
+    assert document.content_hash == "abc" and document.paid_at is None
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_number_scoped_to_user(sqlite_db):
+    await sqlite_db.save_document(DocumentType.INVOICE, "2025-0001", INVOICE_DATA, None, user_id=1)
+
+    assert (await sqlite_db.get_document_by_number("2025-0001", user_id=1)).user_id == 1
+    assert await sqlite_db.get_document_by_number("2025-0001", user_id=2) is None
+    assert await sqlite_db.get_document_by_number("2025-0001") is not None
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+
+from execution.tools.telegram_helpers import (
+    PendingDraft,
+    build_draft_keyboard,
+    format_draft_summary,
+    is_draft_confirmation,
+    parse_draft_callback,
+)
+
+
+class FakeMessage:
+    def __init__(self, text=""):
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append((text, kwargs))
+        return self
+
+
+class FakeDB:
+    def __init__(self):
+        self.messages = []
+
+    async def add_chat_message(self, user_id, role, content):
+        self.messages.append((role, content))
+
+
+def _bot(settings_env, commands):
+    from execution.telegram_bot import AdminBot
+
+    bot = AdminBot.__new__(AdminBot)
+    bot.settings = settings_env
+    bot.db = FakeDB()
+    bot.document_commands = commands
+    bot.orchestrator = None  # Tout appel LLM échouerait
+    return bot
+
+
+def _update(message, user_id):
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id),
+        effective_chat=SimpleNamespace(id=user_id),
+        effective_message=message,
+        message=message,
+    )
+
+
+def test_draft_helpers():
+    draft = PendingDraft(
+        "invoice",
+        {"client_name": "A<B", "items": [{"description": "Dev", "unit_price": 500}], "notes": None},
+    )
+    keyboard = build_draft_keyboard(draft.id)
+
+    callbacks = [button.callback_data for button in keyboard.inline_keyboard[0]]
+    assert [parse_draft_callback(c) for c in callbacks] == [
+        ("confirm", draft.id),
+        ("edit", draft.id),
+    ]
+    assert parse_draft_callback("other:confirm:x") is None
+    assert "A&lt;B" in format_draft_summary(draft.intent, draft.data)
+    assert "notes" not in format_draft_summary(draft.intent, draft.data)
+    assert "<b>Total TTC : 600.00€</b>" in format_draft_summary(
+        draft.intent, draft.data, totals="<b>Total TTC : 600.00€</b>"
+    )
+    assert is_draft_confirmation("Vas-y !") and is_draft_confirmation("C'est bon")
+    assert not is_draft_confirmation("vas-y mais à 600€")
+    assert draft.expired(-1) and not draft.expired(60)
+
+
+@pytest.mark.asyncio
+async def test_text_confirmation_runs_agent_without_llm(settings_env):
+    user_id = settings_env.telegram_admin_users[0]
+    generated = []
+
+    async def cmd_invoice(update, context):
+        generated.append(context.user_data.pop("pre_extracted_data"))
+
+    bot = _bot(settings_env, {"invoice": cmd_invoice})
+    draft = PendingDraft("invoice", {"client_name": "ALTECA"})
+
+    async def send_chat_action(**kwargs):
+        pass
+
+    context = SimpleNamespace(
+        user_data={"pending_draft": draft}, bot=SimpleNamespace(send_chat_action=send_chat_action)
+    )
+
+    await bot.handle_natural_language(_update(FakeMessage("Vas-y"), user_id), context)
+
+    assert generated == [{"client_name": "ALTECA"}]
+    assert "pending_draft" not in context.user_data
+
+
+@pytest.mark.asyncio
+async def test_stale_button_is_rejected(settings_env):
+    bot = _bot(settings_env, {"invoice": None})
+    message = FakeMessage()
+    context = SimpleNamespace(
+        user_data={"pending_draft": PendingDraft("invoice", {}, created_at=0)}
+    )
+
+    await bot._confirm_draft(_update(message, 1), context, context.user_data["pending_draft"].id)
+
+    assert "plus disponible" in message.replies[0][0]
+    assert "pending_draft" not in context.user_data
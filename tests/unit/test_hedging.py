@@ -0,0 +1,91 @@
+import asyncio
+import time
+from datetime import date
+
+import pytest
+
+from benchmarks.openai_stub import OpenAIStubServer
+from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
+from execution.core.llm import hedged_call
+from execution.core.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_first_response_wins_and_loser_is_cancelled():
+    cancelled = []
+
+    async def reply(value, delay_s, fail=False):
+        try:
+            await asyncio.sleep(delay_s)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        if fail:
+            raise RuntimeError(value)
+        return value
+
+    metrics.reset()
+    assert await hedged_call(
+        lambda: reply("primary", 0), lambda: reply("backup", 0), delay_s=0.05
+    ) == ("primary", False)
+    assert await hedged_call(
+        lambda: reply("primary", 1), lambda: reply("backup", 0), delay_s=0.01
+    ) == ("backup", True)
+    assert await hedged_call(
+        lambda: reply("primary", 0, fail=True), lambda: reply("backup", 0), delay_s=1
+    ) == ("backup", False)
+    with pytest.raises(RuntimeError, match="primary"):
+        await hedged_call(
+            lambda: reply("primary", 0, fail=True), lambda: reply("backup", 0, fail=True), delay_s=1
+        )
+
+    assert cancelled == ["primary"]
+    assert metrics.counter("llm.hedge.calls") == 4
+    assert metrics.counter("llm.hedge.fired") == 1
+    assert metrics.counter("llm.hedge.wins") == 1
+    assert metrics.counter("llm.hedge.retries") == 2
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_hedges_slow_model_on_stub_server(settings_env, monkeypatch):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeDB:
+        async def get_chat_history(self, user_id, limit=10):
+            return []
+
+    async with OpenAIStubServer(latencies={"slow": 2.0, "fast": 0.0}) as server:
+        monkeypatch.setenv("OPENROUTER_BASE_URL", server.base_url)
+        monkeypatch.setenv("LLM_ROUTING_MODEL", "slow")
+        monkeypatch.setenv("LLM_HEDGE_MODEL", "fast")
+        monkeypatch.setenv("LLM_HEDGING_ENABLED", "true")
+        monkeypatch.setenv("LLM_HEDGE_DELAY_MS", "50")
+        get_settings.cache_clear()
+        get_http_clients.cache_clear()
+
+        agent = OrchestratorAgent()
+        agent.db = FakeDB()
+        agent.business_context._cache[date.today().year] = (float("inf"), [])
+        metrics.reset()
+        progress = []
+
+        async def on_reply_progress(text):
+            progress.append(text)
+
+        started = time.perf_counter()
+        invoked = await agent.analyze_message("Salut", user_id=1)
+        streamed = await agent.analyze_message(
+            "Bonjour", user_id=1, on_reply_progress=on_reply_progress
+        )
+        elapsed = time.perf_counter() - started
+        await get_http_clients().aclose()
+        get_http_clients.cache_clear()
+
+    assert invoked["reply_text"] == streamed["reply_text"] == "Bonjour"
+    assert progress and progress[-1] == "Bonjour"
+    assert [r["model"] for r in server.requests] == ["slow", "fast", "slow", "fast"]
+    assert server.completed == ["fast", "fast"]
+    assert server.cancelled == ["slow", "slow"]
+    assert metrics.counter("llm.hedge.wins") == 2
+    assert elapsed < 1.5
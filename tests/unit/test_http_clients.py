@@ -0,0 +1,83 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from execution.core.http_clients import HTTPClientRegistry
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    _CountingHandler.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_one_client_per_upstream_with_settings_limits(settings_env):
+    registry = HTTPClientRegistry(settings_env)
+
+    client = registry.get("openrouter")
+    assert registry.get("openrouter") is client
+    assert registry.get("openai") is not client
+    assert registry.limits.max_connections == settings_env.http_max_connections
+    assert registry.limits.keepalive_expiry == settings_env.http_keepalive_expiry_s
+    assert client.timeout.connect == settings_env.http_connect_timeout_s
+
+    with pytest.raises(ValueError):
+        registry.get("unknown")
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_and_recreated_after_close(settings_env, local_server):
+    registry = HTTPClientRegistry(settings_env)
+    client = registry.get("openai")
+
+    for _ in range(5):
+        response = await client.get(local_server)
+        assert response.status_code == 200
+    assert _CountingHandler.connections == 1
+
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.get("openai") is not client
+
+
+@pytest.mark.asyncio
+async def test_chat_model_uses_shared_client(settings_env):
+    from execution.core.http_clients import get_http_clients
+    from execution.core.llm import build_chat_model
+
+    get_http_clients.cache_clear()
+    try:
+        first = build_chat_model(settings_env)
+        second = build_chat_model(settings_env, model="openai/gpt-4o-mini")
+        shared = get_http_clients().get("openrouter")
+
+        assert first.http_async_client is shared
+        assert second.http_async_client is shared
+        assert second.model_name == "openai/gpt-4o-mini"
+    finally:
+        await get_http_clients().aclose()
+        get_http_clients.cache_clear()
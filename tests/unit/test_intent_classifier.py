@@ -0,0 +1,73 @@
+import pytest
+
+from execution.agents.intent_classifier import (
+    IntentClassifier,
+    fast_path_report,
+    record_fast_path,
+    seed_dataset,
+)
+from execution.core.metrics import metrics
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier(threshold=0.85).fit(*seed_dataset())
+
+
+@pytest.mark.parametrize(
+    "text,label",
+    [
+        ("Stats stp", "stats"),
+        ("Bonjour", "greeting"),
+        ("merci !!", "thanks"),
+    ],
+)
+def test_obvious_messages_take_fast_path(classifier, text, label):
+    prediction = classifier.predict(text)
+
+    assert prediction.label == label
+    assert prediction.fast_path
+    assert prediction.elapsed_ms < 50
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "facture ALTECA 500€",
+        "bonjour, une facture pour ALTECA stp",
+        "merci beaucoup pour le devis, envoie-le au client",
+        "ok",
+        "stats 2024",
+        "mes stats ce mois",
+        "stats de janvier",
+    ],
+)
+def test_document_and_ambiguous_messages_escalate(classifier, text):
+    assert not classifier.predict(text).fast_path
+
+
+def test_history_training_keeps_fast_path():
+    history = [
+        "facture pour ALTECA de 3 jours à 550€",
+        "quittance de loyer de mars 2025",
+        "merci",
+        "Merci beaucoup !",
+    ]
+    classifier = IntentClassifier().fit_with_history(history)
+
+    assert classifier.predict("merci").fast_path
+    assert not classifier.predict("facture pour ALTECA de 2 jours").fast_path
+
+
+def test_report_hit_rate_and_latency_saved(classifier):
+    metrics.reset()
+    metrics.observe("orchestrator.analyze_ms", 1200.0)
+
+    record_fast_path(classifier.predict("Bonjour"))
+    record_fast_path(classifier.predict("facture ALTECA 500€"))
+
+    report = fast_path_report()
+    assert report["hits"] == 1 and report["misses"] == 1
+    assert report["hit_rate"] == 0.5
+    assert 1100 < report["latency_saved_ms"] <= 1200
+    metrics.reset()
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from execution.agents.json_stream import IncrementalJSONParser
+
+ANSWER = (
+    'Voici :\n```json\n{"intent": "invoice", "confidence": 0.95, '
+    '"extracted_data": {"client_name": "A\\"B", "items": [{"quantity": 2}, {"tags": ["x", "}"]}]}, '
+    '"reply_text": "ok } ,"}\n```'
+)
+
+
+def test_fields_available_as_soon_as_complete():
+    parser = IncrementalJSONParser()
+    completed = []
+    for i in range(0, len(ANSWER), 5):
+        completed.append(parser.feed(ANSWER[i : i + 5]))
+
+    keys = [key for chunk in completed for key in chunk]
+    assert keys == ["intent", "confidence", "extracted_data", "reply_text"]
+    first_data_chunk = next(i for i, chunk in enumerate(completed) if "extracted_data" in chunk)
+    assert first_data_chunk * 5 < ANSWER.index('"reply_text"')
+    assert parser.fields["extracted_data"]["items"][1]["tags"] == ["x", "}"]
+    assert parser.fields["reply_text"] == "ok } ,"
+    assert parser.done
+
+
+def test_incomplete_object_is_not_done():
+    parser = IncrementalJSONParser()
+    parser.feed('{"intent": "chat", "reply_text": "Bonj')
+    assert parser.fields == {"intent": "chat"}
+    assert not parser.done
+
+
+@pytest.mark.asyncio
+async def test_intent_ready_before_reply_text(settings_env):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    tokens = [
+        '{"intent": "rent_receipt", "extracted_data": {"period_month": 3, ',
+        '"period_year": 2026}',
+        ', "reply_text": "',
+        "Je prépare",
+        ' la quittance"}',
+    ]
+    streamed = []
+
+    class FakeRunnable:
+        async def astream(self, variables):
+            for token in tokens:
+                streamed.append(token)
+                yield AIMessageChunk(content=token)
+
+    class FakeDB:
+        async def get_chat_history(self, user_id, limit=10):
+            return []
+
+    agent = OrchestratorAgent()
+    agent.db = FakeDB()
+    agent.business_context._cache[date.today().year] = (
+        float("inf"),
+        [{"id_data_administration": "quittance_loyer_1", "montant_loyer": "800"}],
+    )
+    agent.runnable = FakeRunnable()
+    ready = []
+
+    result = await agent.analyze_message(
+        "quittance de mars",
+        user_id=1,
+        on_intent_ready=lambda intent, data: ready.append((intent, data, len(streamed))),
+    )
+
+    assert ready == [
+        ("rent_receipt", {"period_month": 3, "period_year": 2026, "rent_amount": 800.0}, 2)
+    ]
+    assert result["extracted_data"] == ready[0][1]
+    assert result["reply_text"] == "Je prépare la quittance"
@@ -0,0 +1,118 @@
+from datetime import date
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from execution.core.llm import ModelRouter
+from execution.core.metrics import metrics
+
+
+@pytest.fixture
+def routed_settings(settings_env, monkeypatch):
+    from execution.core.config import get_settings
+
+    monkeypatch.setenv("LLM_ROUTING_MODEL", "small")
+    monkeypatch.setenv("LLM_FALLBACK_MODEL", "backup")
+    monkeypatch.setenv("LLM_INTENT_MODELS_RAW", '{"invoice": "large"}')
+    monkeypatch.setenv("LLM_LATENCY_BUDGET_P95_MS", "1000")
+    monkeypatch.setenv("LLM_LATENCY_MIN_SAMPLES", "5")
+    get_settings.cache_clear()
+    return get_settings()
+
+
+def test_models_per_stage_and_intent(routed_settings):
+    router = ModelRouter(routed_settings)
+
+    assert router.model_for("routing") == "small"
+    assert router.model_for("extraction", "invoice") == "large"
+    assert router.model_for("extraction", "quote") == "small"
+    assert router.chat_model("small") is router.chat_model("small")
+
+
+@pytest.mark.parametrize("raw", ['{"invoice": "large"', '["large"]', '{"invoice": 3}'])
+def test_invalid_intent_models_fail_at_startup(settings_env, monkeypatch, raw):
+    from pydantic import ValidationError
+
+    from execution.core.config import get_settings
+
+    monkeypatch.setenv("LLM_INTENT_MODELS_RAW", raw)
+    get_settings.cache_clear()
+    with pytest.raises(ValidationError):
+        get_settings()
+
+
+def test_fallback_when_p95_exceeds_budget(routed_settings, monkeypatch):
+    router = ModelRouter(routed_settings)
+    for _ in range(4):
+        router.record("small", 200)
+    router.record("small", 3000)
+    assert router.model_for("routing") == "backup"
+    assert router.p95("small") is None  # Mesures remises à zéro pour la reprise
+
+    # Fin de la période de secours : le modèle principal est réessayé
+    router._degraded_until["small"] = 0
+    assert router.model_for("routing") == "small"
+
+    for _ in range(10):
+        router.record("small", 200)
+    assert router.model_for("routing") == "small"
+
+
+@pytest.mark.asyncio
+async def test_document_extraction_escalates_to_intent_model(routed_settings):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeRunnable:
+        def __init__(self, content):
+            self.content = content
+            self.calls = 0
+
+        async def ainvoke(self, variables):
+            self.calls += 1
+            return AIMessage(content=self.content)
+
+    class FakeDB:
+        async def get_chat_history(self, user_id, limit=10):
+            return []
+
+    agent = OrchestratorAgent()
+    agent.db = FakeDB()
+    agent.business_context._cache[date.today().year] = (float("inf"), [])
+    agent.runnable = FakeRunnable(
+        '{"intent": "invoice", "extracted_data": {"client_name": "ALTECA"}}'
+    )
+    agent._runnables["large"] = FakeRunnable(
+        '{"intent": "invoice", "extracted_data": {"client_name": "ALTECA", "items": [{"unit_price": 500}]}}'
+    )
+    metrics.reset()
+
+    invoice = await agent.analyze_message("facture ALTECA 500€", user_id=1)
+    agent.runnable.content = '{"intent": "chat", "reply_text": "Bonjour"}'
+    chat = await agent.analyze_message("Salut", user_id=2)
+    # Réponse du routage complète : pas de second appel
+    agent.runnable.content = (
+        '{"intent": "invoice", "confidence": 0.8, "extracted_data": {"client_name": "ALTECA", '
+        '"client_address": "1 rue Example", "items": [{"description": "Dev", "unit_price": 500}]}}'
+    )
+    complete = await agent.analyze_message("facture ALTECA, 1 rue Example, dev à 500€", user_id=3)
+
+    assert invoice["extracted_data"]["items"] == [{"unit_price": 500}]
+    assert invoice["llm_iterations"] == 2
+    assert chat["llm_iterations"] == 1
+    assert complete["llm_iterations"] == 1 and complete["confidence"] == 0.8
+    assert agent.runnable.calls == 3 and agent._runnables["large"].calls == 1
+    assert metrics.counter("orchestrator.extraction_escalations") == 1
+    assert metrics.counter("orchestrator.final_answers") == 3
+
+
+def test_hedge_delay_follows_observed_latencies(routed_settings):
+    router = ModelRouter(routed_settings)
+
+    assert router.hedge_model("small") == "backup"
+    assert router.hedge_delay_s("small") == routed_settings.llm_hedge_delay_ms / 1000
+    for elapsed in (100, 200, 300, 400, 500):
+        router.record("small", elapsed)
+    assert router.hedge_delay_s("small") == 0.5
+    assert (
+        router.hedge_delay_s("small", first_token=True) == routed_settings.llm_hedge_delay_ms / 1000
+    )
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from execution.agents.orchestrator_agent import execute_tool_calls
+
+
+def _sleeping_tool(name, delay_s, tracker=None):
+    async def run(value: str) -> str:
+        if tracker is not None:
+            tracker["running"] += 1
+            tracker["max"] = max(tracker["max"], tracker["running"])
+        try:
+            await asyncio.sleep(delay_s)
+        finally:
+            if tracker is not None:
+                tracker["running"] -= 1
+        return f"{name}:{value}"
+
+    return StructuredTool.from_function(coroutine=run, name=name, description=name)
+
+
+def _call(name, value, call_id):
+    return {"name": name, "args": {"value": value}, "id": call_id}
+
+
+@pytest.mark.asyncio
+async def test_independent_calls_overlap_and_keep_order():
+    tools = {"slow": _sleeping_tool("slow", 0.3), "fast": _sleeping_tool("fast", 0.05)}
+    calls = [_call("slow", "a", "1"), _call("fast", "b", "2"), _call("slow", "c", "3")]
+
+    started = time.perf_counter()
+    messages = await execute_tool_calls(calls, tools, max_concurrency=4)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5  # séquentiel: 0.65 s
+    assert [m.tool_call_id for m in messages] == ["1", "2", "3"]
+    assert [m.content for m in messages] == ["slow:a", "fast:b", "slow:c"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    tracker = {"running": 0, "max": 0}
+    tools = {"work": _sleeping_tool("work", 0.05, tracker)}
+    calls = [_call("work", str(i), str(i)) for i in range(8)]
+
+    messages = await execute_tool_calls(calls, tools, max_concurrency=2)
+
+    assert tracker["max"] == 2
+    assert [m.tool_call_id for m in messages] == [str(i) for i in range(8)]
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_unknown_tool_become_error_messages():
+    tools = {"slow": _sleeping_tool("slow", 1.0), "fast": _sleeping_tool("fast", 0.0)}
+    calls = [_call("slow", "a", "1"), _call("missing", "b", "2"), _call("fast", "c", "3")]
+
+    messages = await execute_tool_calls(
+        calls, tools, default_timeout_s=5.0, timeouts={"slow": 0.05}
+    )
+
+    assert "timed out" in messages[0].content
+    assert messages[1].content == "Tool missing not found."
+    assert messages[2].content == "fast:c"
@@ -0,0 +1,288 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from reportlab.lib.units import cm
+from reportlab.pdfgen.canvas import Canvas
+
+from execution.models.database import DocumentType
+from execution.models.documents import Invoice, InvoiceItem, MileageRecord
+from execution.tools.pdf_generator import PDF_FILE_MODE, PDFGenerator
+
+COMPANY_INFO = {
+    "name": "Ma SASU",
+    "address": "1 rue Example, 75001 Paris",
+    "siret": "12345678900012",
+    "tva": "FR12345678901",
+}
+
+
+def _invoice(number="2025-0001"):
+    return Invoice(
+        invoice_number=number,
+        invoice_date=date(2025, 1, 15),
+        due_date=date(2025, 2, 14),
+        client_name="ALTECA",
+        client_address="1 rue Example, 75001 Paris",
+        items=[
+            InvoiceItem(
+                description="Développement", quantity=Decimal("1"), unit_price=Decimal("500")
+            )
+        ],
+    )
+
+
+def _mileage_records():
+    return [
+        MileageRecord(
+            travel_date=date(2025, 1, 15),
+            start_location="Paris",
+            end_location="Lyon",
+            distance_km=Decimal("465"),
+            purpose="Client",
+            fiscal_power=5,
+        )
+    ]
+
+
+def _assert_complete_pdf(path):
+    content = path.read_bytes()
+    assert content.startswith(b"%PDF-")
+    assert content.rstrip().endswith(b"%%EOF")
+
+
+def test_filename_contains_document_number(tmp_path):
+    pdf_gen = PDFGenerator(tmp_path)
+    path = pdf_gen.generate_invoice_pdf(_invoice("2025/0042"), COMPANY_INFO)
+    assert path.name.startswith("facture_2025-0042_")
+    _assert_complete_pdf(path)
+    assert path.stat().st_mode & 0o777 == PDF_FILE_MODE
+
+
+def test_concurrent_renders_never_collide(tmp_path):
+    pdf_gen = PDFGenerator(tmp_path)
+    invoice = _invoice()
+    records = _mileage_records()
+
+    def render(i):
+        # Même numéro de facture, et notes de frais sans numéro : mêmes préfixes dans la même seconde
+        if i % 2:
+            return pdf_gen.generate_invoice_pdf(invoice, COMPANY_INFO)
+        return pdf_gen.generate_mileage_pdf(records, COMPANY_INFO)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        paths = list(pool.map(render, range(300)))
+
+    assert len(set(paths)) == 300
+    for path in paths:
+        _assert_complete_pdf(path)
+    # Aucun fichier temporaire ne doit subsister
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_failed_render_leaves_no_partial_file(tmp_path, monkeypatch):
+    pdf_gen = PDFGenerator(tmp_path)
+
+    def broken_draw(c, invoice, company_info):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(pdf_gen, "_draw_invoice", broken_draw)
+    with pytest.raises(RuntimeError):
+        pdf_gen.generate_invoice_pdf(_invoice(), COMPANY_INFO)
+
+    assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+
+
+def test_render_report_and_page_compression(tmp_path):
+    compressed = PDFGenerator(tmp_path / "on", page_compression=True)
+    uncompressed = PDFGenerator(tmp_path / "off", page_compression=False)
+
+    data = _invoice().model_dump(mode="json")
+    report = compressed.render_document(DocumentType.INVOICE, data, COMPANY_INFO)
+    uncompressed_report = uncompressed.render_document(DocumentType.INVOICE, data, COMPANY_INFO)
+
+    assert report.document_type == "facture"
+    assert report.size_bytes == report.pdf_path.stat().st_size
+    assert report.render_ms > 0
+    assert report.size_bytes < uncompressed_report.size_bytes
+    assert not hasattr(compressed, "last_report")
+
+
+def test_concurrent_render_reports_are_not_shared(tmp_path):
+    pdf_gen = PDFGenerator(tmp_path)
+    data = _invoice().model_dump(mode="json")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        reports = list(
+            pool.map(
+                lambda _: pdf_gen.render_document(DocumentType.INVOICE, data, COMPANY_INFO),
+                range(40),
+            )
+        )
+
+    assert len({report.pdf_path for report in reports}) == 40
+    for report in reports:
+        assert report.size_bytes == report.pdf_path.stat().st_size
+
+
+def test_embedded_ttf_font_changes_template_version(tmp_path):
+    import os
+
+    import reportlab
+
+    font_path = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+    pdf_gen = PDFGenerator(tmp_path, font_path=font_path)
+
+    path = pdf_gen.generate_invoice_pdf(_invoice(), COMPANY_INFO)
+
+    assert pdf_gen.font_regular == pdf_gen.font_bold == "Vera"
+    assert pdf_gen.template_version != PDFGenerator(tmp_path).template_version
+    # Police TrueType embarquée dans le PDF
+    assert b"FontFile2" in path.read_bytes()
+
+
+def test_logo_is_decoded_once_and_embedded(tmp_path):
+    from PIL import Image
+
+    from execution.tools.pdf_generator import _load_image_asset
+
+    logo_path = tmp_path / "logo.png"
+    Image.new("RGB", (200, 50), "navy").save(logo_path)
+    _load_image_asset.cache_clear()
+
+    pdf_gen = PDFGenerator(tmp_path / "out", logo_path=str(logo_path))
+    PDFGenerator(tmp_path / "out", logo_path=str(logo_path))
+    path = pdf_gen.generate_invoice_pdf(_invoice(), COMPANY_INFO)
+
+    assert _load_image_asset.cache_info().misses == 1
+    assert b"/Subtype /Image" in path.read_bytes()
+    assert "+logo:" in pdf_gen.template_version
+
+
+def test_logo_on_every_page_and_signature_above_margin(tmp_path, monkeypatch):
+    from PIL import Image
+    from pypdf import PdfReader
+
+    from execution.models.documents import ChargeItem, RentalCharges
+
+    logo_path = tmp_path / "logo.png"
+    Image.new("RGB", (200, 50), "navy").save(logo_path)
+    pdf_gen = PDFGenerator(
+        tmp_path / "out", logo_path=str(logo_path), signature_path=str(logo_path)
+    )
+    invoice = _invoice()
+    invoice.items = [
+        InvoiceItem(description="Développement", quantity=Decimal("1"), unit_price=Decimal("10"))
+    ] * 60
+
+    pages = PdfReader(pdf_gen.generate_invoice_pdf(invoice, COMPANY_INFO)).pages
+    assert len(pages) > 1
+    assert all(page["/Resources"].get("/XObject") for page in pages)
+
+    images = []
+    draw_image = Canvas.drawImage
+
+    def spy(self, image, x, y, *args, **kwargs):
+        images.append((self.getPageNumber(), y))
+        return draw_image(self, image, x, y, *args, **kwargs)
+
+    monkeypatch.setattr(Canvas, "drawImage", spy)
+    charges = RentalCharges(
+        period_start=date(2024, 1, 1),
+        period_end=date(2024, 12, 31),
+        tenant_name="Jean Dupont",
+        property_address="2 rue Example, 75002 Paris",
+        charges=[ChargeItem(label=f"Poste {i}", amount=Decimal("10")) for i in range(30)],
+    )
+    pdf_gen.generate_rental_charges_pdf(charges, COMPANY_INFO)
+
+    # Logo en tête de chaque page, signature (dernière image) au-dessus de la marge basse
+    assert [page for page, _ in images[:-1]] == list(range(1, images[-1][0] + 1))
+    assert images[-1][1] >= 3 * cm
+
+
+def test_missing_logo_is_ignored(tmp_path):
+    pdf_gen = PDFGenerator(tmp_path, logo_path=str(tmp_path / "absent.png"))
+    path = pdf_gen.generate_invoice_pdf(_invoice(), COMPANY_INFO)
+
+    assert pdf_gen.logo is None
+    assert pdf_gen.template_version == PDFGenerator(tmp_path).template_version
+    _assert_complete_pdf(path)
+
+
+def test_wrap_text_fits_column_and_keeps_all_words():
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    from execution.tools.pdf_generator import _wrap_text
+
+    text = "Développement d'une application de gestion administrative avec intégration Telegram et génération de PDF"
+    lines = _wrap_text(text, "Helvetica", 9, 150)
+
+    assert len(lines) > 1
+    assert all(stringWidth(line, "Helvetica", 9) <= 150 for line in lines)
+    assert " ".join(lines) == text
+    # Mot plus large que la colonne : coupé au caractère
+    assert "".join(_wrap_text("x" * 200, "Helvetica", 9, 50)) == "x" * 200
+
+
+def test_long_descriptions_are_not_truncated(tmp_path):
+    description = "Prestation de conseil " * 10 + "FIN-DE-DESCRIPTION"
+    invoice = _invoice()
+    invoice.items = [
+        InvoiceItem(description=description, quantity=Decimal("1"), unit_price=Decimal("10"))
+    ] * 60
+
+    pdf_gen = PDFGenerator(tmp_path, page_compression=False)
+    path = pdf_gen.generate_invoice_pdf(invoice, COMPANY_INFO)
+
+    content = path.read_bytes()
+    assert content.count(b"FIN-DE-DESCRIPTION") == 60
+    # Les lignes débordent sur plusieurs pages au lieu de sortir de la page
+    assert content.count(b"/Type /Page\n") > 1
+
+
+def test_table_header_repeated_on_continuation_pages(tmp_path):
+    from pypdf import PdfReader
+
+    invoice = _invoice()
+    invoice.items = [
+        InvoiceItem(description="Développement", quantity=Decimal("1"), unit_price=Decimal("10"))
+    ] * 60
+    records = _mileage_records() * 80
+    pdf_gen = PDFGenerator(tmp_path)
+
+    for path, header, row in (
+        (pdf_gen.generate_invoice_pdf(invoice, COMPANY_INFO), "P.U. HT", "Développement"),
+        (pdf_gen.generate_mileage_pdf(records, COMPANY_INFO), "Tarif/km", "465.0 km"),
+    ):
+        # Chaque page qui porte des lignes du tableau commence par ses en-têtes
+        texts = [page.extract_text() for page in PdfReader(path).pages]
+        with_rows = [text for text in texts if row in text]
+        assert len(with_rows) > 1
+        assert all(header in text for text in with_rows)
+
+
+def test_wrapped_descriptions_stay_above_bottom_margin(tmp_path, monkeypatch):
+    drawn = []
+    draw_string = Canvas.drawString
+
+    def spy(self, x, y, text, *args, **kwargs):
+        drawn.append((y, text))
+        return draw_string(self, x, y, text, *args, **kwargs)
+
+    monkeypatch.setattr(Canvas, "drawString", spy)
+    description = "Prestation de conseil " * 10 + "FIN-DE-DESCRIPTION"
+    invoice = _invoice()
+    invoice.items = [
+        InvoiceItem(description=description, quantity=Decimal("1"), unit_price=Decimal("10"))
+    ] * 25
+
+    PDFGenerator(tmp_path).generate_invoice_pdf(invoice, COMPANY_INFO)
+
+    description_lines = [
+        y for y, text in drawn if "conseil" in text or "FIN-DE-DESCRIPTION" in text
+    ]
+    assert len(description_lines) > 25
+    # Toute la description d'une ligne tient au-dessus de la marge basse
+    assert min(description_lines) >= 3 * cm
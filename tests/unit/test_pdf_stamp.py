@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from pypdf import PdfReader
+
+from execution.models.documents import Invoice, InvoiceItem
+from execution.tools.pdf_generator import PDF_FILE_MODE, PDFGenerator
+from execution.tools.pdf_stamp import render_stamp_page, stamp_paid
+
+COMPANY_INFO = {
+    "name": "Ma SASU",
+    "address": "1 rue Example, 75001 Paris",
+    "siret": "12345678900012",
+    "tva": "FR12345678901",
+}
+
+
+@pytest.fixture
+def invoice_pdf(tmp_path):
+    invoice = Invoice(
+        invoice_number="2025-0001",
+        invoice_date=date(2025, 1, 15),
+        due_date=date(2025, 2, 14),
+        client_name="ALTECA",
+        client_address="1 rue Example, 75001 Paris",
+        items=[
+            InvoiceItem(
+                description="Développement", quantity=Decimal("1"), unit_price=Decimal("500")
+            )
+        ],
+    )
+    return PDFGenerator(tmp_path).generate_invoice_pdf(invoice, COMPANY_INFO)
+
+
+def test_stamp_paid_overlays_first_page(invoice_pdf):
+    original = invoice_pdf.read_bytes()
+
+    stamped = stamp_paid(invoice_pdf, date(2025, 3, 1))
+
+    assert stamped != invoice_pdf
+    assert invoice_pdf.read_bytes() == original
+    reader = PdfReader(stamped)
+    assert len(reader.pages) == len(PdfReader(invoice_pdf).pages)
+    text = reader.pages[0].extract_text()
+    assert "PAYÉE le 01/03/2025" in text
+    assert "FACTURE" in text
+    assert not list(stamped.parent.glob("*.tmp"))
+    assert stamped.stat().st_mode & 0o777 == PDF_FILE_MODE
+
+
+def test_stamp_page_rendered_once(invoice_pdf):
+    render_stamp_page.cache_clear()
+
+    stamp_paid(invoice_pdf, date(2025, 3, 1))
+    stamp_paid(invoice_pdf, date(2025, 3, 1))
+
+    info = render_stamp_page.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
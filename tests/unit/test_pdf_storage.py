@@ -0,0 +1,207 @@
+import os
+import time
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from pypdf import PdfReader
+
+from execution.models.database import Document, DocumentType
+from execution.tools import pdf_generator
+from execution.tools.pdf_generator import PDFGenerator
+from execution.tools.pdf_storage import PDFStorageManager
+
+COMPANY_INFO = {
+    "name": "Ma SASU",
+    "address": "1 rue Example, 75001 Paris",
+    "siret": "12345678900012",
+    "tva": "FR12345678901",
+}
+
+
+def _write_pdf(path, size, age_s):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age_s
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def storage(tmp_path):
+    pdf_gen = PDFGenerator(tmp_path / "documents")
+    db = AsyncMock()
+    return PDFStorageManager(pdf_gen, db, max_bytes=250, max_age_days=30)
+
+
+def test_evicts_least_recently_used_over_size_budget(storage):
+    root = storage.root_dir
+    oldest = _write_pdf(root / "2025" / "01" / "a.pdf", 100, age_s=300)
+    middle = _write_pdf(root / "2025" / "02" / "b.pdf", 100, age_s=200)
+    newest = _write_pdf(root / "2025" / "03" / "c.pdf", 100, age_s=100)
+
+    evicted = storage.enforce_budget()
+
+    assert evicted == [oldest]
+    assert not oldest.exists() and middle.exists() and newest.exists()
+    # Le répertoire de mois vidé est supprimé
+    assert not (root / "2025" / "01").exists()
+
+
+def test_touch_protects_recently_used(storage):
+    root = storage.root_dir
+    oldest = _write_pdf(root / "a.pdf", 100, age_s=300)
+    middle = _write_pdf(root / "b.pdf", 100, age_s=200)
+    _write_pdf(root / "c.pdf", 100, age_s=100)
+
+    storage.touch(oldest)
+
+    assert storage.enforce_budget() == [middle]
+
+
+def test_evicts_files_older_than_max_age(storage):
+    root = storage.root_dir
+    stale = _write_pdf(root / "old.pdf", 10, age_s=31 * 86400)
+    fresh = _write_pdf(root / "new.pdf", 10, age_s=60)
+
+    assert storage.enforce_budget() == [stale]
+    assert fresh.exists()
+
+
+def test_enforce_budget_if_due_is_throttled(storage):
+    root = storage.root_dir
+    storage.sweep_interval_s = 3600
+    storage.enforce_budget_if_due()
+    stale = _write_pdf(root / "old.pdf", 10, age_s=31 * 86400)
+
+    assert storage.enforce_budget_if_due() == []
+    assert stale.exists()
+
+
+@pytest.mark.asyncio
+async def test_ensure_available_rerenders_missing_pdf(storage, tmp_path):
+    document = Document(
+        id=7,
+        document_type=DocumentType.RENT_RECEIPT,
+        document_number="QUIT-2025-0001",
+        pdf_path=str(tmp_path / "evicted.pdf"),
+        data={
+            "receipt_number": "QUIT-2025-0001",
+            "period_month": 1,
+            "period_year": 2025,
+            "tenant_name": "Jean Dupont",
+            "tenant_address": "2 rue Example, 75002 Paris",
+            "property_address": "2 rue Example, 75002 Paris",
+            "rent_amount": "800",
+            "charges_amount": "50",
+            "payment_date": "2025-01-05",
+            "payment_method": "virement",
+        },
+    )
+
+    pdf_path = await storage.ensure_available(document, COMPANY_INFO)
+
+    assert pdf_path.is_file()
+    assert pdf_path.read_bytes().startswith(b"%PDF")
+    assert storage.root_dir in pdf_path.parents
+    storage.db.update_document_pdf_path.assert_awaited_once_with(7, str(pdf_path))
+
+
+@pytest.mark.asyncio
+async def test_ensure_available_restamps_paid_invoice(storage, tmp_path):
+    from datetime import datetime
+
+    from pypdf import PdfReader
+
+    document = Document(
+        id=8,
+        document_type=DocumentType.INVOICE,
+        document_number="2025-0001",
+        pdf_path=str(tmp_path / "evicted_payee.pdf"),
+        paid_at=datetime(2025, 3, 1, 10, 0),
+        data={
+            "invoice_number": "2025-0001",
+            "invoice_date": "2025-01-15",
+            "due_date": "2025-02-14",
+            "client_name": "ALTECA",
+            "client_address": "1 rue Example, 75001 Paris",
+            "items": [
+                {"description": "Dev", "quantity": "1", "unit_price": "500", "vat_rate": "0.20"}
+            ],
+        },
+    )
+
+    pdf_path = await storage.ensure_available(document, COMPANY_INFO)
+
+    assert pdf_path.name.endswith("_payee.pdf")
+    assert "PAYÉE le 01/03/2025" in PdfReader(pdf_path).pages[0].extract_text()
+    assert document.pdf_path == str(pdf_path)
+
+
+class _FrozenDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2025, 3, 20)
+
+
+@pytest.mark.asyncio
+async def test_rerender_after_eviction_keeps_original_dates(storage, monkeypatch):
+    receipt_data = {
+        "receipt_number": "QUIT-2025-0001",
+        "period_month": 1,
+        "period_year": 2025,
+        "tenant_name": "Jean Dupont",
+        "tenant_address": "2 rue Example, 75002 Paris",
+        "property_address": "2 rue Example, 75002 Paris",
+        "rent_amount": "800",
+        "payment_date": "2025-01-05",
+        "issued_on": "2025-01-06",
+    }
+    # Décompte enregistré avant issued_on : la date de création en base fait foi
+    charges_data = {
+        "document_number": "REGUL-2024-0001",
+        "period_start": "2024-01-01",
+        "period_end": "2024-12-31",
+        "tenant_name": "Jean Dupont",
+        "property_address": "2 rue Example, 75002 Paris",
+        "charges": [{"label": "Eau", "amount": "120"}],
+    }
+    documents = [
+        Document(
+            id=1,
+            document_type=DocumentType.RENT_RECEIPT,
+            document_number="QUIT-2025-0001",
+            data=receipt_data,
+        ),
+        Document(
+            id=2,
+            document_type=DocumentType.RENTAL_CHARGES,
+            document_number="REGUL-2024-0001",
+            data=charges_data,
+            created_at=datetime(2025, 1, 6, 9, 30),
+        ),
+    ]
+    originals = {}
+    for document in documents:
+        issued_on = document.created_at and document.created_at.date()
+        path = storage.pdf_gen.render_document(
+            document.document_type, document.data, COMPANY_INFO, issued_on
+        ).pdf_path
+        document.pdf_path = str(path)
+        originals[document.id] = (
+            path.relative_to(storage.root_dir).parent,
+            PdfReader(path).pages[0].extract_text(),
+        )
+
+    storage.max_bytes = 0
+    assert len(storage.enforce_budget()) == 2
+
+    monkeypatch.setattr(pdf_generator, "date", _FrozenDate)
+    for document in documents:
+        pdf_path = await storage.ensure_available(document, COMPANY_INFO)
+        shard, text = originals[document.id]
+
+        assert pdf_path.relative_to(storage.root_dir).parent == shard == Path("2025/01")
+        assert PdfReader(pdf_path).pages[0].extract_text() == text
+        assert "06/01/2025" in text and "20/03/2025" not in text
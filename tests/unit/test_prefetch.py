@@ -0,0 +1,133 @@
+import asyncio
+from datetime import date
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from execution.agents.base_admin_agent import BaseAdminAgent
+from execution.agents.business_context import BusinessContextProvider
+from execution.agents.prefetch import SpeculativePrefetcher, guess_intent, prefetch_report
+from execution.core.metrics import metrics
+from execution.models.database import Base, DataAdministration, DocumentType
+from execution.tools.db_manager import DatabaseManager
+
+ROWS = [{"id_data_administration": "facturation_client_1", "nom_client": "ALTECA"}]
+
+
+@pytest.fixture
+async def sqlite_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.engine = engine
+    db.async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield db
+    await engine.dispose()
+
+
+def test_guess_intent_from_cheap_signals():
+    assert guess_intent("Fais une facture, 5 jours à 500€", ROWS) == "invoice"
+    assert guess_intent("Devis pour Apple", ROWS) == "quote"
+    assert guess_intent("Quittance de loyer de mars", ROWS) == "rent_receipt"
+    assert guess_intent("Régularisation des charges 2025", ROWS) == "rental_charges"
+    assert guess_intent("Paris Lyon 465 km", ROWS) == "mileage"
+    assert guess_intent("5 jours de dev pour alteca", ROWS) == "invoice"
+    assert guess_intent("Salut, ça va ?", ROWS) is None
+
+
+@pytest.mark.asyncio
+async def test_prefetch_hit_miss_and_cancel(sqlite_db):
+    async with sqlite_db.async_session_maker() as session:
+        session.add(
+            DataAdministration(
+                id_data_administration="facturation_client_1",
+                annee=date.today().year,
+                nom_client="ALTECA",
+            )
+        )
+        await session.commit()
+    built = []
+    context = BusinessContextProvider(sqlite_db)
+    prefetcher = SpeculativePrefetcher(SimpleNamespace(get=built.append, db=sqlite_db), context)
+    metrics.reset()
+
+    task = prefetcher.start("3 jours de dev pour ALTECA")
+    await asyncio.wait([task])
+    lease = prefetcher.take(task, "invoice")
+    assert lease.number == f"{date.today().year}-0001" and built == ["invoice"]
+    assert (
+        date.today().year in context._cache
+    )  # data_administration déjà en cache pour l'orchestrateur
+
+    task = prefetcher.start("Devis pour Apple")
+    await asyncio.wait([task])
+    assert prefetcher.take(task, "chat") is None
+
+    task = prefetcher.start("Devis pour Apple")
+    assert prefetcher.take(task, "quote") is None  # Inachevé : annulé
+    await asyncio.sleep(0)
+    assert task.cancelled()
+
+    report = prefetch_report()
+    assert (report["hits"], report["misses"]) == (1, 2)
+    assert metrics.counter("prefetch.misses.quote") == 1
+
+
+@pytest.mark.asyncio
+async def test_period_numbered_documents_get_no_lease(sqlite_db):
+    prefetcher = SpeculativePrefetcher(
+        SimpleNamespace(get=lambda intent: None, db=sqlite_db), BusinessContextProvider(sqlite_db)
+    )
+
+    for text, intent in (
+        ("Quittance de loyer de décembre 2024", "rent_receipt"),
+        ("Régularisation des charges 2024", "rental_charges"),
+    ):
+        task = prefetcher.start(text)
+        await asyncio.wait([task])
+        assert task.result().intent == intent
+        assert prefetcher.take(task, intent) is None
+
+
+@pytest.mark.asyncio
+async def test_leased_number_reused_until_a_document_is_saved(sqlite_db):
+    year = date.today().year
+    agent = SimpleNamespace(db=sqlite_db)
+    allocate = partial(sqlite_db.get_next_invoice_number, year)
+    lease = await sqlite_db.lease_next_number("invoice", year)
+    state = {"request_type": "invoice", "number_lease": lease}
+    metrics.reset()
+
+    assert await BaseAdminAgent.document_number(agent, state, allocate, year) == f"{year}-0001"
+    assert (
+        await BaseAdminAgent.document_number(
+            agent, {**state, "request_type": "quote"}, allocate, year
+        )
+        == f"{year}-0001"
+    )
+    await sqlite_db.save_document(DocumentType.INVOICE, f"{year}-0001", {}, None, user_id=1)
+    assert await BaseAdminAgent.document_number(agent, state, allocate, year) == f"{year}-0002"
+    assert metrics.counter("prefetch.lease_used") == 1
+    assert metrics.counter("prefetch.lease_stale") == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_context_loads_share_one_query(sqlite_db):
+    context = BusinessContextProvider(sqlite_db)
+    queries = []
+    real_maker = sqlite_db.async_session_maker
+
+    def counting_maker():
+        queries.append(1)
+        return real_maker()
+
+    sqlite_db.async_session_maker = counting_maker
+    speculative = asyncio.create_task(context.rows())
+    await asyncio.sleep(0)
+    speculative.cancel()  # Annuler le préchargement n'interrompt pas la lecture partagée
+    assert await context.rows() == []
+    assert len(queries) == 1
@@ -0,0 +1,110 @@
+import json
+from datetime import date
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from benchmarks.openai_stub import OpenAIStubServer
+from execution.core.config import get_settings
+from execution.core.http_clients import get_http_clients
+from execution.core.usage import TurnUsage
+
+
+def _variables(current_date, history=(), scratchpad=()):
+    return {
+        "input": "Facture ALTECA",
+        "history": list(history),
+        "agent_scratchpad": list(scratchpad),
+        "current_date": current_date,
+        "business_context": "BUSINESS CONTEXT: ALTECA",
+    }
+
+
+def test_static_prefix_first_and_marked_for_cache(settings_env):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    agent = OrchestratorAgent()
+    history = [HumanMessage(content="Bonjour"), AIMessage(content="Bonjour !")]
+    scratchpad = [
+        AIMessage(content="", tool_calls=[{"name": "calculator", "args": {}, "id": "call_1"}]),
+        ToolMessage(content="42", tool_call_id="call_1"),
+    ]
+    first = agent.prompt.format_messages(**_variables("2026-03-01 10:00:00"))
+    later = agent.prompt.format_messages(**_variables("2026-03-02 18:30:00", history, scratchpad))
+
+    assert first[0] == later[0]  # Préfixe identique d'un appel à l'autre
+    [block] = first[0].content
+    assert block["cache_control"] == {"type": "ephemeral"}
+    assert "{{" not in block["text"] and "{" in block["text"]
+    assert [type(m).__name__ for m in later] == [
+        "SystemMessage",
+        "HumanMessage",
+        "AIMessage",
+        "SystemMessage",
+        "HumanMessage",
+        "AIMessage",
+        "ToolMessage",
+    ]
+    assert "2026-03-02" in later[3].content and "ALTECA" in later[3].content
+    assert isinstance(later[0], SystemMessage) and "2026" not in block["text"]
+
+
+def test_prompt_caching_can_be_disabled(settings_env, monkeypatch):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    monkeypatch.setenv("LLM_PROMPT_CACHING_ENABLED", "false")
+    get_settings.cache_clear()
+
+    [block] = OrchestratorAgent().prompt.format_messages(**_variables("2026-03-01"))[0].content
+    assert "cache_control" not in block
+
+
+def test_turn_usage_counts_cached_prompt_tokens():
+    usage = TurnUsage(user_id=1)
+    usage.add_llm_call(
+        "m",
+        10,
+        AIMessage(
+            content="",
+            usage_metadata={
+                "input_tokens": 2000,
+                "output_tokens": 10,
+                "total_tokens": 2010,
+                "input_token_details": {"cache_read": 1800},
+            },
+        ),
+    )
+    usage.add_llm_call("m", 10, AIMessage(content=""))
+
+    assert usage.as_record("chat")["cached_tokens"] == 1800
+
+
+@pytest.mark.asyncio
+async def test_requests_share_a_byte_identical_prefix(settings_env, monkeypatch):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeDB:
+        async def get_chat_history(self, user_id, limit=10):
+            return []
+
+    async with OpenAIStubServer() as server:
+        monkeypatch.setenv("OPENROUTER_BASE_URL", server.base_url)
+        get_settings.cache_clear()
+        get_http_clients.cache_clear()
+
+        agent = OrchestratorAgent()
+        agent.db = FakeDB()
+        agent.business_context._cache[date.today().year] = (float("inf"), [])
+        await agent.analyze_message("Salut", user_id=1)
+        await agent.analyze_message("Bonjour", user_id=1)
+        await get_http_clients().aclose()
+        get_http_clients.cache_clear()
+
+    first, second = server.requests
+
+    def prefix(request):
+        return json.dumps([request["tools"], request["messages"][0]], sort_keys=True)
+
+    assert prefix(first) == prefix(second)
+    assert first["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert first["messages"][-1] == {"role": "user", "content": "Salut"}
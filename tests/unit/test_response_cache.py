@@ -0,0 +1,174 @@
+from datetime import date
+
+import pytest
+from langchain_core.messages import AIMessage
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from execution.agents.response_cache import ResponseCache, redate
+from execution.core.metrics import metrics
+from execution.models.database import Base
+from execution.tools.db_manager import DatabaseManager
+
+RENT_RESULT = {
+    "intent": "rent_receipt",
+    "confidence": 1.0,
+    "extracted_data": {
+        "tenant_name": "Dupont",
+        "period_month": 12,
+        "period_year": 2025,
+        "payment_date": "2025-12-05",
+    },
+    "reply_text": None,
+    "tool_calls": [{"name": "database_query", "args": {"query_type": "quittance_info"}}],
+    "llm_iterations": 2,
+}
+
+
+@pytest.fixture
+async def sqlite_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.engine = engine
+    db.async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield db
+    await engine.dispose()
+
+
+def test_key_normalizes_and_applies_bypass_rules():
+    cache = ResponseCache()
+
+    assert cache.key("Quittance de ce mois pour Dupont !", []) == cache.key(
+        "quittance de ce  mois pour DUPONT", []
+    )
+    assert cache.key("quittance de ce mois pour Dupont", []).startswith("month||")
+    assert cache.key("!quittance de ce mois pour Dupont", []) is None
+    assert cache.key("Vas-y", []) is None
+    assert cache.key("C'est bon", []) is None
+
+    # Référence à la conversation : l'historique entre dans la clé
+    history_a = [{"role": "user", "content": "facture ALTECA 3 jours"}]
+    history_b = [{"role": "user", "content": "facture Apple 2 jours"}]
+    assert cache.key("la même pour janvier", history_a) != cache.key(
+        "la même pour janvier", history_b
+    )
+
+
+def test_redate_by_bucket():
+    cached_on, today = date(2025, 12, 5), date(2026, 1, 20)
+
+    month = redate(RENT_RESULT["extracted_data"], "month", cached_on, today)
+    assert (month["period_month"], month["period_year"], month["payment_date"]) == (
+        1,
+        2026,
+        "2026-01-05",
+    )
+
+    assert redate({"travel_date": "2025-12-04"}, "day", cached_on, today) == {
+        "travel_date": "2026-01-19"
+    }
+    assert redate(
+        {"invoice_date": "2025-12-05", "due_date": "2026-02-01"}, "absolute", cached_on, today
+    ) == {
+        "invoice_date": "2026-01-20",
+        "due_date": "2026-02-01",
+    }
+
+
+def test_put_rules_eviction_and_user_scope():
+    cache = ResponseCache(max_entries_per_user=2)
+    key = cache.key("quittance de ce mois pour Dupont", [])
+
+    assert not cache.put(1, key, {**RENT_RESULT, "intent": "chat"})
+    assert not cache.put(
+        1, key, {**RENT_RESULT, "tool_calls": [{"name": "send_email", "args": {}}]}
+    )
+    assert cache.put(1, key, RENT_RESULT, today=date(2025, 12, 5))
+    assert cache.get(2, key) is None
+
+    hit = cache.get(1, key, today=date(2026, 1, 20))
+    assert hit["extracted_data"]["period_month"] == 1 and hit["llm_iterations"] == 0
+
+    cache.put(1, cache.key("frais km Paris Lyon", []), {**RENT_RESULT, "intent": "mileage"})
+    cache.put(1, cache.key("frais km Paris Lille", []), {**RENT_RESULT, "intent": "mileage"})
+    assert cache.get(1, cache.key("frais km Paris Lyon", [])) is not None
+    assert cache.get(1, key) is None  # Entrée la moins récemment utilisée évincée
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_skips_llm(settings_env, sqlite_db):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeRunnable:
+        def __init__(self):
+            self.calls = 0
+
+        async def ainvoke(self, variables):
+            self.calls += 1
+            return AIMessage(
+                content='{"intent": "rent_receipt", "extracted_data": {"period_month": 3, "period_year": 2026}}'
+            )
+
+    agent = OrchestratorAgent()
+    agent.db = sqlite_db
+    agent.business_context._cache[date.today().year] = (float("inf"), [])
+    agent.runnable = FakeRunnable()
+    metrics.reset()
+
+    first = await agent.analyze_message("Quittance de mars 2026 pour Dupont", user_id=1)
+    second = await agent.analyze_message("quittance de mars 2026 pour dupont", user_id=1)
+    forced = await agent.analyze_message("!quittance de mars 2026 pour dupont", user_id=1)
+
+    assert agent.runnable.calls == 2
+    assert second["extracted_data"] == first["extracted_data"]
+    assert second["llm_iterations"] == 0 and forced["llm_iterations"] == 1
+    assert metrics.counter("response_cache.hits") == 1
+    assert metrics.counter("response_cache.bypass") == 1
+
+
+@pytest.mark.asyncio
+async def test_business_context_change_invalidates_cached_result(settings_env, sqlite_db):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeRunnable:
+        def __init__(self):
+            self.calls = 0
+
+        async def ainvoke(self, variables):
+            self.calls += 1
+            return AIMessage(
+                content='{"intent": "invoice", "extracted_data": {"client_name": "ALTECA", "items": [{"description": "Dev", "quantity": 5}]}}'
+            )
+
+    def set_rows(address):
+        agent.business_context._cache[date.today().year] = (
+            float("inf"),
+            [
+                {
+                    "id_data_administration": "facturation_client_1",
+                    "nom_client": "ALTECA",
+                    "adresse_client": address,
+                    "prix_unitaire": "500",
+                }
+            ],
+        )
+
+    agent = OrchestratorAgent()
+    agent.db = sqlite_db
+    agent.runnable = FakeRunnable()
+    set_rows("1 rue Example, 75001 Paris")
+
+    first = await agent.analyze_message("Facture ALTECA 5 jours de dev", user_id=1)
+    second = await agent.analyze_message("Facture ALTECA 5 jours de dev", user_id=1)
+    set_rows("2 avenue Nouvelle, 69001 Lyon")
+    third = await agent.analyze_message("Facture ALTECA 5 jours de dev", user_id=1)
+
+    assert agent.runnable.calls == 2
+    assert second["llm_iterations"] == 0
+    assert first["extracted_data"]["client_address"] == second["extracted_data"]["client_address"]
+    assert third["extracted_data"]["client_address"] == "2 avenue Nouvelle, 69001 Lyon"
+    # Le cache conserve les données avant enrichissement
+    cached = next(iter(agent.response_cache._entries[1].values()))
+    assert "client_address" not in cached.result["extracted_data"]
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import date
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from execution.agents.orchestrator_agent import partial_reply_text
+from execution.tools.telegram_helpers import TelegramStreamWriter
+
+
+class FakeMessage:
+    def __init__(self):
+        self.calls = []
+
+    async def reply_text(self, text, parse_mode=None):
+        self.calls.append(("send", text, parse_mode))
+        return self
+
+    async def edit_text(self, text, parse_mode=None):
+        self.calls.append(("edit", text, parse_mode))
+        return self
+
+
+def test_partial_reply_text():
+    assert partial_reply_text('{"intent": "chat", "reply_text": "Bonjour\\n\\u00e9') == "Bonjour\né"
+    assert partial_reply_text('{"intent": "chat", "reply_text": "Bon\\u00') == "Bon"
+    assert partial_reply_text('{"intent": "invoice", "reply_text": "Facture') is None
+    assert partial_reply_text('{"intent": "ch') is None
+    assert partial_reply_text("Salut") == "Salut"
+
+
+@pytest.mark.asyncio
+async def test_writer_rate_limits_edits_and_finalizes_in_html():
+    message = FakeMessage()
+    writer = TelegramStreamWriter(message, min_interval_s=0.05)
+
+    for i in range(1, 30):
+        await writer.push("mot " * i)
+        await asyncio.sleep(0.005)
+    await writer.finalize("<b>Réponse</b>")
+
+    sends = [c for c in message.calls if c[0] == "send"]
+    edits = [c for c in message.calls if c[0] == "edit"]
+    assert len(sends) == 1 and sends[0][2] is None
+    assert 1 <= len(edits) < 10
+    assert message.calls[-1] == ("edit", "<b>Réponse</b>", "HTML")
+    assert writer.first_visible_at is not None
+
+
+@pytest.mark.asyncio
+async def test_chat_reply_streamed_from_first_tokens(settings_env):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    tokens = ['{"intent": "chat", ', '"reply_text": "', "Bonjour", " **à vous**", '"}']
+
+    class FakeRunnable:
+        async def astream(self, variables):
+            for token in tokens:
+                yield AIMessageChunk(content=token)
+
+    class FakeDB:
+        async def get_chat_history(self, user_id, limit=10):
+            return []
+
+    agent = OrchestratorAgent()
+    agent.db = FakeDB()
+    agent.business_context._cache[date.today().year] = (float("inf"), [])
+    agent.runnable = FakeRunnable()
+    progress = []
+
+    async def on_reply_progress(text):
+        progress.append(text)
+
+    result = await agent.analyze_message("Salut", user_id=1, on_reply_progress=on_reply_progress)
+
+    assert progress == ["Bonjour", "Bonjour **à vous**"]
+    assert result["intent"] == "chat"
+    assert result["reply_text"] == "Bonjour <b>à vous</b>"
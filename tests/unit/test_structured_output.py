@@ -0,0 +1,176 @@
+from datetime import date
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from execution.core.metrics import metrics
+from execution.models.intent_results import (
+    FINAL_ANSWER_TOOL,
+    final_answer_tool,
+    missing_fields,
+    parse_final_answer,
+)
+
+
+class FakeDB:
+    async def get_chat_history(self, user_id, limit=10):
+        return []
+
+
+def _agent(settings_env, runnable):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    agent = OrchestratorAgent()
+    agent.db = FakeDB()
+    agent.business_context._cache[date.today().year] = (float("inf"), [])
+    agent.runnable = runnable
+    return agent
+
+
+def _final_answer(args, call_id="call_1"):
+    return AIMessage(
+        content="", tool_calls=[{"name": FINAL_ANSWER_TOOL, "args": args, "id": call_id}]
+    )
+
+
+def test_parse_final_answer_applies_intent_schema():
+    answer = parse_final_answer(
+        {
+            "intent": "invoice",
+            "extracted_data": {
+                "client_name": "ALTECA",
+                "due_date": "fin du mois",
+                "items": [{"description": "Dev", "unit_price": "cinq cents", "quantity": 2}],
+                "tjm": 500,
+            },
+        }
+    )
+
+    assert answer.extracted_data == {
+        "client_name": "ALTECA",
+        "items": [{"description": "Dev", "quantity": 2}],
+        "tjm": 500,
+    }
+    assert sorted(answer.dropped) == ["due_date", "items.0.unit_price"]
+    for invalid in (
+        '{"intent": "facture"}',
+        '{"intent": "chat", "confidence": "haute"}',
+        '{"intent": "chat"',
+    ):
+        with pytest.raises(ValueError):
+            parse_final_answer(invalid)
+
+    schema = final_answer_tool()["function"]["parameters"]
+    assert schema["properties"]["intent"]["enum"][0] == "invoice"
+    assert "invoice_number" not in str(schema) and "title" not in schema
+
+
+@pytest.mark.asyncio
+async def test_unreadable_answer_is_repaired_without_user_retry(settings_env):
+    class FakeRunnable:
+        def __init__(self):
+            self.scratchpads = []
+            self.responses = [
+                AIMessage(
+                    content="",
+                    invalid_tool_calls=[
+                        {
+                            "name": FINAL_ANSWER_TOOL,
+                            "args": '{"intent": "rent_receipt", ',
+                            "id": "call_1",
+                            "error": "truncated",
+                        },
+                    ],
+                ),
+                _final_answer(
+                    {
+                        "intent": "rent_receipt",
+                        "extracted_data": {"period_month": 3, "payment_method": "CB"},
+                    },
+                    "call_2",
+                ),
+            ]
+
+        async def ainvoke(self, variables):
+            self.scratchpads.append(list(variables["agent_scratchpad"]))
+            return self.responses.pop(0)
+
+    agent = _agent(settings_env, FakeRunnable())
+    metrics.reset()
+
+    result = await agent.analyze_message("quittance de mars", user_id=1)
+
+    assert result["intent"] == "rent_receipt"
+    assert result["extracted_data"]["period_month"] == 3
+    assert "payment_method" not in result["extracted_data"]
+    repair = agent.runnable.scratchpads[1][-1]
+    assert isinstance(repair, ToolMessage) and repair.tool_call_id == "call_1"
+    assert metrics.counter("orchestrator.final_answers") == 2
+    assert metrics.counter("orchestrator.parse_failures") == 1
+    assert metrics.counter("orchestrator.schema_errors") == 1
+
+
+@pytest.mark.asyncio
+async def test_final_answer_arguments_are_streamed(settings_env):
+    args = ['{"intent": "chat", ', '"reply_text": "Bonjour', ' à vous"}']
+
+    class FakeRunnable:
+        async def astream(self, variables):
+            for i, piece in enumerate(args):
+                yield AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": FINAL_ANSWER_TOOL if i == 0 else None,
+                            "args": piece,
+                            "id": "call_1" if i == 0 else None,
+                            "index": 0,
+                        }
+                    ],
+                )
+
+    agent = _agent(settings_env, FakeRunnable())
+    progress = []
+
+    async def on_reply_progress(text):
+        progress.append(text)
+
+    result = await agent.analyze_message("Salut", user_id=1, on_reply_progress=on_reply_progress)
+
+    assert progress == ["Bonjour", "Bonjour à vous"]
+    assert result["intent"] == "chat" and result["reply_text"] == "Bonjour à vous"
+
+
+def test_parse_final_answer_drops_list_items_from_the_end():
+    items = [{"description": f"Ligne {i}", "quantity": 1} for i in range(12)]
+    for index in (2, 9, 10):
+        items[index]["quantity"] = "beaucoup"
+    items[11] = "ligne illisible"
+
+    answer = parse_final_answer({"intent": "invoice", "extracted_data": {"items": items}})
+
+    assert sorted(answer.dropped) == [
+        "items.10.quantity",
+        "items.11",
+        "items.2.quantity",
+        "items.9.quantity",
+    ]
+    kept = answer.extracted_data["items"]
+    assert [item["description"] for item in kept] == [f"Ligne {i}" for i in range(11)]
+    assert [i for i, item in enumerate(kept) if "quantity" not in item] == [2, 9, 10]
+
+
+def test_missing_fields_ignores_agent_defaults():
+    assert missing_fields("invoice", {"client_name": "ALTECA"}) == ["client_address", "items"]
+    assert (
+        missing_fields(
+            "invoice", {"client_name": "ALTECA", "client_address": "Paris", "items": [{}]}
+        )
+        == []
+    )
+    assert missing_fields("rent_receipt", {"tenant_name": "Dupont"}) == [
+        "tenant_address",
+        "property_address",
+        "rent_amount",
+    ]
+    assert missing_fields("chat", {}) == []
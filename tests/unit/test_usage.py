@@ -0,0 +1,119 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from execution.core.usage import TurnUsage, aggregate_usage
+from execution.models.intent_results import FINAL_ANSWER_TOOL
+from execution.tools.telegram_helpers import format_usage_report
+
+
+def test_aggregate_usage_by_day_and_intent():
+    now = datetime(2026, 3, 2, 12)
+    rows = [
+        {
+            "created_at": now - timedelta(days=1),
+            "intent": "invoice",
+            "llm_calls": 2,
+            "prompt_tokens": 3000,
+            "completion_tokens": 200,
+            "total_ms": 2000,
+            "llm_ms": 1500,
+            "tool_ms": 300,
+        },
+        {
+            "created_at": now,
+            "intent": "chat",
+            "llm_calls": 1,
+            "prompt_tokens": 1000,
+            "completion_tokens": 50,
+            "total_ms": 1000,
+            "llm_ms": 800,
+            "tool_ms": 0,
+        },
+        {
+            "created_at": now,
+            "intent": "chat",
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_ms": 0,
+            "llm_ms": 0,
+            "tool_ms": 0,
+        },
+    ]
+
+    report = aggregate_usage(rows)
+
+    assert [day for day, _ in report["days"]] == [date(2026, 3, 1), date(2026, 3, 2)]
+    assert report["intents"][0][0] == "chat" and report["intents"][0][1]["turns"] == 2
+    assert report["total"]["prompt_tokens"] == 4000 and report["total"]["p95_ms"] == 2000
+    assert report["split"] == {
+        "llm": pytest.approx(2300 / 30),
+        "tools": 10.0,
+        "other": pytest.approx(400 / 30),
+    }
+    text = format_usage_report(report, 7)
+    assert "01/03" in text and "invoice" in text and "4.0k" in text
+    assert "Aucune" in format_usage_report(aggregate_usage([]), 7)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_records_turn_usage(settings_env):
+    from execution.agents.orchestrator_agent import OrchestratorAgent
+
+    class FakeDB:
+        def __init__(self):
+            self.usage = []
+
+        async def get_chat_history(self, user_id, limit=10):
+            return []
+
+        async def save_llm_usage(self, **fields):
+            self.usage.append(fields)
+
+    class FakeRunnable:
+        async def ainvoke(self, variables):
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": FINAL_ANSWER_TOOL,
+                        "args": {"intent": "chat", "reply_text": "Bonjour"},
+                        "id": "call_1",
+                    }
+                ],
+                usage_metadata={"input_tokens": 1200, "output_tokens": 30, "total_tokens": 1230},
+                response_metadata={"model_name": "served-model"},
+            )
+
+    agent = OrchestratorAgent()
+    agent.db = FakeDB()
+    agent.business_context._cache[date.today().year] = (float("inf"), [])
+    agent.runnable = FakeRunnable()
+
+    await agent.analyze_message("Salut", user_id=7)
+    await agent.flush_usage()
+
+    [record] = agent.db.usage
+    assert (
+        record["user_id"] == 7 and record["intent"] == "chat" and record["model"] == "served-model"
+    )
+    assert (record["llm_calls"], record["prompt_tokens"], record["completion_tokens"]) == (
+        1,
+        1200,
+        30,
+    )
+    assert record["total_ms"] >= record["llm_ms"] + record["tool_ms"]
+    assert len(record["iterations"]) == 1
+
+
+def test_turn_usage_attaches_tool_time_to_last_call():
+    usage = TurnUsage(user_id=1)
+    usage.add_tool_time(50)  # Avant tout appel LLM : ignoré
+    usage.add_llm_call("m", 100.4, AIMessage(content=""))
+    usage.add_tool_time(20)
+    usage.add_tool_time(5)
+
+    assert usage.iterations == [[100, 25, 0, 0]]
+    assert usage.as_record("stats")["model"] == "m"